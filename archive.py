@@ -0,0 +1,168 @@
+"""Season archive: finished tournaments move out of the hot database.
+
+`archive_tournament` copies a finished tournament into a separate SQLite
+file (CLUB28_ARCHIVE_URL, default ./club28_archive.db): its categories, its
+registrations with each player's name and team id, its matches and its
+frozen standings. Rows are copied in keyset chunks of CHUNK. Once the row
+counts in the archive match, the rows are deleted from the hot database,
+again chunk by chunk, with the tournament row deleted last. Users and the
+wallet ledger stay in the hot database.
+
+Hot ids are not stable: the hot tables have no AUTOINCREMENT, so once the
+newest rows are archived SQLite hands their ids to new rows. Every archive
+table therefore has its own AUTOINCREMENT `id` and keeps the hot id as
+`source_id`. Each archive run gets a new archive tournament id, and child
+rows are unique on (tournament_id, source_id) under it. A run is only
+marked done (`archived_at`) after the hot rows are gone; running the
+command again on a tournament whose run was interrupted resumes that run.
+
+The API only reads the archive: the /archive endpoints in main.py query it
+through `AsyncArchiveSession`, by archive tournament id.
+
+    python archive.py                  # archive every finished tournament
+    python archive.py 12 15 --vacuum   # these hot ids, then VACUUM the hot database
+"""
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from sqlalchemy import MetaData, Table, Column, Index, UniqueConstraint, Integer, String, create_engine, inspect, select, insert, update, delete, func, or_, and_
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from database import engine, async_url, require_drivers, CONNECT_ARGS
+import models
+
+ARCHIVE_URL = os.getenv("CLUB28_ARCHIVE_URL", "sqlite:///./club28_archive.db")
+ARCHIVABLE = ("Finished", "Completed")
+CHUNK = 2000
+
+class ArchiveError(ValueError):
+    pass
+
+# --- ARCHIVE SCHEMA ---
+# Same columns as the hot tables, without foreign keys (users stay behind), an archive-owned id, the hot
+# id as source_id, plus a few frozen fields. tournament_id on child rows is the archive tournament id.
+archive_meta = MetaData()
+EXTRA_COLUMNS = {
+    "tournaments": [Column("archived_at", String)],
+    "registrations": [Column("user_name", String), Column("team_id", String)],
+    "player_standings": [Column("tournament_id", Integer)],
+}
+
+def _mirror(table):
+    columns = [Column(c.name, c.type) for c in table.columns if c.name != "id"]
+    extra = [c._copy() for c in EXTRA_COLUMNS.get(table.name, [])]
+    keys = [] if table.name == "tournaments" else [UniqueConstraint("tournament_id", "source_id", name=f"_archive_{table.name}_source_uc")]
+    return Table(table.name, archive_meta, Column("id", Integer, primary_key=True), Column("source_id", Integer, nullable=False), *columns, *extra, *keys,
+                 sqlite_autoincrement=True)
+
+TABLES = {m.__tablename__: _mirror(m.__table__) for m in (models.Tournament, models.TournamentCategory, models.Registration, models.Match, models.PlayerStanding)}
+Index("ix_archive_tournaments_event", TABLES["tournaments"].c.name, TABLES["tournaments"].c.city)
+Index("ix_archive_tournaments_source", TABLES["tournaments"].c.source_id)
+Index("ix_archive_matches_tournament", TABLES["matches"].c.tournament_id, TABLES["matches"].c.id)
+Index("ix_archive_standings_tournament", TABLES["player_standings"].c.tournament_id, TABLES["player_standings"].c.category, TABLES["player_standings"].c.points)
+
+require_drivers(ARCHIVE_URL)
+archive_engine = create_engine(ARCHIVE_URL, connect_args=CONNECT_ARGS)
+archive_async_engine = create_async_engine(async_url(ARCHIVE_URL), connect_args=CONNECT_ARGS)
+AsyncArchiveSession = async_sessionmaker(archive_async_engine, autoflush=False, expire_on_commit=False)
+
+_schema_ready = False
+
+def _create(conn):
+    """create_all, plus the columns the hot tables gained after the archive file was created."""
+    archive_meta.create_all(conn)
+    insp = inspect(conn)
+    for table in TABLES.values():
+        have = {c["name"] for c in insp.get_columns(table.name)}
+        for c in table.columns:
+            if c.name not in have: conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {c.name} {c.type.compile(conn.dialect)}")
+
+async def ensure_schema():
+    """Creates the archive tables on first use, so a deployment that never archives never opens the file."""
+    global _schema_ready
+    if not _schema_ready:
+        async with archive_async_engine.begin() as conn: await conn.run_sync(_create)
+        _schema_ready = True
+
+# --- ARCHIVING ---
+def _sources(t):
+    """(table name, statement over the hot database) for everything that belongs to tournament `t`."""
+    R, M, S, C, U = models.Registration, models.Match, models.PlayerStanding, models.TournamentCategory, models.User
+    def owns(id_col, name_col):
+        # Rows from before tournament ids were backfilled only carry the tournament's name and city
+        return or_(id_col == t.id, and_(id_col.is_(None), name_col == t.name))
+    return [
+        ("tournament_categories", select(C.__table__).where(C.tournament_id == t.id)),
+        ("registrations", select(R.__table__, U.name.label("user_name"), U.team_id).outerjoin(U, U.id == R.user_id).where(owns(R.tournament_id, R.tournament_name), R.city == t.city)),
+        ("matches", select(M.__table__).where(owns(M.tournament_id, M.category), M.city == t.city)),
+        ("player_standings", select(S.__table__).where(S.tournament_name == t.name, S.city == t.city)),
+    ]
+
+def _copy(name, stmt, archive_id):
+    """Streams `stmt` into the archive table under `archive_id` in keyset chunks; returns the hot ids copied."""
+    hot, arc = stmt.selected_columns.id, TABLES[name]
+    ids, last = [], 0
+    while True:
+        # A short read transaction per chunk, so writers on the hot database are never held up for long
+        with engine.connect() as conn: rows = conn.execute(stmt.where(hot > last).order_by(hot).limit(CHUNK)).mappings().all()
+        if not rows: return ids
+        with archive_engine.begin() as out:
+            # Replaces on (tournament_id, source_id), so a resumed run rewrites its own rows and nothing else
+            out.execute(arc.insert().prefix_with("OR REPLACE"), [{**{k: v for k, v in r.items() if k != "id"}, "source_id": r["id"], "tournament_id": archive_id} for r in rows])
+        ids += [r["id"] for r in rows]
+        last = ids[-1]
+
+def _start_run(t):
+    """Archive tournament id for this run: the unfinished run of the same hot tournament, else a new one."""
+    A = TABLES["tournaments"]
+    values = {k: v for k, v in t._mapping.items() if k != "id"}
+    with archive_engine.begin() as out:
+        archive_id = out.scalar(select(A.c.id).where(A.c.source_id == t.id, A.c.name == t.name, A.c.city == t.city, A.c.archived_at.is_(None)).order_by(A.c.id.desc()).limit(1))
+        if archive_id is None: return out.execute(insert(A).values(**values, source_id=t.id)).inserted_primary_key[0]
+        out.execute(update(A).where(A.c.id == archive_id).values(**values))
+        return archive_id
+
+def archive_tournament(tournament_id: int):
+    """Moves one finished tournament (hot id) into the archive; returns the row counts moved."""
+    started = time.perf_counter()
+    with archive_engine.begin() as conn: _create(conn)
+    with engine.connect() as conn:
+        t = conn.execute(select(models.Tournament.__table__).where(models.Tournament.id == tournament_id)).first()
+        if t is None: raise ArchiveError(f"Tournament {tournament_id} not found")
+        if t.status not in ARCHIVABLE: raise ArchiveError(f"Only finished tournaments are archived; {t.name} is {t.status!r}")
+    archive_id = _start_run(t)
+    copied = {name: _copy(name, stmt, archive_id) for name, stmt in _sources(t)}
+
+    # Nothing is deleted unless the archive holds every row that was read
+    with archive_engine.connect() as out:
+        for name, ids in copied.items():
+            table = TABLES[name]
+            held = sum(out.scalar(select(func.count()).select_from(table).where(table.c.tournament_id == archive_id, table.c.source_id.in_(ids[i:i + CHUNK])))
+                       for i in range(0, len(ids), CHUNK))
+            if held != len(ids): raise ArchiveError(f"Archive holds {held} of {len(ids)} {name} rows for tournament {t.id}; hot rows left in place")
+
+    hot_tables = {"tournament_categories": models.TournamentCategory, "registrations": models.Registration, "matches": models.Match, "player_standings": models.PlayerStanding}
+    for name in ("player_standings", "matches", "registrations", "tournament_categories"):
+        ids, model = copied[name], hot_tables[name]
+        for i in range(0, len(ids), CHUNK):
+            with engine.begin() as conn: conn.execute(delete(model).where(model.id.in_(ids[i:i + CHUNK])))
+    with engine.begin() as conn: conn.execute(delete(models.Tournament).where(models.Tournament.id == t.id))
+    with archive_engine.begin() as out:
+        out.execute(update(TABLES["tournaments"]).where(TABLES["tournaments"].c.id == archive_id).values(archived_at=datetime.now(timezone.utc).isoformat(timespec="seconds")))
+    return {"tournament": t.name, "city": t.city, "archive_id": archive_id, **{name: len(ids) for name, ids in copied.items()}, "seconds": round(time.perf_counter() - started, 2)}
+
+def finished_ids():
+    with engine.connect() as conn:
+        return list(conn.scalars(select(models.Tournament.id).where(models.Tournament.status.in_(ARCHIVABLE)).order_by(models.Tournament.id)))
+
+if __name__ == "__main__":
+    # Usage: python archive.py [tournament ids...] [--vacuum]
+    args = [a for a in sys.argv[1:] if a != "--vacuum"]
+    for tid in [int(a) for a in args] or finished_ids():
+        try: print(archive_tournament(tid))
+        except ArchiveError as e: print(f"skipped {tid}: {e}")
+    if "--vacuum" in sys.argv:
+        raw = engine.raw_connection()   # outside SQLAlchemy's transaction: VACUUM cannot run inside one
+        try: raw.cursor().execute("VACUUM")
+        finally: raw.close()
+        print("Hot database vacuumed")
@@ -0,0 +1,52 @@
+"""Runs every benchmark that checks something, at CI sizes, and exits 1 if any of them fails.
+
+Each check is its own process on its own scratch database, exactly as it
+would be run by hand, so one failure does not hide the others. `plans`
+migrates a copy of club28.db and fails if a hot query scans a table; the
+rest are the bench modules with their pass/fail checks (the micro-benchmark
+only has to run). Timing-only benchmarks (load_http, sse_soak, serialize,
+...) are left to be run on their own.
+
+    python -m bench
+    python -m bench join_race wallet_stress
+"""
+import os, shutil, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHECKS = {
+    "plans": ["migrations.py", "plans"],
+    "join_race": ["-m", "bench.join_race", "--players", "120", "--draw-size", "16"],
+    "wallet_stress": ["-m", "bench.wallet_stress", "--players", "60", "--tournaments", "3"],
+    "fixtures_bulk": ["-m", "bench.fixtures_bulk", "--players", "16", "--levels", "2", "--knockout"],
+    "scheduler": ["-m", "bench.scheduler", "--levels", "2", "--players", "16", "--courts", "2", "--repeat", "1"],
+    "archive": ["-m", "bench.archive", "--cities", "1", "--seasons", "2", "--levels", "1", "--players", "8", "--requests", "10"],
+    "micro": ["-m", "bench.micro", "--cities", "1", "--players", "8", "--number", "10", "--repeat", "1"],
+    "cold_start": ["-m", "bench.cold_start", "--runs", "3", "--cities", "1", "--tournaments", "1", "--players", "8"],
+}
+
+def run(name):
+    env = dict(os.environ)
+    if name == "plans":
+        # Migrate a copy so the check also covers the backfill from the real data
+        scratch = tempfile.mkdtemp()
+        shutil.copy(os.path.join(ROOT, "club28.db"), scratch)
+        env["DATABASE_URL"] = f"sqlite:///{scratch}/club28.db"
+    start = time.perf_counter()
+    code = subprocess.call([sys.executable, *CHECKS[name]], cwd=ROOT, env=env)
+    return code, time.perf_counter() - start
+
+def main():
+    names = sys.argv[1:] or list(CHECKS)
+    unknown = [n for n in names if n not in CHECKS]
+    if unknown: sys.exit(f"Unknown check(s): {', '.join(unknown)}; choose from {', '.join(CHECKS)}")
+    results = {}
+    for name in names:
+        print(f"\n=== {name}", flush=True)
+        results[name] = run(name)
+    print()
+    for name, (code, seconds) in results.items(): print(f"{name:14} {'OK' if code == 0 else f'FAILED ({code})':12} {seconds:6.1f} s")
+    sys.exit(1 if any(code for code, _ in results.values()) else 0)
+
+if __name__ == "__main__":
+    main()
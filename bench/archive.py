@@ -0,0 +1,111 @@
+"""Hot-database query latency before and after archiving finished seasons.
+
+Seeds --seasons seasons per city with bench.seed, marks every season but the
+last one Finished, and times the read endpoints for the live season (response
+cache off) on the full database. Then it archives the finished tournaments,
+VACUUMs the hot database and times the same requests again, plus the
+/archive endpoints for one of the archived seasons.
+
+Last, a check that archiving survives hot id reuse: it archives a small
+tournament, creates the next one (which gets the same hot ids) and archives
+that too, and fails unless both stay in the archive with their own rows.
+
+    python -m bench.archive --seasons 6 --players 48
+"""
+import argparse, os, statistics, tempfile, time
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cities", type=int, default=3)
+    ap.add_argument("--seasons", type=int, default=6, help="per city; all but the last get archived")
+    ap.add_argument("--levels", type=int, default=4)
+    ap.add_argument("--players", type=int, default=48, help="per level")
+    ap.add_argument("--requests", type=int, default=200, help="per endpoint")
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.update(DATABASE_URL=f"sqlite:///{tmp}/hot.db", CLUB28_ARCHIVE_URL=f"sqlite:///{tmp}/archive.db", CLUB28_CACHE_TTL="0")
+    from bench import seed
+    season = seed.generate(cities=args.cities, tournaments=args.seasons, levels=args.levels, players=args.players, spare=50)
+    from fastapi.testclient import TestClient
+    from sqlalchemy import select, update, func
+    import main as api, models, archive
+    from database import engine
+
+    live, old, city, level = f"Season {args.seasons}", "Season 1", season["cities"][0], season["levels"][0]
+    with engine.begin() as conn:
+        conn.execute(update(models.Tournament).where(models.Tournament.name != live, models.Tournament.name != seed.WALK_IN).values(status="Finished"))
+        team = conn.scalar(select(models.User.team_id).join(models.Registration, models.Registration.user_id == models.User.id).where(models.Registration.tournament_name == live).limit(1))
+    client = TestClient(api.app).__enter__()
+    paths = {
+        "standings": f"/standings?tournament={live}&city={city}&level={level}",
+        "scores (event)": f"/scores?tournament={live}&city={city}&limit=500",
+        "tournament-players": f"/admin/tournament-players?name={live}&city={city}",
+        "admin players (event)": f"/admin/players?tournament={live}&city={city}&limit=500",
+        "player matches": f"/user/{team}/matches",
+        "tournaments": "/tournaments",
+    }
+
+    def sizes():
+        with engine.connect() as conn:
+            return {t: conn.scalar(select(func.count()).select_from(t)) for t in (models.Match.__table__, models.Registration.__table__, models.PlayerStanding.__table__)}
+    def measure(paths):
+        out = {}
+        for name, path in paths.items():
+            samples = []
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                res = client.get(path)
+                samples.append((time.perf_counter() - start) * 1000)
+                assert res.status_code == 200, (path, res.text)
+            out[name] = sorted(samples)
+        return out
+    def p(s, q): return s[min(len(s) - 1, int(len(s) * q))]
+
+    measure(paths)   # warm-up pass: imports, prepared statements, the catalog snapshot
+    rows_before, mb_before = sizes(), os.path.getsize(f"{tmp}/hot.db") / 2**20
+    before = measure(paths)
+    start = time.perf_counter()
+    moved = [archive.archive_tournament(tid) for tid in archive.finished_ids()]
+    archive_s = time.perf_counter() - start
+    raw = engine.raw_connection()
+    try: raw.cursor().execute("VACUUM")
+    finally: raw.close()
+    api.catalog.invalidate()
+    measure(paths)
+    rows_after, mb_after = sizes(), os.path.getsize(f"{tmp}/hot.db") / 2**20
+    after = measure(paths)
+    old_id = next(m["archive_id"] for m in moved if m["tournament"] == old and m["city"] == city)
+    archived = measure({"archive standings": f"/archive/tournaments/{old_id}/standings?level={level}", "archive matches": f"/archive/tournaments/{old_id}/matches?limit=500"})
+
+    print(f"archived {len(moved)} tournaments ({sum(m['matches'] for m in moved):,} matches, {sum(m['registrations'] for m in moved):,} registrations) in {archive_s:.1f} s")
+    for t in rows_before: print(f"{t.name:18} {rows_before[t]:>9,} -> {rows_after[t]:>9,} rows")
+    print(f"hot db file        {mb_before:9.1f} -> {mb_after:9.1f} MiB (after VACUUM); archive {os.path.getsize(f'{tmp}/archive.db') / 2**20:.1f} MiB")
+    print(f"\n{'endpoint (live season)':24} {'p50 before':>11} {'p50 after':>10} {'p99 before':>11} {'p99 after':>10}")
+    for name in paths:
+        b, a = before[name], after[name]
+        print(f"{name:24} {statistics.median(b):11.2f} {statistics.median(a):10.2f} {p(b, 0.99):11.2f} {p(a, 0.99):10.2f}")
+    for name, s in archived.items(): print(f"{name:24} {'':11} {statistics.median(s):10.2f} {'':11} {p(s, 0.99):10.2f}")
+
+    def reuse_season(n):
+        """Creates, fills and archives a small tournament; returns (hot id, archive result, archived matches)."""
+        client.post("/admin/create-tournament", json={"name": "Reuse Check", "type": "League", "city": city, "draw_size": 8, "settings": [{"name": level, "fee": "0"}]})
+        body = "name,phone,level\n" + "".join(f"Reuse {n}-{i},59{n}{i:07d},{level}\n" for i in range(8))
+        client.post(f"/admin/import-registrations?tournament=Reuse Check&city={city}", content=body.encode(), headers={"content-type": "text/csv"})
+        client.post("/admin/generate-fixtures", json={"category": "Reuse Check", "city": city, "level": level})
+        with engine.begin() as conn:
+            tid = conn.scalar(select(models.Tournament.id).where(models.Tournament.name == "Reuse Check", models.Tournament.city == city))
+            conn.execute(update(models.Tournament).where(models.Tournament.id == tid).values(status="Finished"))
+            conn.execute(update(models.Match).where(models.Match.tournament_id == tid).values(score=f"season {n}"))
+        result = archive.archive_tournament(tid)
+        return tid, result, client.get(f"/archive/tournaments/{result['archive_id']}/matches?fields=score").json()
+    first_hot, first, first_rows = reuse_season(1)
+    second_hot, second, _ = reuse_season(2)
+    kept = client.get(f"/archive/tournaments/{first['archive_id']}/matches?fields=score").json()
+    ok = first["archive_id"] != second["archive_id"] and kept == first_rows and len(kept) == first["matches"] > 0 and {r["score"] for r in kept} == {"season 1"}
+    print(f"\nhot id reuse: tournament {first_hot} -> {second_hot}, archive ids {first['archive_id']} and {second['archive_id']}, "
+          f"first season {len(kept)} of {first['matches']} matches intact: {'OK' if ok else 'FAILED'}")
+    assert ok
+
+if __name__ == "__main__":
+    main()
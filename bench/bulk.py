@@ -0,0 +1,90 @@
+"""Bulk roster import against /admin/manual-register, and export memory against a full pull.
+
+Seeds a season with bench.seed, then registers --players new players into
+one tournament with one /admin/manual-register call each and the same
+number into another with a single /admin/import-registrations upload, and
+reports rows per second and SQL statements per player. For exports it runs
+the /admin/export generator on the fixtures table at growing sizes and
+compares the peak Python heap (tracemalloc) with loading the same rows in
+one query and serializing them, as a full /scores pull does.
+
+    python -m bench.bulk --players 2000
+"""
+import argparse, asyncio, os, tempfile, time, tracemalloc
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", type=int, default=2000)
+    ap.add_argument("--levels", type=int, default=4)
+    args = ap.parse_args()
+
+    os.environ.update(DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/bulk.db", CLUB28_CACHE_TTL="0")
+    from bench import seed
+    seed.generate(cities=2, tournaments=2, levels=3, players=32, spare=0)
+    from fastapi.testclient import TestClient
+    from sqlalchemy import select
+    import orjson
+    import main as api, metrics, models
+    from database import AsyncSessionLocal, engine
+
+    client = TestClient(api.app).__enter__()
+    levels = [f"L{i}" for i in range(args.levels)]
+    for name in ("One By One", "Bulk Upload"):
+        client.post("/admin/create-tournament", json={"name": name, "type": "League", "city": "GOA", "draw_size": args.players, "settings": [{"name": l, "fee": "0"} for l in levels]})
+    def player(i, offset): return f"Onboard {offset + i}", f"6{offset + i:09d}", levels[i % len(levels)]
+
+    statements, start = metrics.STATEMENTS.value, time.perf_counter()
+    for i in range(args.players):
+        name, phone, level = player(i, 0)
+        assert client.post("/admin/manual-register", json={"name": name, "phone": phone, "category": "One By One", "city": "GOA", "level": level}).status_code == 200
+    single_s, single_sql = time.perf_counter() - start, metrics.STATEMENTS.value - statements
+
+    body = "name,phone,level\n" + "".join(f"{n},{p},{l}\n" for n, p, l in (player(i, args.players) for i in range(args.players)))
+    statements, start = metrics.STATEMENTS.value, time.perf_counter()
+    res = client.post("/admin/import-registrations?tournament=Bulk Upload&city=GOA", content=body.encode(), headers={"content-type": "text/csv"}).json()
+    bulk_s, bulk_sql = time.perf_counter() - start, metrics.STATEMENTS.value - statements
+    assert res["imported"] == args.players and not res["errors"], res
+    assert client.get("/admin/check-standings").json()["consistent"]
+
+    with engine.connect() as conn:
+        groups = {}
+        for name, level, group in conn.execute(select(models.Registration.tournament_name, models.Registration.category, models.Registration.group_id).where(models.Registration.city == "GOA")):
+            groups.setdefault(name, {}).setdefault((level, group), 0)
+            groups[name][(level, group)] += 1
+    same = groups["One By One"] == groups["Bulk Upload"]
+
+    print(f"{args.players:,} players over {args.levels} levels")
+    print(f"manual-register x{args.players:<6}  {single_s:7.2f} s  {args.players / single_s:8.0f} rows/s  {single_sql / args.players:5.1f} statements/player")
+    print(f"import-registrations    {bulk_s:7.2f} s  {args.players / bulk_s:8.0f} rows/s  {bulk_sql / args.players:5.2f} statements/player ({single_s / bulk_s:.0f}x faster, {-(-args.players // api.IMPORT_CHUNK)} transactions)")
+    print(f"group allocation identical to one-by-one: {same}")
+
+    async def export_peak(stmt):
+        tracemalloc.start()
+        size = 0
+        async for chunk in api.stream_rows(stmt, "ndjson"): size += len(chunk)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return size, peak
+    async def full_pull_peak(stmt):
+        tracemalloc.start()
+        async with AsyncSessionLocal() as db:
+            rows = [dict(r._mapping) for r in (await db.execute(stmt)).all()]
+        size = len(orjson.dumps(rows))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return size, peak
+
+    print(f"\n{'fixtures export':18} {'rows':>8} {'bytes':>10} {'stream peak':>12} {'full pull peak':>15}")
+    with engine.connect() as conn: season = [dict(r._mapping, id=None) for r in conn.execute(select(models.Match.__table__))]
+    for copies in (1, 8, 32):
+        with engine.begin() as conn:   # grow the matches table to `copies` seasons by re-inserting its rows
+            n = conn.scalar(select(api.func.count()).select_from(models.Match))
+            for _ in range(copies - n // len(season)): conn.execute(models.Match.__table__.insert(), season)
+        stmt = api.export_query("fixtures")
+        n = len(season) * copies
+        size, stream_peak = asyncio.run(export_peak(stmt))
+        _, pull_peak = asyncio.run(full_pull_peak(stmt))
+        print(f"{f'{copies} season(s)':18} {n:8,} {size:10,} {stream_peak / 2**20:10.1f} MiB {pull_peak / 2**20:13.1f} MiB")
+
+if __name__ == "__main__":
+    main()
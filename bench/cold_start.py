@@ -0,0 +1,86 @@
+"""Cold-start budget: time from process start to the first successful /tournaments response.
+
+Seeds and migrates a scratch database with bench.seed, then --runs times
+runs the startCommand from render.yaml in a fresh shell (with the same
+environment, CLUB28_AUTO_MIGRATE=0, and $PORT set) and polls /tournaments
+until it answers 200; the command includes `python migrations.py upgrade`,
+so the up-to-date schema check is part of the time. Also reports the import
+time of main and, for comparison, the schema work every start used to do
+in-process before migrations became a separate step (create_all plus the
+idempotent upgrade steps).
+
+Exits 1 when the median cold start is over --budget seconds.
+
+    python -m bench.cold_start --budget 3
+"""
+import argparse, os, re, signal, socket, statistics, subprocess, sys, tempfile, time, urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def render_command(key):
+    """`key` (e.g. startCommand) of the web service in render.yaml."""
+    with open(os.path.join(ROOT, "render.yaml")) as f:
+        found = re.search(rf"^\s*{key}:\s*(.+)$", f.read(), re.M)
+    if not found: raise RuntimeError(f"no {key} in render.yaml")
+    return found.group(1).strip()
+
+def first_response(command, env, port, timeout=30):
+    started = time.perf_counter()
+    # Its own process group, so the shell and the server it starts are stopped together
+    proc = subprocess.Popen(command, shell=True, cwd=ROOT, env={**env, "PORT": str(port)}, start_new_session=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None: raise RuntimeError(f"server exited: {proc.stderr.read().decode()[-2000:]}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/tournaments", timeout=5) as res:
+                    if res.status == 200: return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"no 200 from /tournaments within {timeout} s")
+    finally:
+        os.killpg(proc.pid, signal.SIGTERM); proc.wait()
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--budget", type=float, default=3.0, help="seconds, median time to first /tournaments")
+    ap.add_argument("--cities", type=int, default=3)
+    ap.add_argument("--tournaments", type=int, default=2, help="per city")
+    ap.add_argument("--players", type=int, default=16, help="per level")
+    args = ap.parse_args()
+
+    url = f"sqlite:///{tempfile.mkdtemp()}/cold.db"
+    env = {**os.environ, "DATABASE_URL": url, "CLUB28_AUTO_MIGRATE": "0", "CLUB28_DB_PROFILE": "production"}
+    os.environ.update(env)
+    from bench import seed
+    season = seed.generate(cities=args.cities, tournaments=args.tournaments, players=args.players)   # migrates, then fills a season
+    import migrations
+    from database import engine
+
+    start_command = render_command("startCommand")
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import main"], cwd=ROOT, env=env, check=True)
+    import_s = time.perf_counter() - start
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for _, _, step in migrations.MIGRATIONS: step(conn)
+    old_schema_s = time.perf_counter() - start
+
+    runs = []
+    for _ in range(args.runs):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0)); port = s.getsockname()[1]
+        runs.append(first_response(start_command, env, port))
+    median = statistics.median(runs)
+
+    print(f"{season['registrations']:,} registrations, {season['matches']:,} matches")
+    print(f"startCommand: {start_command}")
+    print(f"python -c 'import main'         {import_s * 1000:8.0f} ms (interpreter start included)")
+    print(f"per-start schema work, before   {old_schema_s * 1000:8.0f} ms (now: an up-to-date `migrations.py upgrade` in startCommand)")
+    print(f"first 200 from /tournaments     {median * 1000:8.0f} ms median, {min(runs) * 1000:.0f}-{max(runs) * 1000:.0f} ms over {args.runs} starts")
+    print(f"budget {args.budget * 1000:.0f} ms: {'OK' if median <= args.budget else 'OVER'}")
+    sys.exit(0 if median <= args.budget else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Bulk fixture generation vs one /admin/create-match call per match.
+
+Seeds two identical tournaments on a scratch database (same levels, same
+group assignments), then creates the full round-robin for one of them with
+sequential create-match calls and for the other with /admin/generate-fixtures.
+
+Then checks the knockout bracket for 1 to 12 groups, most of them not a power
+of two: one match per qualifier but the champion and none against a bye,
+every qualifier entering exactly once, and no direct first pairing of two
+group winners or of a group's own top two. Draws of 12, 20 and 28 players
+also go through /admin/generate-fixtures. Exits 1 when a check fails.
+
+    python -m bench.fixtures_bulk --players 64 --levels 4
+"""
+import argparse, os, re, sys, tempfile, time
+
+def bracket_problems(groups, rows):
+    """Problems with the knockout rows generate-fixtures made for `groups` (group labels)."""
+    ko = [r for r in rows if r["stage"] != "Group"]
+    qualifiers = [f"{g}{p}" for g in groups for p in (1, 2)]
+    problems = []
+    if len(ko) != len(qualifiers) - 1: problems.append(f"{len(ko)} knockout matches for {len(qualifiers)} qualifiers")
+    sides = [side for r in ko for side in r["slot"].split(" v ")]
+    if "BYE" in sides or any(r["t1"] == "BYE" or r["t2"] == "BYE" for r in ko): problems.append("a match against a bye")
+    seeds = [s for s in sides if not s.startswith("W ")]
+    if sorted(seeds) != sorted(qualifiers): problems.append(f"qualifiers entering: {sorted(seeds)}")
+    for r in ko:
+        a, b = r["slot"].split(" v ")
+        if a.startswith("W ") or b.startswith("W "): continue
+        if len(groups) > 1 and a[:-1] == b[:-1]: problems.append(f"same group: {r['slot']}")
+        if a.endswith("1") and b.endswith("1") and len(groups) > 1: problems.append(f"two group winners: {r['slot']}")
+    return problems
+
+def check_brackets(client):
+    import fixtures
+    failed = 0
+    for n in range(1, 13):
+        groups = [chr(ord("A") + i) for i in range(n)]
+        problems = bracket_problems(groups, fixtures.build({g: [f"{g}{i}" for i in range(4)] for g in groups}, [], True))
+        failed += bool(problems)
+        print(f"{n:2} groups  {'OK' if not problems else '; '.join(problems)}")
+    for draw in (12, 20, 28):
+        name = f"Bracket {draw}"
+        client.post("/admin/create-tournament", json={"name": name, "type": "League", "draw_size": draw, "settings": [{"name": "OPEN", "fee": "0"}]})
+        for i in range(draw):
+            client.post("/admin/manual-register", json={"name": f"B{draw} {i}", "phone": f"8{draw:02d}{i:07d}", "category": name, "city": "MUMBAI", "level": "OPEN"})
+        client.post("/admin/generate-fixtures", json={"category": name, "city": "MUMBAI", "level": "OPEN", "knockout": True})
+        rows = client.get("/scores", params={"tournament": name, "city": "MUMBAI"}).json()
+        groups = sorted({r["group_id"] for r in rows if r["stage"] == "Group"}, key=lambda g: (len(g), g))
+        problems = bracket_problems(groups, rows)
+        failed += bool(problems)
+        first = [r["slot"] for r in rows if r["stage"] != "Group" and not re.search(r"\bW ", r["slot"])]
+        print(f"{draw}-player draw, {len(groups)} groups via API  {'OK' if not problems else '; '.join(problems)}  first matches: {', '.join(first)}")
+    return failed
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", type=int, default=64, help="players per level")
+    ap.add_argument("--levels", type=int, default=4)
+    ap.add_argument("--knockout", action="store_true")
+    args = ap.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    from fastapi.testclient import TestClient
+    from sqlalchemy import insert, select
+    import main as api, models, fixtures
+    from database import engine, SessionLocal
+
+    levels = [f"LEVEL{i}" for i in range(args.levels)]
+    labels = api.group_labels(args.players)
+    client = TestClient(api.app).__enter__()
+    for name in ("Seq Cup", "Bulk Cup"):
+        client.post("/admin/create-tournament", json={"name": name, "type": "League", "draw_size": args.players, "settings": [{"name": l, "fee": "0"} for l in levels],
+                                                      "schedule": [{"label": f"2025-03-{d:02d}", "value": "18:00"} for d in range(1, 8)]})
+    with SessionLocal() as db:
+        tids = dict(db.execute(select(models.Tournament.name, models.Tournament.id)).all())
+    with engine.begin() as conn:
+        total = args.players * args.levels
+        conn.execute(insert(models.User), [{"phone": f"9{i:09d}", "name": f"Player {i}", "password": "x", "team_id": f"T{i:05d}", "wallet_balance": 0} for i in range(total)])
+        conn.execute(insert(models.Registration), [
+            {"user_id": i + 1, "tournament_id": tids[name], "tournament_name": name, "city": "MUMBAI", "category": levels[i // args.players], "group_id": labels[i % len(labels)]}
+            for name in tids for i in range(total)
+        ])
+
+    groups_by_level = {}
+    with SessionLocal() as db:
+        for level in levels:
+            for g, n in db.execute(select(models.Registration.group_id, models.User.name).join(models.User, models.Registration.user_id == models.User.id).where(
+                models.Registration.tournament_id == tids["Seq Cup"], models.Registration.category == level
+            ).order_by(models.Registration.id)).all():
+                groups_by_level.setdefault(level, {}).setdefault(g, []).append(n)
+
+    start, calls = time.perf_counter(), 0
+    for level in levels:
+        for m in fixtures.build(groups_by_level[level], [], args.knockout):
+            client.post("/admin/create-match", json={"category": "Seq Cup", "city": "MUMBAI", "group_id": m["group_id"] or m["slot"], "t1": m["t1"], "t2": m["t2"], "date": m["date"], "time": m["time"]})
+            calls += 1
+    seq_ms = (time.perf_counter() - start) * 1000
+
+    start, created = time.perf_counter(), 0
+    for level in levels:
+        created += client.post("/admin/generate-fixtures", json={"category": "Bulk Cup", "city": "MUMBAI", "level": level, "knockout": args.knockout}).json()["created"]
+    bulk_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{'sequential create-match':28} {calls:6} matches {seq_ms:10.1f} ms  ({seq_ms / max(calls, 1):.2f} ms/match)")
+    print(f"{'generate-fixtures':28} {created:6} matches {bulk_ms:10.1f} ms  ({bulk_ms / max(created, 1):.2f} ms/match)")
+    print(f"speedup x{seq_ms / bulk_ms:.1f}")
+
+    print("\nknockout brackets")
+    sys.exit(1 if check_brackets(client) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Concurrency check for group allocation.
+
+Fires parallel /join-tournament calls at one category on a scratch database and
+fails if any group holds more than 4 players or the draw overfills.
+
+    python -m bench.join_race --players 400 --draw-size 32
+"""
+import argparse, asyncio, os, sys, tempfile
+from collections import Counter
+
+async def run(args):
+    import httpx
+    import main as api, models
+    from database import SessionLocal
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://bench") as client:
+        await client.post("/admin/create-tournament", json={"name": "Race Cup", "type": "League", "draw_size": args.draw_size, "settings": [{"name": "OPEN", "fee": "0"}]})
+        phones = [f"90{i:08d}" for i in range(args.players)]
+        for i, phone in enumerate(phones):
+            # Distinct two-letter prefixes keep /register's team_id generation from running out of ids
+            name = f"{chr(65 + i // 26 % 26)}{chr(65 + i % 26)} Player {i}"
+            await client.post("/register", json={"phone": phone, "name": name, "password": "x"})
+
+        async def join(phone):
+            res = await client.post("/join-tournament", json={"phone": phone, "tournament_name": "Race Cup", "level": "OPEN"})
+            return res.status_code
+
+        codes = Counter(await asyncio.gather(*(join(p) for p in phones)))
+
+    with SessionLocal() as db:
+        groups = Counter(g for (g,) in db.query(models.Registration.group_id).filter(models.Registration.category == "OPEN"))
+    total = sum(groups.values())
+    print(f"responses={dict(codes)} registered={total} groups={dict(sorted(groups.items()))}")
+    return total <= args.draw_size and all(c <= api.GROUP_SIZE for c in groups.values()) and codes[200] == total
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", type=int, default=300)
+    ap.add_argument("--draw-size", type=int, default=32)
+    args = ap.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/race.db"
+    ok = asyncio.run(run(args))
+    print("OK" if ok else "FAILED: draw or group overfilled")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""HTTP load test against a real uvicorn process.
+
+Starts uvicorn for the app in --app-dir on a scratch SQLite database, seeds one
+event through the public API, then replays a mix of standings/tournament/score
+reads and score submissions from --concurrency clients for --duration seconds.
+Point --app-dir at a checkout of another commit to compare stacks, e.g.
+
+    git worktree add /tmp/club28-sync <commit>
+    python -m bench.load_http --app-dir /tmp/club28-sync --label sync
+    python -m bench.load_http --label async
+
+--profile runs the server under a CLUB28_DB_PROFILE, e.g. to compare the
+rollback journal ("default") with WAL ("production") on the same mix.
+
+--scenario event-day generates a full season with bench.seed instead and
+replays match-day traffic on one event: mostly standings polling, plus
+score submissions, walk-in joins and players opening their match list.
+Results carry the commit so --out files can be compared across commits.
+"""
+import argparse, asyncio, json, os, random, statistics, subprocess, sys, tempfile, time
+import httpx
+
+MIX = [("standings", 0.5), ("tournaments", 0.2), ("scores", 0.2), ("submit", 0.1)]
+EVENT_DAY_MIX = [("standings", 0.55), ("scores", 0.1), ("my_matches", 0.1), ("submit", 0.15), ("join", 0.1)]
+
+async def wait_ready(client, proc):
+    for _ in range(100):
+        if proc.poll() is not None: raise RuntimeError("uvicorn exited during startup")
+        try:
+            if (await client.get("/")).status_code == 200: return
+        except httpx.TransportError: pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("uvicorn did not start")
+
+async def seed(client, players, matches):
+    await client.post("/admin/create-tournament", json={"name": "Load Cup", "type": "League", "draw_size": players, "settings": [{"name": "OPEN", "fee": "0"}]})
+    names = [f"{chr(65 + i // 26 % 26)}{chr(65 + i % 26)} Load {i}" for i in range(players)]
+    for i, name in enumerate(names):
+        await client.post("/admin/manual-register", json={"name": name, "phone": f"80{i:08d}", "category": "Load Cup", "city": "MUMBAI", "level": "OPEN"})
+    for _ in range(matches):
+        t1, t2 = random.sample(names, 2)
+        await client.post("/admin/create-match", json={"category": "Load Cup", "city": "MUMBAI", "group_id": "A", "t1": t1, "t2": t2, "date": "2025-02-01", "time": "10:00"})
+    res = await client.get("/scores", params={"tournament": "Load Cup", "city": "MUMBAI", "limit": 1000})
+    return [m["id"] for m in res.json() if m.get("category", "Load Cup") == "Load Cup"], names
+
+async def worker(client, deadline, ctx, samples, mix):
+    kinds, weights = zip(*mix)
+    while time.perf_counter() < deadline:
+        kind = random.choices(kinds, weights)[0]
+        start = time.perf_counter()
+        try:
+            res = await request(client, kind, ctx)
+            code = res.status_code
+        except httpx.TransportError:
+            code = 599
+        samples.setdefault(kind, []).append(((time.perf_counter() - start) * 1000, code))
+
+async def request(client, kind, ctx):
+    ev = ctx["event"]
+    if kind == "standings":
+        return await client.get("/standings", params={"tournament": ev["tournament"], "city": ev["city"], "level": ev["level"]})
+    if kind == "tournaments":
+        return await client.get("/tournaments")
+    if kind == "scores":
+        return await client.get("/scores", params={"tournament": ev["tournament"], "city": ev["city"], "limit": 200})
+    if kind == "my_matches":
+        return await client.get(f"/user/{random.choice(ctx['team_ids'])}/matches")
+    if kind == "join" and ctx["phones"]:
+        return await client.post("/join-tournament", json={"phone": ctx["phones"].pop(), "tournament_name": ctx["walk_in"], "level": "OPEN"})
+    return await client.post("/submit-score", json={"match_id": random.choice(ctx["match_ids"]), "category": ev["tournament"], "t1_name": "", "t2_name": "", "score": "6-4, 6-3", "submitted_by_team": "LOAD"})
+
+def commit(app_dir):
+    try: return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=app_dir, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError): return None
+
+def summarize(samples, elapsed):
+    out = {}
+    for kind, rows in sorted(samples.items()):
+        lat = sorted(ms for ms, _ in rows)
+        out[kind] = {
+            "requests": len(rows), "errors": sum(1 for _, code in rows if code >= 400),
+            "p50_ms": round(statistics.median(lat), 2), "p99_ms": round(lat[min(len(lat) - 1, int(len(lat) * 0.99))], 2),
+        }
+    out["total_rps"] = round(sum(len(r) for r in samples.values()) / elapsed, 1)
+    return out
+
+async def run(args):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/load.db")
+    if args.profile: env["CLUB28_DB_PROFILE"] = args.profile
+    season = None
+    if args.scenario == "event-day":
+        # Generated in a child process so this one never imports the app
+        out = subprocess.run([sys.executable, "-c", "import json, sys; from bench import seed; json.dump(seed.generate(players=%d), sys.stdout)" % args.players],
+                             env=env, capture_output=True, text=True, check=True).stdout
+        season = json.loads(out.splitlines()[-1])
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning"],
+                            cwd=args.app_dir, env=env)
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60) as client:
+            await wait_ready(client, proc)
+            if season:
+                ev = season["event"]
+                matches = (await client.get("/scores", params={"tournament": ev["tournament"], "city": ev["city"], "limit": 1000, "fields": "t1_user_id"})).json()
+                players = (await client.get("/admin/tournament-players", params={"name": ev["tournament"], "city": ev["city"]})).json()
+                ctx = {"event": ev, "match_ids": [m["id"] for m in matches], "team_ids": [p["team_id"] for p in players],
+                       "walk_in": season["walk_in"]["tournament"], "phones": season["walk_in"]["phones"]}
+                mix = EVENT_DAY_MIX
+            else:
+                match_ids, _ = await seed(client, args.players, args.matches)
+                ctx = {"event": {"tournament": "Load Cup", "city": "MUMBAI", "level": "OPEN"}, "match_ids": match_ids, "team_ids": [], "walk_in": None, "phones": []}
+                mix = MIX
+            if args.read_only: mix = [m for m in mix if m[0] not in ("submit", "join")]
+            samples = {}
+            start = time.perf_counter()
+            await asyncio.gather(*(worker(client, start + args.duration, ctx, samples, mix) for _ in range(args.concurrency)))
+            return summarize(samples, time.perf_counter() - start)
+    finally:
+        proc.terminate(); proc.wait()
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--app-dir", default=".")
+    ap.add_argument("--label", default="current")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--concurrency", type=int, default=64)
+    ap.add_argument("--duration", type=float, default=15)
+    ap.add_argument("--players", type=int, default=64)
+    ap.add_argument("--matches", type=int, default=200)
+    ap.add_argument("--profile", help="CLUB28_DB_PROFILE for the server (default, production)")
+    ap.add_argument("--read-only", action="store_true", help="drop score submissions and joins from the mix")
+    ap.add_argument("--scenario", choices=["basic", "event-day"], default="basic")
+    ap.add_argument("--out", help="append the result as a JSON line to this file")
+    args = ap.parse_args()
+
+    result = {"label": args.label, "commit": commit(args.app_dir), "scenario": args.scenario, "concurrency": args.concurrency, "duration_s": args.duration, "workers": args.workers, "read_only": args.read_only, "profile": args.profile, "results": asyncio.run(run(args))}
+    print(json.dumps(result, indent=2))
+    if args.out:
+        with open(args.out, "a") as f: f.write(json.dumps(result) + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Micro-benchmarks for the hot helpers, on a generated season.
+
+Times get_next_group, calculate_winner, scoring.parse, the /standings
+builder and the full standings recompute with timeit-style repeats (best
+of --repeat), and appends one JSON line per run to --out tagged with the
+current commit. --compare prints the ratio against the last line of an
+earlier results file, so a regression between commits shows up as a
+ratio above 1.
+
+    python -m bench.micro --out bench-results.jsonl
+    git checkout <other>; python -m bench.micro --compare bench-results.jsonl
+"""
+import argparse, asyncio, json, os, statistics, subprocess, tempfile, time
+
+def commit():
+    try: return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError): return None
+
+def best_of(fn, number, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number): fn()
+        runs.append((time.perf_counter() - start) / number)
+    return runs
+
+async def best_of_async(fn, number, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number): await fn()
+        runs.append((time.perf_counter() - start) / number)
+    return runs
+
+def summarize(runs, number):
+    return {"best_us": round(min(runs) * 1e6, 2), "median_us": round(statistics.median(runs) * 1e6, 2), "calls": number}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", type=int, default=32, help="per level in the generated season")
+    ap.add_argument("--cities", type=int, default=3)
+    ap.add_argument("--number", type=int, default=200)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--out", help="append results as a JSON line to this file")
+    ap.add_argument("--compare", help="results file to compare against (last line)")
+    args = ap.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/micro.db"
+    from bench import seed
+    season = seed.generate(cities=args.cities, players=args.players)
+    import main as api, scoring, standings, models
+    from database import SessionLocal, AsyncSessionLocal
+    from sqlalchemy import select
+
+    with SessionLocal() as db:
+        scores = [s for (s,) in db.execute(select(models.Match.score).where(models.Match.score.isnot(None)))]
+        walk_in = db.scalar(select(models.Tournament).where(models.Tournament.name == seed.WALK_IN))
+    ev = season["event"]
+    results = {}
+
+    i = iter(range(10**9))
+    results["calculate_winner"] = summarize(best_of(lambda: api.calculate_winner(scores[next(i) % len(scores)], "a", "b"), args.number * 10, args.repeat), args.number * 10)
+    results["scoring.parse_uncached"] = summarize(best_of(lambda: scoring.parse.__wrapped__(scores[next(i) % len(scores)]), args.number * 10, args.repeat), args.number * 10)
+
+    async def async_cases():
+        async with AsyncSessionLocal() as db:
+            results["get_next_group"] = summarize(await best_of_async(lambda: api.get_next_group(db, walk_in.id, "OPEN", walk_in.draw_size), args.number, args.repeat), args.number)
+            await db.rollback()
+            results["build_standings"] = summarize(await best_of_async(lambda: api.build_standings(db, ev["tournament"], ev["city"], ev["level"]), args.number, args.repeat), args.number)
+    asyncio.run(async_cases())
+
+    with SessionLocal() as db:
+        results["standings.compute_full"] = summarize(best_of(lambda: standings.compute(db), 3, args.repeat), 3)
+
+    line = {"commit": commit(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "season": {k: season[k] for k in ("tournaments", "users", "registrations", "matches")}, "results": results}
+    print(f"{'case':26} {'best us':>12} {'median us':>12}")
+    for name, r in results.items(): print(f"{name:26} {r['best_us']:12.2f} {r['median_us']:12.2f}")
+    if args.compare:
+        with open(args.compare) as f: base = json.loads(f.read().splitlines()[-1])
+        print(f"\nvs {base['commit']} ({base['time']}), best-time ratio (>1 is slower):")
+        for name, r in results.items():
+            if name in base["results"]: print(f"{name:26} {r['best_us'] / base['results'][name]['best_us']:12.2f}")
+    if args.out:
+        with open(args.out, "a") as f: f.write(json.dumps(line) + "\n")
+
+if __name__ == "__main__":
+    main()
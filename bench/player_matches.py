@@ -0,0 +1,70 @@
+"""Per-player match lookup at season scale: display-name scan vs the participant indexes.
+
+Seeds a scratch database with --matches matches between --players users and
+times, for a sample of players, the old shape of the lookup (t1/t2 compared
+against the display name, which no index covers) against the t1_user_id /
+t2_user_id lookup, both as a bare query and through /user/{team_id}/matches.
+
+    python -m bench.player_matches --matches 50000
+"""
+import argparse, os, random, statistics, tempfile, time
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--matches", type=int, default=50_000)
+    ap.add_argument("--players", type=int, default=5_000)
+    ap.add_argument("--sample", type=int, default=200)
+    args = ap.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    from fastapi.testclient import TestClient
+    from sqlalchemy import insert, select, or_
+    import main as api, models, migrations
+    from database import engine
+    migrations.upgrade(engine)
+
+    rnd = random.Random(28)
+    with engine.begin() as conn:
+        conn.execute(insert(models.User), [
+            {"phone": f"9{i:09d}", "name": f"Player {i}", "password": "x", "team_id": f"T{i:05d}", "wallet_balance": 0} for i in range(args.players)
+        ])
+        rows = []
+        for _ in range(args.matches):
+            a, b = rnd.sample(range(1, args.players + 1), 2)
+            rows.append({"category": f"League {rnd.randrange(10)}", "city": "MUMBAI", "group_id": "A", "t1": f"Player {a - 1}", "t2": f"Player {b - 1}",
+                         "t1_user_id": a, "t2_user_id": b, "status": rnd.choice(["Scheduled", "Official"]), "date": f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}", "time": "10:00", "stage": "Group"})
+        conn.execute(insert(models.Match), rows)
+
+    sample = rnd.sample(range(args.players), args.sample)
+    M = models.Match
+    def time_query(make):
+        samples = []
+        with engine.connect() as conn:
+            for i in sample:
+                start = time.perf_counter()
+                conn.execute(make(i)).all()
+                samples.append((time.perf_counter() - start) * 1000)
+        return samples
+
+    by_name = time_query(lambda i: select(M).where(or_(M.t1 == f"Player {i}", M.t2 == f"Player {i}")).order_by(M.date))
+    by_id = time_query(lambda i: select(M).where(or_(M.t1_user_id == i + 1, M.t2_user_id == i + 1)).order_by(M.date))
+    client = TestClient(api.app).__enter__()
+    def time_get(url_for):
+        samples = []
+        for i in sample:
+            start = time.perf_counter()
+            client.get(url_for(i))
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+    endpoint = time_get(lambda i: f"/user/T{i:05d}/matches")
+    # Same route with an unknown team id: one indexed query, so this is the per-request floor
+    floor = time_get(lambda i: "/user/NOBODY/matches")
+
+    print(f"{args.matches:,} matches, {args.players:,} players, {args.sample} lookups")
+    print(f"{'case':36} {'p50 ms':>8} {'p99 ms':>8}")
+    for label, s in (("name scan (t1/t2 = name)", by_name), ("participant index (t1/t2_user_id)", by_id), ("GET /user/{team_id}/matches", endpoint), ("  same route, 404 floor", floor)):
+        s = sorted(s)
+        print(f"{label:36} {statistics.median(s):8.2f} {s[min(len(s) - 1, int(len(s) * 0.99))]:8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Scheduler at event scale: plan time, endpoint latency and a conflict check on ~1,000 matches.
+
+Seeds a scratch database with one tournament of --levels levels, each with
+--players registered players in groups of four and their round-robin
+fixtures, then times scheduler.plan on its own, /admin/schedule-matches as
+a dry run and for real, and re-reads the committed rows to confirm no court
+or player is double-booked and every player gets --rest minutes between
+matches. The day count is compared with the capacity lower bound. Exits 1
+on any clash or unplaced match.
+
+    python -m bench.scheduler --levels 11 --courts 8
+"""
+import argparse, asyncio, json, math, os, statistics, sys, tempfile, time
+from collections import defaultdict
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--levels", type=int, default=11)
+    ap.add_argument("--players", type=int, default=64, help="per level")
+    ap.add_argument("--courts", type=int, default=8)
+    ap.add_argument("--minutes", type=int, default=90)
+    ap.add_argument("--rest", type=int, default=30)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    from fastapi.testclient import TestClient
+    from sqlalchemy import insert, select
+    import main as api, models, fixtures, scheduler
+    from database import engine, SessionLocal, AsyncSessionLocal
+
+    days = [{"label": f"2025-{m:02d}-{d:02d}", "value": "09:00-21:00"} for m in (3, 4, 5) for d in range(1, 29)]
+    levels = [f"L{i}" for i in range(args.levels)]
+    client = TestClient(api.app).__enter__()
+    client.post("/admin/create-tournament", json={"name": "Bench Open", "type": "League", "draw_size": args.players, "settings": [{"name": l, "fee": "0"} for l in levels], "schedule": days})
+    with engine.begin() as conn:
+        tid = conn.scalar(select(models.Tournament.id).where(models.Tournament.name == "Bench Open"))
+        users = [{"phone": f"8{i:09d}", "name": f"Player {i}", "password": "x", "team_id": f"P{i:05d}", "wallet_balance": 0} for i in range(args.levels * args.players)]
+        conn.execute(insert(models.User), users)
+        rows = []
+        for k, level in enumerate(levels):
+            names = [f"Player {k * args.players + i}" for i in range(args.players)]
+            groups = {api.group_labels(args.players)[i // 4]: names[i:i + 4] for i in range(0, args.players, 4)}
+            for r in fixtures.build(groups, []):
+                rows.append({**r, "tournament_id": tid, "category": "Bench Open", "city": "MUMBAI", "status": "Scheduled",
+                             "t1_user_id": int(r["t1"].split()[1]) + 1, "t2_user_id": int(r["t2"].split()[1]) + 1})
+        conn.execute(insert(models.Match), rows)
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            return await api.tournament_bookings(db, tid)
+    pending, booked = asyncio.run(load())
+    runs = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        placed, unplaced = scheduler.plan(pending, booked, days, args.courts, args.minutes, args.rest, 30)
+        runs.append((time.perf_counter() - start) * 1000)
+
+    body = {"category": "Bench Open", "courts": args.courts, "match_minutes": args.minutes, "rest_minutes": args.rest}
+    start = time.perf_counter()
+    preview = client.post("/admin/schedule-matches", json={**body, "dry_run": True}).json()
+    preview_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    done = client.post("/admin/schedule-matches", json=body).json()
+    commit_ms = (time.perf_counter() - start) * 1000
+
+    by_court, by_player = defaultdict(list), defaultdict(list)
+    with SessionLocal() as db:
+        for m in db.query(models.Match).filter(models.Match.tournament_id == tid, models.Match.court.isnot(None)):
+            at = scheduler.minutes(m.date, m.time)
+            by_court[m.court].append(at)
+            for p in (m.t1_user_id, m.t2_user_id): by_player[p].append(at)
+    def gaps_ok(starts, gap): s = sorted(starts); return all(b - a >= gap for a, b in zip(s, s[1:]))
+    court_clash = sum(not gaps_ok(v, args.minutes) for v in by_court.values())
+    rest_clash = sum(not gaps_ok(v, args.minutes + args.rest) for v in by_player.values())
+    per_court_day = (12 * 60) // args.minutes
+    bound = math.ceil(len(rows) / (args.courts * per_court_day))
+
+    print(f"{len(rows):,} matches, {args.courts} courts, {args.minutes} min + {args.rest} min rest, 09:00-21:00 days")
+    print(f"scheduler.plan            best {min(runs):8.1f} ms  median {statistics.median(runs):8.1f} ms")
+    print(f"POST dry_run              {preview_ms:8.1f} ms  scheduled={preview['scheduled']} unplaced={len(preview['unplaced'])}")
+    print(f"POST commit               {commit_ms:8.1f} ms  scheduled={done['scheduled']} {done['first_start']} -> {done['last_end']}")
+    print(f"days used {done['days']} (capacity lower bound {bound}); court clashes={court_clash} rest violations={rest_clash}")
+    print(json.dumps({"plan_best_ms": round(min(runs), 1), "days": done["days"], "bound": bound, "clashes": court_clash + rest_clash}))
+    sys.exit(1 if court_clash or rest_clash or done["unplaced"] else 0)
+
+if __name__ == "__main__":
+    main()
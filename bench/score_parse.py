@@ -0,0 +1,55 @@
+"""Micro-benchmark: score parsing, the old per-read path vs scoring.parse.
+
+`legacy_calculate_winner` is the function main.py used before scores were
+parsed at write time, kept verbatim for comparison. scoring.parse is timed
+both uncached (every string new) and through its LRU cache, which is what
+repeated scores such as "6-4, 6-3" hit in practice. The last line times
+what standings now do per match instead: read six integer attributes.
+
+    python -m bench.score_parse --number 200000
+"""
+import argparse, random, timeit
+from types import SimpleNamespace
+import scoring
+
+def legacy_calculate_winner(score_str, t1, t2):
+    if not score_str: return None
+    try:
+        t1_sets, t2_sets = 0, 0
+        for s in score_str.split(','):
+            p = s.strip().split('-')
+            if len(p) == 2:
+                if int(p[0]) > int(p[1]): t1_sets += 1
+                elif int(p[1]) > int(p[0]): t2_sets += 1
+        if t1_sets > t2_sets: return t1
+        elif t2_sets > t1_sets: return t2
+        else: return None
+    except: return None
+
+def sample_scores(n, seed=28):
+    rnd = random.Random(seed)
+    sets = ["6-0", "6-1", "6-2", "6-3", "6-4", "7-5", "2-6", "3-6", "4-6", "5-7"]
+    return [", ".join(rnd.choice(sets) for _ in range(rnd.choice((2, 3)))) for _ in range(n)]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--number", type=int, default=200_000)
+    args = ap.parse_args()
+
+    # Level 1-1 scores are dropped: they are rejected at write time now
+    scores = [s for s in sample_scores(args.number) if legacy_calculate_winner(s, 1, 2)]
+    uncached = scoring.parse.__wrapped__
+    m = SimpleNamespace(**scoring.columns("6-4, 3-6, 7-5"))
+    cases = [
+        ("legacy calculate_winner", lambda: [legacy_calculate_winner(s, "a", "b") for s in scores]),
+        ("scoring.parse (uncached)", lambda: [uncached(s) for s in scores]),
+        ("scoring.parse (LRU cached)", lambda: [scoring.parse(s) for s in scores]),
+        ("read stored columns", lambda: [(m.winner, m.t1_sets, m.t2_sets, m.t1_games, m.t2_games, m.tiebreaks) for _ in scores]),
+    ]
+    print(f"{'case':30} {'ns/score':>10}")
+    for label, fn in cases:
+        best = min(timeit.repeat(fn, number=1, repeat=5))
+        print(f"{label:30} {best / len(scores) * 1e9:10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Response size and latency of /scores and /admin/players at season scale.
+
+Seeds a scratch database with N matches and compares the old full dump
+(every ORM row through FastAPI's encoder) against filtered, projected and
+cursor-paginated requests.
+
+    python -m bench.scores_pagination --matches 100000
+"""
+import argparse, os, random, statistics, tempfile, time
+
+def timed(client, url, repeat):
+    samples, size = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        res = client.get(url)
+        samples.append((time.perf_counter() - start) * 1000)
+        size = len(res.content)
+    return statistics.median(samples), size, res
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--matches", type=int, default=100_000)
+    ap.add_argument("--players", type=int, default=5_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    from fastapi.testclient import TestClient
+    from sqlalchemy import insert
+    import main as api, models, migrations
+    from database import engine, SessionLocal
+    migrations.upgrade(engine)
+
+    rnd = random.Random(28)
+    events = [(f"League {i}", city) for i in range(10) for city in ("MUMBAI", "PUNE", "DELHI")]
+    statuses = ["Scheduled", "Official", "Pending Verification", "Disputed"]
+    with engine.begin() as conn:
+        conn.execute(insert(models.User), [
+            {"phone": f"9{i:09d}", "name": f"Player {i}", "password": "x", "team_id": f"T{i:05d}", "wallet_balance": 0}
+            for i in range(args.players)
+        ])
+        conn.execute(insert(models.Match), [
+            {"category": e[0], "city": e[1], "group_id": rnd.choice("ABCD"), "t1": f"Player {rnd.randrange(args.players)}",
+             "t2": f"Player {rnd.randrange(args.players)}", "score": "6-4, 3-6, 7-5", "status": rnd.choice(statuses),
+             "date": f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}", "time": "10:00", "stage": "Group"}
+            for e in (rnd.choice(events) for _ in range(args.matches))
+        ])
+
+    # The pre-pagination handlers, mounted only for comparison
+    @api.app.get("/_bench/scores-full")
+    def scores_full():
+        with SessionLocal() as db: return db.query(models.Match).all()
+
+    @api.app.get("/_bench/players-full")
+    def players_full():
+        with SessionLocal() as db: return db.query(models.User).all()
+
+    client = TestClient(api.app).__enter__()
+    cases = [
+        ("scores: full dump (old)", "/_bench/scores-full"),
+        ("scores: first page of 500", "/scores"),
+        ("scores: one event, official, projected", "/scores?tournament=League%203&city=PUNE&status=Official&fields=t1,t2,score&limit=1000"),
+        ("scores: date range", "/scores?date_from=2025-03-01&date_to=2025-03-07&limit=1000"),
+        ("players: full dump (old)", "/_bench/players-full"),
+        ("players: first page of 500", "/admin/players"),
+    ]
+    print(f"{'case':45} {'p50 ms':>9} {'bytes':>12}")
+    for label, url in cases:
+        ms, size, _ = timed(client, url, args.repeat)
+        print(f"{label:45} {ms:9.1f} {size:12,}")
+
+    # Walking every page touches each row once, so the total stays linear in table size
+    start, pages, url = time.perf_counter(), 0, "/scores?limit=1000&fields=score,status"
+    cursor = None
+    while True:
+        res = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        pages += 1
+        cursor = res.headers.get("X-Next-Cursor")
+        if not cursor: break
+    print(f"{'scores: walk all pages (1000/page)':45} {(time.perf_counter() - start) * 1000:9.1f} {pages:9} pages")
+
+if __name__ == "__main__":
+    main()
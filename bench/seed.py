@@ -0,0 +1,108 @@
+"""Synthetic season generator.
+
+Fills a database with cities x tournaments x levels of registered players,
+round-robin fixtures from fixtures.build, realistic score strings on the
+played share of rounds, opening wallet balances and materialized standings.
+Each city also gets an open "Walk-in Cup" with spare users who have not
+joined anything yet, so load scenarios can exercise /join-tournament. The
+same --seed always produces the same database.
+
+    DATABASE_URL=sqlite:///./season.db python -m bench.seed --cities 4 --tournaments 3 --players 32
+"""
+import argparse, json, random, time
+
+CITIES = ["MUMBAI", "PUNE", "DELHI", "BANGALORE", "HYDERABAD", "CHENNAI", "KOLKATA", "GOA"]
+LEVELS = ["ADVANCE", "INTERMEDIATE", "BEGINNER", "OPEN", "WOMEN", "MIXED"]
+FIRST = ["Aarav", "Vivaan", "Aditya", "Diya", "Ishaan", "Kabir", "Meera", "Anaya", "Rohan", "Saanvi", "Arjun", "Kiara", "Vihaan", "Tara", "Reyansh", "Zara"]
+LAST = ["Shah", "Mehta", "Iyer", "Kapoor", "Reddy", "Nair", "Singh", "Rao", "Gupta", "Das", "Joshi", "Menon"]
+WALK_IN = "Walk-in Cup"
+
+def random_set(rnd, t1_wins):
+    w, l, tb = rnd.choices([(6, rnd.randint(0, 4), None), (7, 5, None), (7, 6, rnd.randint(0, 8))], weights=(75, 15, 10))[0]
+    a, b = (w, l) if t1_wins else (l, w)
+    return f"{a}-{b}" + (f"({tb})" if tb is not None else "")
+
+def random_score(rnd):
+    """Best of three: a straight-sets or three-set result that scoring.parse accepts."""
+    t1 = rnd.random() < 0.5
+    order = [t1, t1] if rnd.random() < 0.6 else rnd.choice([[t1, not t1, t1], [not t1, t1, t1]])
+    return ", ".join(random_set(rnd, s) for s in order)
+
+def player_name(i):
+    return f"{FIRST[i % len(FIRST)]} {LAST[i // len(FIRST) % len(LAST)]} {i}"
+
+def generate(cities=3, tournaments=2, levels=3, players=16, spare=200, played=0.6, seed=28):
+    """Seeds the database behind database.engine; returns a summary the load scenarios use."""
+    from sqlalchemy import insert, select
+    from database import engine, SessionLocal
+    import models, migrations, standings, fixtures, scoring
+    from main import group_labels
+
+    started = time.perf_counter()
+    rnd = random.Random(seed)
+    migrations.upgrade(engine)
+    city_names, level_names = CITIES[:cities], LEVELS[:levels]
+    schedule = [{"label": f"2025-{(w // 4) + 1:02d}-{(w % 4) * 7 + 1:02d}", "value": "18:00-22:00"} for w in range(12)]
+    with engine.begin() as conn:
+        conn.execute(insert(models.Tournament), [
+            {"name": f"Season {k + 1}", "city": c, "sport": "Padel", "type": "League", "status": "Open", "fee": "500", "prize": "10000", "venue": f"Club28 {c.title()}",
+             "schedule": json.dumps(schedule), "settings": json.dumps([{"name": l, "fee": "500", "p1": "5000", "p2": "3000", "p3": "2000"} for l in level_names]), "draw_size": players}
+            for c in city_names for k in range(tournaments)
+        ] + [
+            {"name": WALK_IN, "city": c, "sport": "Padel", "type": "League", "status": "Open", "fee": "0", "prize": "0", "venue": f"Club28 {c.title()}",
+             "schedule": "[]", "settings": json.dumps([{"name": "OPEN", "fee": "0"}]), "draw_size": spare * 4} for c in city_names
+        ])
+        tids = {(n, c): i for i, n, c in conn.execute(select(models.Tournament.id, models.Tournament.name, models.Tournament.city))}
+
+        entrants = [(c, f"Season {k + 1}", l) for c in city_names for k in range(tournaments) for l in level_names]
+        total_users = len(entrants) * players + spare
+        conn.execute(insert(models.User), [
+            {"phone": f"7{i:09d}", "name": player_name(i), "password": "password", "team_id": f"{player_name(i)[:2].upper()}{i:05d}", "wallet_balance": rnd.choice((0, 500, 1000, 2500))}
+            for i in range(total_users)
+        ])
+        labels = group_labels(players)
+        regs, matches, uid = [], [], 1
+        for city, name, level in entrants:
+            groups, ids = {}, {}
+            for p in range(players):
+                g = labels[p % len(labels)]
+                regs.append({"user_id": uid, "tournament_id": tids[(name, city)], "tournament_name": name, "city": city, "sport": "Padel", "category": level, "group_id": g})
+                groups.setdefault(g, []).append(player_name(uid - 1)); ids[player_name(uid - 1)] = uid
+                uid += 1
+            planned = fixtures.build(groups, schedule)
+            cutoff = int(len(planned) * played)
+            for n, m in enumerate(planned):
+                row = {**m, "tournament_id": tids[(name, city)], "category": name, "city": city, "level": level, "t1_user_id": ids[m["t1"]], "t2_user_id": ids[m["t2"]],
+                       "status": "Scheduled", "score": None, "submitted_by_team": None, **scoring.columns(None)}
+                if n < cutoff:
+                    score = random_score(rnd)
+                    row.update(score=score, status=rnd.choices(["Official", "Pending Verification", "Disputed"], weights=(90, 8, 2))[0], submitted_by_team="SEED", **scoring.columns(score))
+                matches.append(row)
+        conn.execute(insert(models.Registration), regs)
+        conn.execute(insert(models.Match), matches)
+    with engine.begin() as conn: migrations.backfill(conn)   # opening ledger entries and categories for the rows above
+    with SessionLocal() as db: standings.rebuild(db)
+
+    return {
+        "cities": city_names, "tournaments": len(tids), "levels": level_names, "users": total_users, "registrations": len(regs), "matches": len(matches),
+        "event": {"tournament": "Season 1", "city": city_names[0], "level": level_names[0]},
+        "walk_in": {"tournament": WALK_IN, "level": "OPEN", "phones": [f"7{i:09d}" for i in range(uid - 1, total_users)]},
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cities", type=int, default=3)
+    ap.add_argument("--tournaments", type=int, default=2, help="per city")
+    ap.add_argument("--levels", type=int, default=3, help="per tournament")
+    ap.add_argument("--players", type=int, default=16, help="per level")
+    ap.add_argument("--spare", type=int, default=200, help="users not registered anywhere")
+    ap.add_argument("--played", type=float, default=0.6, help="share of fixtures with a score")
+    ap.add_argument("--seed", type=int, default=28)
+    args = ap.parse_args()
+    summary = generate(args.cities, args.tournaments, args.levels, args.players, args.spare, args.played, args.seed)
+    summary["walk_in"]["phones"] = len(summary["walk_in"]["phones"])
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
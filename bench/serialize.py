@@ -0,0 +1,70 @@
+"""Serialization time for 10k-row responses: jsonable_encoder + json.dumps vs the typed paths.
+
+"before" is what the app did until response models existed: FastAPI (or the
+response cache) walked ORM objects and dicts with jsonable_encoder and wrote
+them with json.dumps. "after" is the cache's orjson encoder for the cached
+read routes, and response-model validation + pydantic-core dump_json, which
+is what FastAPI does for every route that declares a response_model.
+
+    python -m bench.serialize --rows 10000
+"""
+import argparse, json, os, random, statistics, tempfile, time
+
+def timed(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return runs, len(out)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=10_000)
+    ap.add_argument("--repeat", type=int, default=7)
+    args = ap.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/serialize.db"
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    import main as api, models, scoring
+    from cache import encode
+    from bench.seed import random_score, player_name
+
+    rnd = random.Random(28)
+    settings = json.dumps([{"name": l, "fee": "500", "p1": "5000", "p2": "3000", "p3": "2000"} for l in ("ADVANCE", "INTERMEDIATE", "BEGINNER")])
+    schedule = json.dumps([{"label": f"2025-01-{d:02d}", "value": "18:00-22:00"} for d in range(1, 13)])
+    tournaments = [models.Tournament(id=i, name=f"Season {i}", city="MUMBAI", sport="Padel", type="League", fee="500", prize="10000", status="Open",
+                                     venue="Club28 Mumbai", schedule=schedule, settings=settings, draw_size=16) for i in range(args.rows)]
+    users = [models.User(id=i, phone=f"9{i:09d}", name=player_name(i), password="secret", team_id=f"T{i:05d}", wallet_balance=rnd.randint(0, 5000)) for i in range(args.rows)]
+    scores = []
+    for i in range(args.rows):
+        score = random_score(rnd) if rnd.random() < 0.6 else None
+        scores.append({"id": i, "tournament_id": 1, "category": "Season 1", "city": "MUMBAI", "group_id": "A", "t1": player_name(2 * i), "t2": player_name(2 * i + 1),
+                       "score": score, "status": "Official" if score else "Scheduled", "date": "2025-01-20", "time": "10:00", "stage": "Group", "submitted_by_team": None,
+                       "t1_user_id": 2 * i, "t2_user_id": 2 * i + 1, **scoring.columns(score)})
+
+    def old(content): return json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+    tournament_list = TypeAdapter(list[api.TournamentOut])
+    user_list = TypeAdapter(list[api.UserOut])
+    match_list = TypeAdapter(list[api.MatchRow])
+    cases = [
+        ("/tournaments (ORM rows)", "before: jsonable_encoder + json", lambda: old(tournaments)),
+        ("", "after: cache, orjson", lambda: encode([api.TournamentOut.model_validate(t) for t in tournaments])),
+        ("", "after: response_model dump_json", lambda: tournament_list.dump_json(tournament_list.validate_python(tournaments))),
+        ("users (ORM rows)", "before: jsonable_encoder + json", lambda: old(users)),
+        ("", "after: response_model dump_json", lambda: user_list.dump_json(user_list.validate_python(users))),
+        ("/scores (dict rows)", "before: jsonable_encoder + json", lambda: old(scores)),
+        ("", "after: cache, orjson", lambda: encode(scores)),
+        ("", "after: response_model dump_json", lambda: match_list.dump_json(match_list.validate_python(scores), exclude_unset=True)),
+    ]
+    print(f"{args.rows:,} rows, best/median of {args.repeat}")
+    print(f"{'response':24} {'path':34} {'best ms':>9} {'median ms':>10} {'KB':>8}")
+    for label, path, fn in cases:
+        runs, size = timed(fn, args.repeat)
+        print(f"{label:24} {path:34} {min(runs):9.1f} {statistics.median(runs):10.1f} {size / 1024:8.0f}")
+    leaked = b"secret" in old(users), b"secret" in user_list.dump_json(user_list.validate_python(users))
+    print(f"\npassword in output: before={leaked[0]} after={leaked[1]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Mixed read/write throughput per SQLite engine profile.
+
+For each CLUB28_DB_PROFILE, a fresh process seeds a scratch database, then runs
+reader threads polling standings while writer threads submit and verify scores
+(the same ORM calls the routes make) for --duration seconds.
+
+    python -m bench.sqlite_profile --readers 8 --writers 2 --duration 10
+"""
+import argparse, json, os, random, subprocess, sys, tempfile, threading, time
+
+def worker_process(args):
+    import models, standings
+    from database import engine, SessionLocal, Base, DB_PROFILE, effective_pragmas
+    from sqlalchemy import insert, select
+    from sqlalchemy.exc import OperationalError
+
+    Base.metadata.create_all(bind=engine)
+    players = [f"Player {i}" for i in range(64)]
+    with engine.begin() as conn:
+        conn.execute(insert(models.Tournament), [{"name": "Cup", "city": "MUMBAI", "sport": "Padel", "settings": "[]", "draw_size": 64}])
+        conn.execute(insert(models.User), [{"phone": str(i), "name": n, "password": "x", "team_id": f"T{i}", "wallet_balance": 0} for i, n in enumerate(players)])
+        conn.execute(insert(models.Registration), [{"user_id": i + 1, "tournament_id": 1, "tournament_name": "Cup", "city": "MUMBAI", "category": "OPEN", "group_id": "A"} for i in range(64)])
+        conn.execute(insert(models.Match), [{"tournament_id": 1, "category": "Cup", "city": "MUMBAI", "group_id": "A", "t1": a, "t2": b, "status": "Scheduled"}
+                                            for a, b in (random.sample(players, 2) for _ in range(2000))])
+    with SessionLocal() as db: standings.rebuild(db)
+
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def reader():
+        while time.perf_counter() < deadline:
+            with SessionLocal() as db:
+                db.execute(select(models.PlayerStanding).where(models.PlayerStanding.tournament_name == "Cup", models.PlayerStanding.city == "MUMBAI")
+                           .order_by(models.PlayerStanding.points.desc())).all()
+            with lock: counts["reads"] += 1
+
+    def writer():
+        while time.perf_counter() < deadline:
+            try:
+                with SessionLocal() as db:
+                    db.connection(execution_options={"write_lock": True})
+                    m = db.get(models.Match, random.randint(1, 2000))
+                    standings.update_match(db, m, score=f"6-{random.randint(0, 4)}, 6-{random.randint(0, 4)}", status="Official")
+                    db.commit()
+                with lock: counts["writes"] += 1
+            except OperationalError:
+                with lock: counts["locked"] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)] + [threading.Thread(target=writer) for _ in range(args.writers)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    print(json.dumps({"profile": DB_PROFILE, "pragmas": effective_pragmas(),
+                      **{f"{k}_per_s": round(v / args.duration, 1) for k, v in counts.items()}}))
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--profiles", default="default,production")
+    ap.add_argument("--readers", type=int, default=8)
+    ap.add_argument("--writers", type=int, default=2)
+    ap.add_argument("--duration", type=float, default=10)
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--out", help="append results as JSON lines to this file")
+    args = ap.parse_args()
+    if args.child:
+        return worker_process(args)
+
+    for profile in args.profiles.split(","):
+        # The profile is read when database.py is imported, so each one gets its own process
+        env = dict(os.environ, CLUB28_DB_PROFILE=profile, DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/profile.db")
+        cmd = [sys.executable, "-m", "bench.sqlite_profile", "--child", "--readers", str(args.readers), "--writers", str(args.writers), "--duration", str(args.duration)]
+        line = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True).stdout.strip().splitlines()[-1]
+        print(line)
+        if args.out:
+            with open(args.out, "a") as f: f.write(line + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Soak test for the /events stream: server memory per idle subscriber and fan-out latency.
+
+Starts uvicorn on a scratch database, opens --subscribers raw SSE connections
+to one tournament, and reads the server's RSS before and after. It then
+verifies a score --publishes times, timing how long it takes for every
+subscriber to receive the frame, holds the connections idle for --hold
+seconds to catch growth, and finally closes them and checks that the broker
+drops every queue.
+
+    python -m bench.sse_soak --subscribers 2000 --hold 30
+"""
+import argparse, asyncio, json, os, statistics, subprocess, sys, tempfile, time
+import httpx
+from bench.load_http import wait_ready, seed
+
+def rss_kb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"): return int(line.split()[1])
+
+class Subscriber:
+    def __init__(self):
+        self.received = 0
+        self.event = asyncio.Event()
+
+    async def run(self, port, path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept: text/event-stream\r\n\r\n".encode())
+        await writer.drain()
+        try:
+            while line := await reader.readline():
+                if line.startswith(b"event: match"):
+                    self.received += 1; self.event.set()
+        finally:
+            writer.close()
+
+async def run(args):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/soak.db")
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning", "--timeout-keep-alive", "3600"], cwd=args.app_dir, env=env)
+    result = {"subscribers": args.subscribers}
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", timeout=60) as client:
+            await wait_ready(client, proc)
+            match_ids, _ = await seed(client, 8, 4)
+            base = rss_kb(proc.pid)
+
+            path = "/events?tournament=Load%20Cup&city=MUMBAI"
+            subs = [Subscriber() for _ in range(args.subscribers)]
+            tasks = []
+            for i in range(0, len(subs), 200):
+                tasks += [asyncio.create_task(s.run(args.port, path)) for s in subs[i:i + 200]]
+                await asyncio.sleep(0.05)
+            start = time.perf_counter()
+            while (await client.get("/admin/stream-stats")).json()["subscribers"] < args.subscribers:
+                if time.perf_counter() - start > 120: raise RuntimeError("subscribers did not all connect")
+                await asyncio.sleep(0.2)
+            connected = rss_kb(proc.pid)
+            result.update(rss_base_kb=base, rss_connected_kb=connected, kb_per_subscriber=round((connected - base) / args.subscribers, 2))
+
+            fanout = []
+            for i in range(args.publishes):
+                for s in subs: s.event.clear()
+                start = time.perf_counter()
+                await client.post("/verify-score", json={"match_id": match_ids[i % len(match_ids)], "action": "APPROVE" if i % 2 == 0 else "REJECT"})
+                await asyncio.wait_for(asyncio.gather(*(s.event.wait() for s in subs)), 60)
+                fanout.append((time.perf_counter() - start) * 1000)
+            result.update(fanout_p50_ms=round(statistics.median(fanout), 1), fanout_max_ms=round(max(fanout), 1), all_received=all(s.received == args.publishes for s in subs))
+
+            await asyncio.sleep(args.hold)
+            result["rss_after_hold_kb"] = rss_kb(proc.pid)
+
+            for t in tasks: t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.sleep(1)
+            # Disconnects are noticed on the next write, so publish once more to flush dead queues
+            await client.post("/verify-score", json={"match_id": match_ids[0], "action": "APPROVE"})
+            await asyncio.sleep(1)
+            result["subscribers_after_close"] = (await client.get("/admin/stream-stats")).json()["subscribers"]
+            result["rss_after_close_kb"] = rss_kb(proc.pid)
+    finally:
+        proc.terminate(); proc.wait()
+    return result
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--app-dir", default=".")
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--subscribers", type=int, default=2000)
+    ap.add_argument("--publishes", type=int, default=5)
+    ap.add_argument("--hold", type=float, default=30)
+    args = ap.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Stress check for the wallet: concurrent fee debits and credits must neither create nor lose money.
+
+Registers --players users, then fires every join (each user into every
+tournament, fees chosen so not all can succeed), single top-ups and bulk
+top-ups at the app concurrently on a scratch database. Afterwards each
+balance must equal the credits that returned 200 minus fees for the
+registrations that exist, no balance may be negative, and
+/admin/wallet-reconcile must agree with the ledger.
+
+    python -m bench.wallet_stress --players 200 --tournaments 5
+"""
+import argparse, asyncio, os, random, sys, tempfile
+from collections import Counter, defaultdict
+
+async def run(args):
+    import httpx
+    import main as api, models
+    from database import SessionLocal
+
+    rnd = random.Random(28)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://bench", timeout=120) as client:
+        for t in range(args.tournaments):
+            await client.post("/admin/create-tournament", json={"name": f"Fee Cup {t}", "type": "League", "draw_size": args.players, "settings": [{"name": "OPEN", "fee": str(args.fee)}]})
+        users = []
+        for i in range(args.players):
+            name = f"{chr(65 + i // 26 % 26)}{chr(65 + i % 26)} Payer {i}"
+            users.append((await client.post("/register", json={"phone": f"91{i:08d}", "name": name, "password": "x"})).json()["user"])
+
+        credited = defaultdict(int)
+        # Opening credits cover roughly half the entries each user will attempt
+        opening = {u["team_id"]: args.fee * rnd.randint(0, args.tournaments) for u in users}
+        res = await client.post("/admin/bulk-topup", json={"credits": [{"team_id": t, "amount": a} for t, a in opening.items() if a], "reference": "opening"})
+        assert res.status_code == 200, res.text
+        for t, a in opening.items(): credited[t] += a
+
+        async def join(u, t):
+            res = await client.post("/join-tournament", json={"phone": u["phone"], "tournament_name": f"Fee Cup {t}", "level": "OPEN"})
+            return "join", res.status_code
+
+        async def topup(u):
+            amount = rnd.choice((args.fee // 2, args.fee))
+            res = await client.post("/admin/add-wallet", json={"team_id": u["team_id"], "amount": amount})
+            if res.status_code == 200: credited[u["team_id"]] += amount
+            return "topup", res.status_code
+
+        async def bulk(batch):
+            credits = [{"team_id": u["team_id"], "amount": args.fee // 4} for u in batch]
+            res = await client.post("/admin/bulk-topup", json={"credits": credits})
+            if res.status_code == 200:
+                for u in batch: credited[u["team_id"]] += args.fee // 4
+            return "bulk", res.status_code
+
+        ops = [join(u, t) for u in users for t in range(args.tournaments)]
+        ops += [topup(rnd.choice(users)) for _ in range(args.players)]
+        ops += [bulk(rnd.sample(users, min(50, len(users)))) for _ in range(args.players // 20)]
+        rnd.shuffle(ops)
+        codes = Counter(await asyncio.gather(*ops))
+        reconcile = (await client.get("/admin/wallet-reconcile")).json()
+
+    with SessionLocal() as db:
+        regs = Counter(tid for (tid,) in db.query(models.User.team_id).join(models.Registration, models.Registration.user_id == models.User.id))
+        balances = dict(db.query(models.User.team_id, models.User.wallet_balance).filter(models.User.team_id.in_([u["team_id"] for u in users])))
+    drift = {t: (balances[t], credited[t] - args.fee * regs[t]) for t in balances if balances[t] != credited[t] - args.fee * regs[t]}
+    negative = [t for t, b in balances.items() if b < 0]
+    print(f"responses={dict(sorted(codes.items()))}")
+    print(f"registrations={sum(regs.values())} credited={sum(credited.values())} fees={args.fee * sum(regs.values())} balances={sum(balances.values())}")
+    print(f"drift={len(drift)} negative={len(negative)} ledger_consistent={reconcile['consistent']}")
+    return not drift and not negative and reconcile["consistent"]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", type=int, default=200)
+    ap.add_argument("--tournaments", type=int, default=5)
+    ap.add_argument("--fee", type=int, default=400)
+    args = ap.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/wallet.db"
+    ok = asyncio.run(run(args))
+    print("OK" if ok else "FAILED: money was created or lost")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Response cache for the read-heavy public endpoints.
+
+Entries are keyed by path + query string + the current version of every tag the
+endpoint depends on. Write handlers call `invalidate(tag, ...)`, which bumps
+those versions, so stale entries simply stop being addressed and age out of the
+LRU. Every cached response carries an ETag; a matching If-None-Match gets a 304.
+Concurrent misses on one key share a single build (single flight), so a burst
+of clients refetching right after an invalidation costs one query, not one each.
+
+The backend is pluggable. The in-process `MemoryBackend` is per worker: with
+several uvicorn workers, an invalidation only reaches the worker that handled
+the write unless CLUB28_CACHE_URL points every worker at a shared `RedisBackend`
+(any Redis-protocol server works as a local stand-in).
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+# --- BACKENDS ---
+class MemoryBackend:
+    """TTL + LRU store living in this process."""
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()   # key -> (expires_at, value)
+        self.counters = {}
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get(self, key):
+        item = self.entries.get(key)
+        if item is None: return None
+        if item[0] < time.monotonic():
+            del self.entries[key]; self.expirations += 1
+            return None
+        self.entries.move_to_end(key)
+        return item[1]
+
+    async def set(self, key, value, ttl: float):
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False); self.evictions += 1
+
+    async def version(self, tag):
+        return self.counters.get(tag, 0)
+
+    async def bump(self, tag):
+        self.counters[tag] = self.counters.get(tag, 0) + 1
+
+    def stats(self):
+        return {"backend": "memory", "entries": len(self.entries), "max_entries": self.max_entries, "evictions": self.evictions, "expirations": self.expirations}
+
+class RedisBackend:
+    """Shared store for multi-worker deployments; eviction is left to the server's maxmemory policy."""
+    def __init__(self, url: str, prefix: str = "club28:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("CLUB28_CACHE_URL points at Redis but the 'redis' package is not installed") from e
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key):
+        raw = await self.client.get(self.prefix + "resp:" + key)
+        return json.loads(raw) if raw else None
+
+    async def set(self, key, value, ttl: float):
+        await self.client.set(self.prefix + "resp:" + key, json.dumps(value), px=int(ttl * 1000))
+
+    async def version(self, tag):
+        return int(await self.client.get(self.prefix + "tag:" + tag) or 0)
+
+    async def bump(self, tag):
+        await self.client.incr(self.prefix + "tag:" + tag)
+
+    def stats(self):
+        return {"backend": "redis"}
+
+def backend_from_env():
+    url = os.getenv("CLUB28_CACHE_URL", "memory://")
+    if url.startswith("redis"): return RedisBackend(url)
+    return MemoryBackend(int(os.getenv("CLUB28_CACHE_MAX_ENTRIES", "1024")))
+
+# --- RESPONSE CACHE ---
+ALL = "*"   # tag every entry depends on, for invalidate_all()
+
+def _encode_default(obj):
+    # orjson handles dicts, lists, scalars and datetimes natively; response models go through pydantic
+    if isinstance(obj, BaseModel): return obj.model_dump()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+def encode(content) -> bytes:
+    # Core table rows key their dicts with quoted_name, a str subclass orjson only takes with OPT_NON_STR_KEYS
+    return orjson.dumps(content, default=_encode_default, option=orjson.OPT_NON_STR_KEYS)
+
+def event_tag(tournament: str, city: str):
+    return f"event:{tournament}|{city}"
+
+class ResponseCache:
+    def __init__(self, backend, ttl: float = 30):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.coalesced = 0
+        self.inflight = {}   # key -> future of the entry being built, per process
+
+    async def _key(self, request: Request, tags):
+        versions = [f"{t}={await self.backend.version(t)}" for t in (ALL, *tags)]
+        params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{params}|{','.join(versions)}"
+
+    async def serve(self, request: Request, tags, build):
+        """Returns the cached response for this request, calling `build()` -> (content, headers) on a miss."""
+        key = await self._key(request, tags)
+        entry = await self.backend.get(key)
+        if entry is None:
+            entry = await self._fill(key, build)
+        else:
+            self.hits += 1
+        headers = {"ETag": entry["etag"], "Cache-Control": "no-cache", **entry["headers"]}
+        if request.headers.get("if-none-match") == entry["etag"]:
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(entry["body"], media_type="application/json", headers=headers)
+
+    async def _fill(self, key, build):
+        """Builds and stores the entry for `key`; a miss while another request builds it waits for that build."""
+        pending = self.inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            try: return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled(): raise
+            # The request that was building went away before finishing; build here instead
+        self.misses += 1
+        self.inflight[key] = future = asyncio.get_running_loop().create_future()
+        try:
+            content, headers = await build()
+            body = encode(content)
+            entry = {"body": body.decode(), "etag": '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"', "headers": headers or {}}
+            await self.backend.set(key, entry, self.ttl)
+            future.set_result(entry)
+            return entry
+        except asyncio.CancelledError:
+            future.cancel(); raise
+        except Exception as e:
+            # Waiters get the same error (a bad cursor is bad for all of them); marked retrieved so it is not logged twice
+            future.set_exception(e); future.exception()
+            raise
+        finally:
+            if self.inflight.get(key) is future: del self.inflight[key]
+
+    async def invalidate(self, *tags):
+        for tag in tags: await self.backend.bump(tag)
+
+    async def invalidate_all(self):
+        await self.backend.bump(ALL)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced, "not_modified": self.not_modified, "ttl": self.ttl, **self.backend.stats()}
+
+response_cache = ResponseCache(backend_from_env(), ttl=float(os.getenv("CLUB28_CACHE_TTL", "30")))
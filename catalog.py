@@ -0,0 +1,107 @@
+"""Tournament catalog: tournaments and their categories, cached in process.
+
+Categories live in the tournament_categories table; `category_rows` turns
+the admin's settings list (the same shape Tournament.settings stores) into
+those rows, and is also what the migration from the JSON column uses.
+
+`Catalog` keeps one immutable snapshot of every tournament and category in
+memory, stamped with a version. Create, edit and delete call `invalidate()`,
+which bumps the version, and the next reader loads a fresh snapshot, so the
+join and listing paths read catalog data without a DB round-trip. The cache
+is per worker: with several uvicorn workers, a write only invalidates the
+worker that handled it, so snapshots also expire after CLUB28_CATALOG_TTL
+seconds, and a lookup that misses reloads once before reporting not found.
+"""
+import os
+import time
+from collections import namedtuple
+import orjson
+from sqlalchemy import select
+import models
+
+Category = namedtuple("Category", "name fee p1 p2 p3 draw_size")
+Entry = namedtuple("Entry", "id name city sport type fee prize status venue schedule settings draw_size categories")
+
+def _int(val):
+    try: return int(val or 0)
+    except (TypeError, ValueError): return 0
+
+def category_rows(tournament_id, settings):
+    """Rows for tournament_categories from a settings list; a repeated name keeps its first entry."""
+    rows, seen = [], set()
+    for position, c in enumerate(settings or []):
+        name = c.get("name")
+        if not name or name in seen: continue
+        seen.add(name)
+        rows.append({"tournament_id": tournament_id, "position": position, "name": name, "fee": _int(c.get("fee")),
+                     "p1": _int(c.get("p1")), "p2": _int(c.get("p2")), "p3": _int(c.get("p3")), "draw_size": _int(c.get("draw_size")) or None})
+    return rows
+
+def fee_and_prize(rows):
+    """Tournament.fee / prize summary columns: the cheapest entry and the richest prize pool."""
+    return (str(min(r["fee"] for r in rows)) if rows else "0",
+            str(max(r["p1"] + r["p2"] + r["p3"] for r in rows)) if rows else "0")
+
+def _decode(text):
+    if not text: return []
+    try: return orjson.loads(text)
+    except orjson.JSONDecodeError: return []
+
+class Snapshot:
+    def __init__(self, version, entries):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.entries = entries   # ordered by id, like SELECT * FROM tournaments
+        self.by_id = {e.id: e for e in entries}
+        self.by_name, self.by_event = {}, {}
+        for e in entries:
+            self.by_name.setdefault(e.name, e)   # first by id, as the old name-only lookup returned
+            self.by_event.setdefault((e.name, e.city), e)
+
+    def lookup(self, name, city=None):
+        return self.by_event.get((name, city)) if city is not None else self.by_name.get(name)
+
+class Catalog:
+    def __init__(self, ttl: float = 60):
+        self.ttl = ttl
+        self.version = 0
+        self.snapshot = None
+        self.loads = 0
+
+    def invalidate(self):
+        self.version += 1
+
+    async def _load(self, db):
+        version = self.version   # taken first, so a write landing mid-load still forces the next reload
+        cats = {}
+        for tid, *fields in (await db.execute(select(
+            models.TournamentCategory.tournament_id, models.TournamentCategory.name, models.TournamentCategory.fee, models.TournamentCategory.p1,
+            models.TournamentCategory.p2, models.TournamentCategory.p3, models.TournamentCategory.draw_size
+        ).order_by(models.TournamentCategory.tournament_id, models.TournamentCategory.position))).all():
+            cats.setdefault(tid, {})[fields[0]] = Category(*fields)
+        T = models.Tournament
+        entries = [Entry(t.id, t.name, t.city, t.sport, t.type, t.fee, t.prize, t.status, t.venue, _decode(t.schedule), _decode(t.settings), t.draw_size, cats.get(t.id, {}))
+                   for t in (await db.execute(select(T).order_by(T.id))).scalars()]
+        self.snapshot = Snapshot(version, entries)
+        self.loads += 1
+        return self.snapshot
+
+    async def get(self, db):
+        s = self.snapshot
+        if s is None or s.version != self.version or time.monotonic() - s.loaded_at > self.ttl: s = await self._load(db)
+        return s
+
+    async def find(self, db, name, city=None):
+        """The tournament called `name` (in `city` when given), or None."""
+        loads = self.loads
+        e = (await self.get(db)).lookup(name, city)
+        if e is None and self.loads == loads:   # not just reloaded: it may have been created on another worker
+            e = (await self._load(db)).lookup(name, city)
+        return e
+
+    def stats(self):
+        s = self.snapshot
+        return {"version": self.version, "loads": self.loads, "ttl": self.ttl, "tournaments": len(s.entries) if s else 0,
+                "snapshot_version": s.version if s else None}
+
+catalog = Catalog(ttl=float(os.getenv("CLUB28_CATALOG_TTL", "60")))
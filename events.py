@@ -0,0 +1,71 @@
+"""In-process pub/sub for the live event stream.
+
+Each subscriber is one bounded asyncio.Queue held by an SSE response, so an
+idle connection costs a queue and a suspended coroutine, not a thread.
+Events are encoded once per publish and the same frame is fanned out to
+every queue. A subscriber that falls `QUEUE_SIZE` frames behind is reset to
+a single "resync" frame rather than slowing the publisher down.
+
+Fan-out is per worker: with several uvicorn workers a client only hears
+about writes handled by the worker it is connected to.
+"""
+import asyncio
+import json
+
+QUEUE_SIZE = 64
+HEARTBEAT_SECONDS = 15
+RESYNC = "event: resync\ndata: {}\n\n"
+
+def frame(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+class Broker:
+    def __init__(self):
+        self.topics = {}   # topic -> set of queues
+        self.published = 0
+        self.resyncs = 0
+
+    def subscribe(self, topic: str):
+        q = asyncio.Queue(QUEUE_SIZE)
+        self.topics.setdefault(topic, set()).add(q)
+        return q
+
+    def unsubscribe(self, topic: str, q):
+        subs = self.topics.get(topic)
+        if subs is None: return
+        subs.discard(q)
+        if not subs: del self.topics[topic]
+
+    def has_subscribers(self, topic: str):
+        return topic in self.topics
+
+    def publish(self, topic: str, event: str, data):
+        subs = self.topics.get(topic)
+        if not subs: return 0
+        msg = frame(event, data)
+        for q in subs:
+            try:
+                q.put_nowait(msg)
+            except asyncio.QueueFull:
+                while not q.empty(): q.get_nowait()
+                q.put_nowait(RESYNC); self.resyncs += 1
+        self.published += 1
+        return len(subs)
+
+    async def stream(self, topic: str):
+        """SSE body for one subscriber; unsubscribes when the client goes away."""
+        q = self.subscribe(topic)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    yield await asyncio.wait_for(q.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+        finally:
+            self.unsubscribe(topic, q)
+
+    def stats(self):
+        return {"topics": len(self.topics), "subscribers": sum(len(s) for s in self.topics.values()), "published": self.published, "resyncs": self.resyncs}
+
+broker = Broker()
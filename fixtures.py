@@ -0,0 +1,122 @@
+"""Fixture generation: round-robin group matches and an optional knockout bracket.
+
+Pure functions over player names and schedule rows; the endpoint in main.py
+reads the group assignments and bulk-inserts whatever `build()` returns.
+"""
+TBD = "TBD"
+BYE = "BYE"   # only in brackets generated before byes stopped being matches
+QUALIFIERS_PER_GROUP = 2
+KNOCKOUT_STAGES = {2: "Final", 4: "Semi Final", 8: "Quarter Final"}
+
+def round_robin(players):
+    """Circle method: returns rounds, each a list of (t1, t2) pairs; odd groups get a bye per round."""
+    players = list(players)
+    if len(players) < 2: return []
+    if len(players) % 2: players.append(None)
+    n = len(players)
+    rounds = []
+    for r in range(n - 1):
+        pairs = [(players[i], players[n - 1 - i]) for i in range(n // 2)]
+        rounds.append([(a, b) if r % 2 == 0 else (b, a) for a, b in pairs if a is not None and b is not None])
+        players = [players[0], players[-1]] + players[1:-1]
+    return rounds
+
+def stage_name(teams: int):
+    return KNOCKOUT_STAGES.get(teams, f"Round of {teams}")
+
+def bracket_order(size: int):
+    """Seed numbers (1-based) in bracket position order, so seeds 1 and 2 can only meet in the final."""
+    order = [1]
+    while len(order) < size:
+        n = len(order) * 2
+        order = [s for seed in order for s in (seed, n + 1 - seed)]
+    return order
+
+def _clash(a, b):
+    # A qualifier's first opponent: its own group's runner-up costs 2, another group winner 1
+    if a[:-1] == b[:-1]: return 2
+    return 1 if a.endswith("1") and b.endswith("1") else 0
+
+def _play(slots):
+    """(rounds of (stage, label), cost) for bracket `slots` in position order; None is a bye.
+
+    Cost sums _clash over every qualifier's first match, weighted by the chance of each
+    possible opponent coming through when the opponent is the winner of an earlier match.
+    """
+    rounds, cost, teams = [], 0.0, len(slots)
+    sides = [None if s is None else (s, [s], True) for s in slots]   # (label, who can arrive, first match?)
+    while teams >= 2:
+        stage, played, advancing = stage_name(teams), [], []
+        for a, b in zip(sides[::2], sides[1::2]):
+            if a is None or b is None:
+                advancing.append(a if b is None else b)
+                continue
+            for x, y in ((a, b), (b, a)):
+                if x[2]: cost += sum(_clash(x[0], o) for o in y[1]) / len(y[1]) / (2 if y[2] else 1)
+            played.append((stage, f"{a[0]} v {b[0]}"))
+            advancing.append((f"W {stage} {len(played)}", a[1] + b[1], False))
+        rounds.append(played)
+        sides, teams = advancing, teams // 2
+    return rounds, cost
+
+def knockout(groups):
+    """Placeholder bracket for the top two of each group: rounds of (stage, slot label) pairs.
+
+    Seeding starts with the group winners as the top seeds, so they are the ones
+    given byes when the group count is not a power of two; a bye is not a match,
+    the seed goes straight into the next round's label. Seeds are then swapped
+    while that lowers the _play cost, so a qualifier's first match is against a
+    runner-up from another group wherever the bracket shape allows it. Groups
+    are renamed last so the earliest groups keep the best seeds.
+    """
+    qualifiers = [f"{g}{place}" for place in range(1, QUALIFIERS_PER_GROUP + 1) for g in groups]
+    if len(qualifiers) < 2: return []
+    size = 1
+    while size < len(qualifiers): size *= 2
+    order = bracket_order(size)
+    ranked = qualifiers + [None] * (size - len(qualifiers))
+    def play(ranked): return _play([ranked[s - 1] for s in order])
+    rounds, cost = play(ranked)
+    while True:
+        # Steepest descent: take the single best swap each pass, until no swap helps
+        best = None
+        for i in range(len(qualifiers)):
+            for j in range(i + 1, len(qualifiers)):
+                ranked[i], ranked[j] = ranked[j], ranked[i]
+                trial = play(ranked)
+                if trial[1] < cost - 1e-9 and (best is None or trial[1] < best[2][1]): best = (i, j, trial)
+                ranked[i], ranked[j] = ranked[j], ranked[i]
+        if best is None: break
+        i, j, (rounds, cost) = best
+        ranked[i], ranked[j] = ranked[j], ranked[i]
+    # The cost only compares groups, so renaming them is free: the best-seeded winner becomes the first group, and so on
+    rename = dict(zip((q[:-1] for q in ranked if q and q.endswith("1")), groups))
+    return play([q and rename[q[:-1]] + q[-1] for q in ranked])[0]
+
+def slot(schedule, index):
+    """(date, time) for the index-th round: one schedule row per round, reusing the last row once they run out."""
+    if not schedule: return TBD, TBD
+    row = schedule[min(index, len(schedule) - 1)]
+    return (row.get("label") or TBD), (row.get("value") or TBD)
+
+def build(groups, schedule, with_knockout=False):
+    """Returns Match column dicts for every group's round-robin, plus the bracket when requested.
+
+    `groups` maps group label -> ordered player names. Round r of every group
+    shares schedule row r; knockout rounds take the rows after the group stage.
+    Knockout rows belong to no group: their bracket label goes in `slot`.
+    """
+    labels = sorted(groups, key=lambda g: (len(g), g))
+    per_group = {g: round_robin(groups[g]) for g in labels}
+    group_rounds = max((len(r) for r in per_group.values()), default=0)
+    rows = []
+    for r in range(group_rounds):
+        date, time = slot(schedule, r)
+        for g in labels:
+            if r < len(per_group[g]):
+                rows += [{"group_id": g, "t1": a, "t2": b, "date": date, "time": time, "stage": "Group"} for a, b in per_group[g][r]]
+    if with_knockout:
+        for k, matches in enumerate(knockout(labels)):
+            date, time = slot(schedule, group_rounds + k)
+            rows += [{"group_id": None, "slot": label, "t1": TBD, "t2": TBD, "date": date, "time": time, "stage": stage} for stage, label in matches]
+    return rows
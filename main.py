@@ -1,17 +1,40 @@
-from fastapi import FastAPI, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database import engine, SessionLocal, Base
+from fastapi import FastAPI, Depends, HTTPException, Request, Response
+from sqlalchemy import select, insert, update, delete, func, or_
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import engine, async_engine, AsyncSessionLocal, begin_write, DB_PROFILE, effective_pragmas, pragma_mismatches
 import models
+import standings
+import migrations
+import fixtures
+import scoring
+import scheduler
+import wallet
+import archive
+from cache import response_cache, event_tag
+from catalog import catalog, category_rows, fee_and_prize
+from events import broker
+import metrics
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import Optional
 import json
+import orjson
+import csv
+import codecs
+import io
 import random
 import os
+import string
+import logging
 
-# Create Tables
-Base.metadata.create_all(bind=engine)
+logger = logging.getLogger("uvicorn.error")
 
 app = FastAPI()
+metrics.instrument(engine, async_engine.sync_engine)
+app.add_middleware(metrics.MetricsMiddleware)
 
 # --- FIXED CORS SECTION ---
 app.add_middleware(
@@ -21,69 +44,258 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
 
+# --- STARTUP ---
+# Importing this module opens no connection. Migrations are their own step before the server starts
+# (python migrations.py upgrade, see the startCommand in render.yaml); the first request that needs the database checks
+# the schema version once and, with CLUB28_AUTO_MIGRATE=1 (the default, for local runs), applies
+# whatever is pending. /ready answers the same check for the host's health probe.
+AUTO_MIGRATE = os.getenv("CLUB28_AUTO_MIGRATE", "1") == "1"
+_schema_version = None
+
+def _start():
+    version = migrations.version(engine)
+    if version < migrations.HEAD and AUTO_MIGRATE:
+        migrations.upgrade(engine)
+        version = migrations.HEAD
+    if version >= migrations.HEAD:
+        # Report the pragmas the database actually runs with
+        pragmas = effective_pragmas()
+        logger.info("Database profile %r: %s", DB_PROFILE, pragmas)
+        for name, (want, got) in pragma_mismatches(pragmas).items():
+            logger.warning("PRAGMA %s is %r, profile %r wants %r", name, got, DB_PROFILE, want)
+    return version
+
+async def schema_ready():
+    global _schema_version
+    if _schema_version is None or _schema_version < migrations.HEAD: _schema_version = await run_in_threadpool(_start)
+    return _schema_version >= migrations.HEAD
+
+async def require_schema():
+    if not await schema_ready():
+        raise HTTPException(status_code=503, detail=f"Database schema is at version {_schema_version} of {migrations.HEAD}; run python migrations.py upgrade")
+
 # --- DB DEPENDENCY ---
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    await require_schema()
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+# --- RESPONSE MODELS ---
+# Every route declares one, so FastAPI validates and serializes straight to JSON
+# bytes through pydantic-core instead of walking ORM objects with jsonable_encoder.
+# Passwords never appear in any of them.
+class ORMModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+class Message(BaseModel):
+    message: str
+class Msg(BaseModel):
+    msg: str
+class Readiness(BaseModel):
+    ready: bool; schema_version: int; expected_version: int
+class ServerStatus(BaseModel):
+    status: str; docs_url: str
+class OTPSent(BaseModel):
+    status: str; otp: str
+class UserOut(ORMModel):
+    id: int; name: Optional[str] = None; team_id: Optional[str] = None; phone: Optional[str] = None; wallet_balance: Optional[int] = 0
+class RegistrationOut(BaseModel):
+    tournament: Optional[str] = None; city: Optional[str] = None; level: Optional[str] = None; group: Optional[str] = None
+class PlayerMatch(BaseModel):
+    id: int; tournament: Optional[str] = None; city: Optional[str] = None; level: Optional[str] = None; group: Optional[str] = None; slot: Optional[str] = None; stage: Optional[str] = None
+    date: Optional[str] = None; time: Optional[str] = None; court: Optional[int] = None; status: Optional[str] = None; score: Optional[str] = None; t1: Optional[str] = None; t2: Optional[str] = None; t1_team_id: Optional[str] = None; t2_team_id: Optional[str] = None
+    side: int; opponent: Optional[str] = None; won: Optional[bool] = None
+class PlayerMatches(BaseModel):
+    upcoming: list[PlayerMatch]; past: list[PlayerMatch]
+class RegisterOut(BaseModel):
+    status: str; user: UserOut
+class LoginOut(BaseModel):
+    status: str; user: UserOut; registrations: list[RegistrationOut]; matches: Optional[PlayerMatches] = None
+class UserDetail(UserOut):
+    registrations: list[RegistrationOut]; matches: Optional[PlayerMatches] = None
+class JoinResult(BaseModel):
+    status: str; user: UserOut; registrations: list[RegistrationOut]
+class PlayerRow(BaseModel):
+    # ?fields= projections leave the other fields unset; routes use response_model_exclude_unset
+    id: int; phone: Optional[str] = None; name: Optional[str] = None; team_id: Optional[str] = None; wallet_balance: Optional[int] = None
+class TournamentPlayer(BaseModel):
+    id: int; name: Optional[str] = None; team_id: Optional[str] = None; phone: Optional[str] = None; group_id: Optional[str] = None; active_level: Optional[str] = None
+class WalletBalance(BaseModel):
+    status: str; new_balance: int
+class BulkTopUpResult(BaseModel):
+    status: str; credits: int; users: int; total: int
+class CheckResult(BaseModel):
+    consistent: bool; problems: list[dict]
+class ManualRegistration(BaseModel):
+    message: str; group: str
+class ImportRowError(BaseModel):
+    line: int; error: str
+class ImportResult(BaseModel):
+    status: str; rows: int; imported: int; users_created: int; already_registered: int; error_count: int; errors: list[ImportRowError]
+class StandingRow(BaseModel):
+    name: Optional[str] = None; team_id: Optional[str] = None; group: str; points: int; gamesWon: int; played: int; setsWon: int; setsLost: int; gamesFor: int; gamesAgainst: int
+class RebuildResult(BaseModel):
+    status: str; rows: int
+class DbConfig(BaseModel):
+    profile: str; pragmas: dict; mismatches: dict
+class TournamentOut(ORMModel):
+    id: int; name: Optional[str] = None; city: Optional[str] = None; sport: Optional[str] = None; type: Optional[str] = None; fee: Optional[str] = None; prize: Optional[str] = None
+    status: Optional[str] = None; venue: Optional[str] = None; schedule: list = []; settings: list = []; draw_size: Optional[int] = None
+
+    @field_validator("schedule", "settings", mode="before")
+    @classmethod
+    def decode(cls, v):
+        # Stored as JSON text; sent decoded so clients do not parse twice
+        if v is None or v == "": return []
+        return orjson.loads(v) if isinstance(v, str) else v
+class ArchivedTournament(TournamentOut):
+    source_id: Optional[int] = None; archived_at: Optional[str] = None
+class ArchiveResult(BaseModel):
+    tournament: str; city: Optional[str] = None; archive_id: int; tournament_categories: int; registrations: int; matches: int; player_standings: int; seconds: float
+class MatchRow(BaseModel):
+    id: int; tournament_id: Optional[int] = None; category: Optional[str] = None; city: Optional[str] = None; level: Optional[str] = None; group_id: Optional[str] = None; slot: Optional[str] = None
+    t1: Optional[str] = None; t2: Optional[str] = None
+    score: Optional[str] = None; status: Optional[str] = None; date: Optional[str] = None; time: Optional[str] = None; stage: Optional[str] = None; submitted_by_team: Optional[str] = None
+    t1_user_id: Optional[int] = None; t2_user_id: Optional[int] = None; winner: Optional[int] = None; t1_sets: Optional[int] = None; t2_sets: Optional[int] = None
+    t1_games: Optional[int] = None; t2_games: Optional[int] = None; tiebreaks: Optional[int] = None; court: Optional[int] = None
+class FixtureResult(BaseModel):
+    message: str; groups: int; created: int; skipped: int
+class ScheduleAssignment(BaseModel):
+    match_id: int; date: str; time: str; court: int
+class ScheduleResult(BaseModel):
+    status: str; scheduled: int; unplaced: list[int]; first_start: Optional[str] = None; last_end: Optional[str] = None; days: int; assignments: list[ScheduleAssignment]
+class ScoreCorrection(BaseModel):
+    msg: str; winner: Optional[int] = None; sets: list[Optional[int]]; games: list[Optional[int]]
+class SeasonMatch(BaseModel):
+    id: int; category: Optional[str] = None; city: Optional[str] = None; level: Optional[str] = None; group: Optional[str] = None; slot: Optional[str] = None
+    t1: Optional[str] = None; t2: Optional[str] = None; time: Optional[str] = None; date: Optional[str] = None; court: Optional[int] = None; stage: Optional[str] = None; status: Optional[str] = None
+class SeasonScheduleBody(BaseModel):
+    schedule: list[SeasonMatch]
+class SeasonSchedule(BaseModel):
+    full_schedule: SeasonScheduleBody
 
 # --- HEALTH CHECK (To confirm server is up) ---
-@app.get("/")
-def read_root():
+@app.get("/", response_model=ServerStatus)
+async def read_root():
     return {"status": "Server is Live", "docs_url": "/docs"}
 
-# ... REST OF YOUR EXISTING CODE (safe_int, get_next_group, Schemas, etc.) ...
-# ... COPY PASTE THE REST OF YOUR FUNCTIONS BELOW ...
+@app.get("/ready", response_model=Readiness)
+async def readiness(response: Response):
+    # Liveness is /; this answers 503 until the database schema matches the code
+    ready = await schema_ready()
+    if not ready: response.status_code = 503
+    return {"ready": ready, "schema_version": _schema_version, "expected_version": migrations.HEAD}
 
-def safe_int(val):
-    try:
-        if val is None or val == "": return 0
-        return int(val)
-    except: return 0
+# ... REST OF YOUR EXISTING CODE (get_next_group, Schemas, etc.) ...
+# ... COPY PASTE THE REST OF YOUR FUNCTIONS BELOW ...
 
 # --- UPDATED: GROUP LOGIC USING REGISTRATIONS ---
-def get_next_group(db: Session, tournament_name: str, category: str, draw_size: int):
-    # Count how many registrations exist for this specific Tournament + Category
-    total_count = db.query(models.Registration).filter(
-        models.Registration.tournament_name == tournament_name,
+GROUP_SIZE = 4
+
+def group_labels(draw_size: int):
+    # A, B, ... Z, then AA, AB, ... for draws beyond 104 players
+    num_groups = max(1, -(-draw_size // GROUP_SIZE))
+    letters = string.ascii_uppercase
+    return [letters[i] if i < 26 else letters[i // 26 - 1] + letters[i % 26] for i in range(num_groups)]
+
+async def get_next_group(db: AsyncSession, tournament_id: int, category: str, draw_size: int):
+    # Run inside begin_write() so the counts cannot change before the registration is inserted
+    await db.execute(select(models.Tournament.id).where(models.Tournament.id == tournament_id).with_for_update())
+    counts = dict((await db.execute(select(models.Registration.group_id, func.count()).where(
+        models.Registration.tournament_id == tournament_id,
         models.Registration.category == category
-    ).count()
-    
-    if total_count >= draw_size:
-        return None, "FULL"
+    ).group_by(models.Registration.group_id))).all())
+    group = pick_group(counts, draw_size)
+    return (group, "OK") if group else (None, "FULL")
 
-    num_groups = draw_size // 4
-    all_groups = ['A', 'B', 'C', 'D']
-    allowed_groups = all_groups[:num_groups] 
-    
-    target_index = total_count % num_groups
-    target_group = allowed_groups[target_index]
-    
-    # Check count in specific group to ensure max 4
-    count_in_group = db.query(models.Registration).filter(
-        models.Registration.tournament_name == tournament_name,
-        models.Registration.category == category,
-        models.Registration.group_id == target_group
-    ).count()
-
-    if count_in_group < 4:
-        return target_group, "OK"
+def pick_group(counts: dict, draw_size: int):
+    """Group for the next entrant given {group_id: players}, or None when the draw is full."""
+    if sum(counts.values()) >= draw_size:
+        return None
+
+    allowed_groups = group_labels(draw_size)
+    target_group = allowed_groups[sum(counts.values()) % len(allowed_groups)]
+    if counts.get(target_group, 0) < GROUP_SIZE:
+        return target_group
     
     # Fallback: Find any open group
     for g in allowed_groups:
-        c = db.query(models.Registration).filter(
-            models.Registration.tournament_name == tournament_name,
-            models.Registration.category == category,
-            models.Registration.group_id == g
-        ).count()
-        if c < 4:
-            return g, "OK"
+        if counts.get(g, 0) < GROUP_SIZE:
+            return g
             
-    return None, "FULL"
+    return None
+
+def draw_size(tourney, level: str):
+    # A category may cap its own draw; otherwise the tournament's draw size applies
+    cat = tourney.categories.get(level)
+    return cat.draw_size if cat and cat.draw_size else tourney.draw_size
+
+async def registrations_for(db: AsyncSession, user_id: int):
+    regs = (await db.scalars(select(models.Registration).where(models.Registration.user_id == user_id))).all()
+    return [{"tournament": r.tournament_name, "city": r.city, "level": r.category, "group": r.group_id} for r in regs]
+
+# --- MATCH PARTICIPANTS ---
+async def participant_ids(db: AsyncSession, tournament_id: int, names, team_ids=(None, None)):
+    """User ids for a match's sides: by team_id when given, else by a name unique among the event's registrations."""
+    by_team = {t.strip().upper(): None for t in team_ids if t}
+    if by_team:
+        by_team.update((await db.execute(select(models.User.team_id, models.User.id).where(models.User.team_id.in_(list(by_team))))).all())
+        missing = [t for t, uid in by_team.items() if uid is None]
+        if missing: raise HTTPException(status_code=404, detail=f"Unknown team ids: {', '.join(missing)}")
+    by_name = {}
+    if tournament_id is not None:
+        for name, uid in (await db.execute(select(models.User.name, models.User.id).join(models.Registration, models.Registration.user_id == models.User.id).where(
+            models.Registration.tournament_id == tournament_id, models.User.name.in_(list(names))
+        ).distinct())).all():
+            by_name[name] = None if name in by_name else uid   # two players sharing a name stay unresolved
+    return [by_team[t.strip().upper()] if t else by_name.get(n) for n, t in zip(names, team_ids)]
+
+async def player_matches(db: AsyncSession, user_id: int, limit: int = 100):
+    """Upcoming (not yet official) and past matches for one player, via the t1/t2 participant indexes."""
+    T1, T2 = aliased(models.User), aliased(models.User)
+    rows = (await db.execute(
+        select(models.Match, T1.team_id, T2.team_id)
+        .outerjoin(T1, T1.id == models.Match.t1_user_id).outerjoin(T2, T2.id == models.Match.t2_user_id)
+        .where(or_(models.Match.t1_user_id == user_id, models.Match.t2_user_id == user_id))
+        .order_by(models.Match.date, models.Match.time, models.Match.id)
+    )).all()
+    upcoming, past = [], []
+    for m, t1_team, t2_team in rows:
+        side = 1 if m.t1_user_id == user_id else 2
+        item = {
+            "id": m.id, "tournament": m.category, "city": m.city, "level": m.level, "group": m.group_id, "slot": m.slot, "stage": m.stage, "date": m.date, "time": m.time, "court": m.court,
+            "status": m.status, "score": m.score, "t1": m.t1, "t2": m.t2, "t1_team_id": t1_team, "t2_team_id": t2_team,
+            "side": side, "opponent": m.t2 if side == 1 else m.t1, "won": None if m.winner is None else m.winner == side
+        }
+        (past if m.status == "Official" else upcoming).append(item)
+    return {"upcoming": upcoming[:limit], "past": past[::-1][:limit]}
+
+# --- PAGINATION ---
+# Keyset pagination: rows come back ordered by id and the last id of a full page is
+# returned in the X-Next-Cursor header; pass it back as ?cursor= for the next page.
+MAX_PAGE_SIZE = 1000
+MATCH_FIELDS = ["id", "tournament_id", "category", "city", "level", "group_id", "slot", "t1", "t2", "score", "status", "date", "time", "stage", "submitted_by_team", "t1_user_id", "t2_user_id", "court", *scoring.SCORE_COLUMNS]
+PLAYER_FIELDS = ["id", "phone", "name", "team_id", "wallet_balance"]
+
+def select_fields(model, fields: str, allowed: list):
+    names = [f.strip() for f in fields.split(",") if f.strip()] if fields else allowed
+    unknown = [f for f in names if f not in allowed]
+    if unknown: raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    if "id" not in names: names = ["id"] + names
+    return [getattr(model, f) for f in names]
+
+async def keyset_page(db: AsyncSession, stmt, id_col, cursor: int, limit: int):
+    """Returns (rows, headers); headers carries X-Next-Cursor when another page exists."""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if cursor is not None: stmt = stmt.where(id_col > cursor)
+    rows = (await db.execute(stmt.order_by(id_col).limit(limit + 1))).all()
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = str(rows[-1].id)
+    return [dict(r._mapping) for r in rows], headers
 
 # --- SCHEMAS ---
 class OTPRequest(BaseModel):
@@ -91,11 +303,15 @@ class OTPRequest(BaseModel):
 class RegisterRequest(BaseModel):
     phone: str; name: str; password: str
 class LoginRequest(BaseModel):
-    team_id: str; password: str
+    team_id: str; password: str; include_matches: bool = False
 class ForgotPasswordRequest(BaseModel):
     phone: str; new_password: str
 class WalletUpdate(BaseModel):
     team_id: str; amount: int
+class WalletCredit(BaseModel):
+    team_id: str; amount: int
+class BulkTopUp(BaseModel):
+    credits: list[WalletCredit]; reference: str = None
 class JoinRequest(BaseModel):
     phone: str; tournament_name: str; level: str
 class TournamentCreate(BaseModel):
@@ -104,10 +320,14 @@ class TournamentUpdate(BaseModel):
     id: int; name: str; status: str; settings: list; draw_size: int; city: str; sport: str; venue: str; schedule: list
 class TournamentDelete(BaseModel):
     id: int
+class TournamentArchive(BaseModel):
+    id: int
 class MatchCreate(BaseModel):
-    category: str; city: str; group_id: str; t1: str; t2: str; date: str; time: str
+    category: str; city: str; group_id: str; t1: str; t2: str; date: str; time: str; t1_team_id: str = None; t2_team_id: str = None
+class FixtureGenerate(BaseModel):
+    category: str; city: str = "MUMBAI"; level: str; knockout: bool = False
 class MatchFullUpdate(BaseModel):
-    id: int; t1: str; t2: str; date: str; time: str; score: str
+    id: int; t1: str; t2: str; date: str; time: str; score: str; t1_team_id: str = None; t2_team_id: str = None
 class MatchDelete(BaseModel):
     id: int
 class ScoreSubmit(BaseModel):
@@ -117,45 +337,53 @@ class ScoreVerify(BaseModel):
 class AdminScoreUpdate(BaseModel):
     match_id: int; score: str
 class MatchScheduleUpdate(BaseModel):
-    match_id: int; date: str; time: str
+    match_id: int; date: str; time: str; court: int = None; match_minutes: int = scheduler.MATCH_MINUTES; rest_minutes: int = scheduler.REST_MINUTES
+class ScheduleWindow(BaseModel):
+    date: str; hours: str   # YYYY-MM-DD, HH:MM-HH:MM
+class ScheduleGenerate(BaseModel):
+    category: str; city: str = "MUMBAI"; courts: int; match_minutes: int = scheduler.MATCH_MINUTES; rest_minutes: int = scheduler.REST_MINUTES; step_minutes: int = 30
+    replan: bool = False; dry_run: bool = False
+    # Play windows; when empty the tournament's schedule rows are used, which only works if they are dates and hours
+    windows: list[ScheduleWindow] = []
 class AdminAddPlayer(BaseModel):
     name: str; phone: str; category: str; city: str; level: str
 
 # --- AUTH & USER ---
-@app.post("/send-otp")
-def send_otp(data: OTPRequest): return {"status": "sent", "otp": "1234"}
+@app.post("/send-otp", response_model=OTPSent)
+async def send_otp(data: OTPRequest): return {"status": "sent", "otp": "1234"}
 
-@app.post("/register")
-def register(data: RegisterRequest, db: Session = Depends(get_db)):
-    exists = db.query(models.User).filter(models.User.phone == data.phone).first()
+@app.post("/register", response_model=RegisterOut)
+async def register(data: RegisterRequest, db: AsyncSession = Depends(get_db)):
+    await begin_write(db)
+    exists = await db.scalar(select(models.User).where(models.User.phone == data.phone))
     if exists: raise HTTPException(status_code=400, detail="Phone already registered")
     team_id = f"{data.name[:2].upper()}{data.phone[-2:]}"
-    while db.query(models.User).filter(models.User.team_id == team_id).first():
+    while await db.scalar(select(models.User.id).where(models.User.team_id == team_id)):
         team_id = f"{data.name[:2].upper()}{random.randint(10,99)}"
     new_user = models.User(phone=data.phone, name=data.name, password=data.password, team_id=team_id, wallet_balance=0)
-    db.add(new_user); db.commit(); db.refresh(new_user)
+    db.add(new_user); await db.commit(); await db.refresh(new_user)
     return {"status": "created", "user": new_user}
 
-@app.post("/login")
-def login(data: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.team_id == data.team_id).first()
+@app.post("/login", response_model=LoginOut, response_model_exclude_unset=True)
+async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)):
+    user = await db.scalar(select(models.User).where(models.User.team_id == data.team_id))
     if not user: raise HTTPException(status_code=404, detail="Team ID not found")
     if user.password != data.password: raise HTTPException(status_code=401, detail="Wrong Password")
     
     # Fetch registrations manually to return in login response
-    regs = db.query(models.Registration).filter(models.Registration.user_id == user.id).all()
-    reg_data = [{"tournament": r.tournament_name, "city": r.city, "level": r.category, "group": r.group_id} for r in regs]
+    reg_data = await registrations_for(db, user.id)
     
-    return {"status": "success", "user": user, "registrations": reg_data}
+    out = {"status": "success", "user": user, "registrations": reg_data}
+    if data.include_matches: out["matches"] = await player_matches(db, user.id)
+    return out
 
-@app.get("/user/{team_id}")
-def get_user_details(team_id: str, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.team_id == team_id).first()
+@app.get("/user/{team_id}", response_model=UserDetail, response_model_exclude_unset=True)
+async def get_user_details(team_id: str, include: str = None, db: AsyncSession = Depends(get_db)):
+    user = await db.scalar(select(models.User).where(models.User.team_id == team_id))
     if not user: raise HTTPException(status_code=404, detail="User not found")
     
     # Include registrations in response
-    regs = db.query(models.Registration).filter(models.Registration.user_id == user.id).all()
-    reg_data = [{"tournament": r.tournament_name, "city": r.city, "level": r.category, "group": r.group_id} for r in regs]
+    reg_data = await registrations_for(db, user.id)
     
     return {
         "id": user.id, 
@@ -163,20 +391,41 @@ def get_user_details(team_id: str, db: Session = Depends(get_db)):
         "team_id": user.team_id, 
         "phone": user.phone, 
         "wallet_balance": user.wallet_balance, 
-        "registrations": reg_data
+        "registrations": reg_data,
+        **({"matches": await player_matches(db, user.id)} if include == "matches" else {})
     }
 
+@app.get("/user/{team_id}/matches", response_model=PlayerMatches)
+async def get_user_matches(team_id: str, limit: int = 100, db: AsyncSession = Depends(get_db)):
+    user_id = await db.scalar(select(models.User.id).where(models.User.team_id == team_id))
+    if not user_id: raise HTTPException(status_code=404, detail="User not found")
+    return await player_matches(db, user_id, max(1, min(limit, MAX_PAGE_SIZE)))
+
 # --- ADMIN ---
-@app.get("/admin/players")
-def get_all_players(db: Session = Depends(get_db)): return db.query(models.User).all()
+@app.get("/admin/players", response_model=list[PlayerRow], response_model_exclude_unset=True)
+async def get_all_players(response: Response, tournament: str = None, city: str = None, q: str = None, fields: str = None, cursor: int = None, limit: int = 500, db: AsyncSession = Depends(get_db)):
+    # Passwords are never selected; PLAYER_FIELDS is the full public projection
+    stmt = select(*select_fields(models.User, fields, PLAYER_FIELDS))
+    if tournament: stmt = stmt.where(registered_in(tournament, city))
+    if q:
+        stmt = stmt.where((models.User.name.ilike(f"%{q}%")) | (models.User.phone.startswith(q)) | (models.User.team_id == q.strip().upper()))
+    rows, headers = await keyset_page(db, stmt, models.User.id, cursor, limit)
+    response.headers.update(headers)
+    return rows
+
+def registered_in(tournament: str, city: str = None):
+    """EXISTS filter on users: registered in `tournament` (in `city` when given)."""
+    regs = select(models.Registration.id).where(models.Registration.user_id == models.User.id, models.Registration.tournament_name == tournament)
+    if city: regs = regs.where(models.Registration.city == city)
+    return regs.exists()
 
-@app.get("/admin/tournament-players")
-def get_tournament_players(name: str, city: str = "MUMBAI", db: Session = Depends(get_db)):
+@app.get("/admin/tournament-players", response_model=list[TournamentPlayer])
+async def get_tournament_players(name: str, city: str = "MUMBAI", db: AsyncSession = Depends(get_db)):
     # Join Registration and User tables to get players FOR THIS EVENT only
-    results = db.query(models.Registration, models.User).join(models.User, models.Registration.user_id == models.User.id).filter(
+    results = (await db.execute(select(models.Registration, models.User).join(models.User, models.Registration.user_id == models.User.id).where(
         models.Registration.tournament_name == name,
         models.Registration.city == city
-    ).all()
+    ))).all()
     
     players = []
     for reg, user in results:
@@ -190,49 +439,85 @@ def get_tournament_players(name: str, city: str = "MUMBAI", db: Session = Depend
         })
     return players
 
-@app.post("/admin/add-wallet")
-def add_wallet_money(data: WalletUpdate, db: Session = Depends(get_db)):
+@app.post("/admin/add-wallet", response_model=WalletBalance)
+async def add_wallet_money(data: WalletUpdate, db: AsyncSession = Depends(get_db)):
+    await begin_write(db)
     clean_id = data.team_id.strip().upper()
-    user = db.query(models.User).filter(models.User.team_id == clean_id).first()
-    if not user: raise HTTPException(status_code=404, detail="Player not found")
+    user_id = await db.scalar(select(models.User.id).where(models.User.team_id == clean_id))
+    if not user_id: raise HTTPException(status_code=404, detail="Player not found")
     
-    user.wallet_balance += data.amount; db.commit()
-    return {"status": "ok", "new_balance": user.wallet_balance}
-
-@app.post("/admin/manual-register")
-def admin_manual_register(data: AdminAddPlayer, db: Session = Depends(get_db)):
-    tourney = db.query(models.Tournament).filter(
-        models.Tournament.name == data.category,
-        models.Tournament.city == data.city
-    ).first()
+    balance = await db.run_sync(wallet.credit, user_id, data.amount, "topup" if data.amount >= 0 else "adjustment", "admin")
+    await db.commit()
+    return {"status": "ok", "new_balance": balance}
+
+MAX_BULK_CREDITS = 50_000
+
+@app.post("/admin/bulk-topup", response_model=BulkTopUpResult)
+async def admin_bulk_topup(request: Request, db: AsyncSession = Depends(get_db)):
+    # Body is JSON ({"credits": [{"team_id", "amount"}], "reference"}) or text/csv with a team_id,amount header
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith("text/csv"):
+        reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+        if not {"team_id", "amount"} <= set(reader.fieldnames or []): raise HTTPException(status_code=400, detail="CSV needs team_id and amount columns")
+        credits, bad = [], []
+        for line, row in enumerate(reader, start=2):
+            try: credits.append((row["team_id"], int(row["amount"])))
+            except (TypeError, ValueError): bad.append(line)
+        if bad: raise HTTPException(status_code=400, detail=f"Invalid amount on CSV lines {bad[:20]}")
+        reference = request.query_params.get("reference")
+    else:
+        try: data = BulkTopUp.model_validate_json(body)
+        except ValueError as e: raise HTTPException(status_code=400, detail=str(e))
+        credits, reference = [(c.team_id, c.amount) for c in data.credits], data.reference
+    if not credits: raise HTTPException(status_code=400, detail="No credits given")
+    if len(credits) > MAX_BULK_CREDITS: raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_CREDITS} credits per batch")
+    if any(amount <= 0 for _, amount in credits): raise HTTPException(status_code=400, detail="Amounts must be positive; use /admin/add-wallet for adjustments")
+
+    await begin_write(db)
+    try: applied = await db.run_sync(wallet.bulk_credit, credits, "topup", reference or f"bulk:{len(credits)}")
+    except wallet.UnknownTeams as e: raise HTTPException(status_code=400, detail=f"Unknown team ids: {e.team_ids[:50]}")
+    await db.commit()
+    return {"status": "ok", "credits": len(credits), **applied}
+
+@app.get("/admin/wallet-reconcile", response_model=CheckResult)
+async def wallet_reconcile(db: AsyncSession = Depends(get_db)):
+    problems = await db.run_sync(wallet.reconcile)
+    return {"consistent": not problems, "problems": problems}
+
+@app.post("/admin/manual-register", response_model=ManualRegistration)
+async def admin_manual_register(data: AdminAddPlayer, db: AsyncSession = Depends(get_db)):
+    await begin_write(db)
+    tourney = await catalog.find(db, data.category, data.city)
     if not tourney: raise HTTPException(status_code=404, detail="Tournament not found")
     
     # 1. Check Capacity
-    group, status = get_next_group(db, data.category, data.level, tourney.draw_size)
+    group, status = await get_next_group(db, tourney.id, data.level, draw_size(tourney, data.level))
     if status == "FULL": raise HTTPException(status_code=400, detail=f"Category {data.level} is FULL")
 
     # 2. Check User
-    user = db.query(models.User).filter(models.User.phone == data.phone).first()
+    user = await db.scalar(select(models.User).where(models.User.phone == data.phone))
     if not user:
-         team_id = f"{data.name[:2].upper()}{data.phone[-2:]}"
+         team_id = (await new_team_ids(db, [(data.name, data.phone)]))[0]
          user = models.User(phone=data.phone, name=data.name, password="password", team_id=team_id, wallet_balance=0)
-         db.add(user); db.commit(); db.refresh(user)
+         db.add(user); await db.flush()
 
     # 3. Check Duplicate Registration
-    existing = db.query(models.Registration).filter(
+    existing = await db.scalar(select(models.Registration).where(
         models.Registration.user_id == user.id, 
         models.Registration.tournament_name == data.category,
         models.Registration.city == data.city
-    ).first()
+    ))
     if existing: raise HTTPException(status_code=400, detail="Player already in this tournament")
 
     # 4. Create Registration
-    new_reg = models.Registration(user_id=user.id, tournament_name=data.category, city=data.city, category=data.level, group_id=group)
-    db.add(new_reg); db.commit()
+    new_reg = models.Registration(user_id=user.id, tournament_id=tourney.id, tournament_name=data.category, city=data.city, category=data.level, group_id=group)
+    db.add(new_reg); await db.flush()
+    await db.run_sync(standings.ensure_row, new_reg, user); await db.commit()
+    await response_cache.invalidate(event_tag(data.category, data.city))
     return {"message": "User Registered", "group": group}
 
-@app.post("/join-tournament")
-def join_tournament(data: JoinRequest, db: Session = Depends(get_db)):
+@app.post("/join-tournament", response_model=JoinResult)
+async def join_tournament(data: JoinRequest, db: AsyncSession = Depends(get_db)):
     # Note: data.level is usually passed as 'Advance' or 'Intermediate'
     # But JoinRequest needs updating to include CITY if you want to support multi-city
     # Assuming frontend sends: phone, tournament_name, city, sport, level
@@ -245,7 +530,8 @@ def join_tournament(data: JoinRequest, db: Session = Depends(get_db)):
     # Let's handle the request carefully:
     # If your frontend sends "city", you MUST add it to JoinRequest schema at the top of this file.
     
-    user = db.query(models.User).filter(models.User.phone == data.phone).first()
+    await begin_write(db)
+    user = await db.scalar(select(models.User).where(models.User.phone == data.phone))
     if not user: raise HTTPException(status_code=404, detail="User not found (Check Phone)")
 
     # Find tournament (Ideally by Name AND City, but Schema needs update)
@@ -256,173 +542,578 @@ def join_tournament(data: JoinRequest, db: Session = Depends(get_db)):
     # tourney = db.query(models.Tournament).filter(models.Tournament.name == data.tournament_name, models.Tournament.city == data.city).first()
     
     # Fallback to just Name for now to prevent crash if schema mismatch:
-    tourney = db.query(models.Tournament).filter(models.Tournament.name == data.tournament_name).first()
+    tourney = await catalog.find(db, data.tournament_name)
     if not tourney: raise HTTPException(status_code=404, detail="Tournament not found")
 
     # 1. Check Duplicate
-    existing = db.query(models.Registration).filter(models.Registration.user_id == user.id, models.Registration.tournament_name == data.tournament_name).first()
+    existing = (await db.scalars(select(models.Registration).where(models.Registration.user_id == user.id, models.Registration.tournament_name == data.tournament_name))).first()
     if existing: raise HTTPException(status_code=400, detail=f"Already registered in {data.tournament_name}")
 
     # 2. Check Capacity
-    group, status = get_next_group(db, data.tournament_name, data.level, tourney.draw_size)
-    if status == "FULL": raise HTTPException(status_code=400, detail=f"Full (Limit {tourney.draw_size})")
+    limit = draw_size(tourney, data.level)
+    group, status = await get_next_group(db, tourney.id, data.level, limit)
+    if status == "FULL": raise HTTPException(status_code=400, detail=f"Full (Limit {limit})")
 
     # 3. Check Fee
-    categories = json.loads(tourney.settings)
-    required_fee = 0
-    for cat in categories:
-        if cat['name'] == data.level: required_fee = safe_int(cat.get('fee')); break
+    cat = tourney.categories.get(data.level)
+    required_fee = cat.fee if cat else 0
     
-    if user.wallet_balance < required_fee: raise HTTPException(status_code=400, detail="Insufficient Balance")
-
-    # 4. Register
-    user.wallet_balance -= required_fee
+    # 4. Register, and debit the fee in the same transaction (conditional UPDATE, see wallet.py)
     # Note: We need to save City here. Assuming tourney.city is correct.
-    new_reg = models.Registration(user_id=user.id, tournament_name=data.tournament_name, city=tourney.city, category=data.level, group_id=group)
-    db.add(new_reg)
-    db.commit()
+    new_reg = models.Registration(user_id=user.id, tournament_id=tourney.id, tournament_name=data.tournament_name, city=tourney.city, category=data.level, group_id=group)
+    db.add(new_reg); await db.flush()
+    if required_fee > 0:
+        balance = await db.run_sync(wallet.debit, user.id, required_fee, "fee", f"registration:{new_reg.id}")
+        if balance is None: raise HTTPException(status_code=400, detail="Insufficient Balance")
+    await db.run_sync(standings.ensure_row, new_reg, user)
+    await db.commit()
+    await response_cache.invalidate(event_tag(tourney.name, tourney.city))
     
     # Return updated user info
-    regs = db.query(models.Registration).filter(models.Registration.user_id == user.id).all()
-    reg_data = [{"tournament": r.tournament_name, "city": r.city, "level": r.category, "group": r.group_id} for r in regs]
+    reg_data = await registrations_for(db, user.id)
     
-    return {"status": "joined", "user": {"id": user.id, "name": user.name, "team_id": user.team_id, "phone": user.phone, "wallet_balance": user.wallet_balance}, "registrations": reg_data}
+    return {"status": "joined", "user": user, "registrations": reg_data}
 
-@app.get("/standings")
-def get_standings(tournament: str, city: str = "MUMBAI", level: str = None, db: Session = Depends(get_db)):
-    # Join Registration and User
-    query = db.query(models.Registration, models.User).join(models.User, models.Registration.user_id == models.User.id).filter(
-        models.Registration.tournament_name == tournament,
-        models.Registration.city == city
+# --- BULK IMPORT ---
+# A name,phone,level CSV read from the request body as it arrives and registered IMPORT_CHUNK rows
+# at a time: each chunk is one write transaction with one group-count query and bulk inserts, so
+# onboarding a city is one upload instead of hundreds of /admin/manual-register calls. Earlier
+# chunks stay committed if a later one fails; re-running the file skips players already registered.
+IMPORT_CHUNK = 500
+IMPORT_COLUMNS = ("name", "phone", "level")
+MAX_IMPORT_ERRORS = 1000
+
+async def body_lines(request: Request):
+    """Decoded lines of the request body, as they stream in."""
+    decoder, tail = codecs.getincrementaldecoder("utf-8-sig")(), ""
+    async for chunk in request.stream():
+        lines = (tail + decoder.decode(chunk)).split("\n")
+        tail = lines.pop()
+        for line in lines: yield line
+    tail += decoder.decode(b"", final=True)
+    if tail: yield tail
+
+async def new_team_ids(db: AsyncSession, players):
+    """Team ids for new (name, phone) players, as /register makes them: two letters of the name and the
+    phone's last two digits, or on a clash the first free number from 10 up."""
+    bases = [f"{name[:2].upper()}{phone[-2:]}" for name, phone in players]
+    taken = set(await db.scalars(select(models.User.team_id).where(models.User.team_id.in_(set(bases)))))
+    scan_from, out = {}, []   # prefix -> next number to try, once its taken ids are loaded
+    for (name, _), team_id in zip(players, bases):
+        prefix = name[:2].upper()
+        if team_id in taken:
+            if prefix not in scan_from:
+                taken.update(await db.scalars(select(models.User.team_id).where(models.User.team_id.startswith(prefix, autoescape=True))))
+            n = scan_from.get(prefix, 10)
+            while f"{prefix}{n}" in taken: n += 1
+            scan_from[prefix] = n + 1
+            team_id = f"{prefix}{n}"
+        taken.add(team_id)
+        out.append(team_id)
+    return out
+
+async def import_chunk(db: AsyncSession, tourney, rows, fail):
+    """Registers [(line, name, phone, level)] in the open write transaction; returns the counts."""
+    R, U = models.Registration, models.User
+    await db.execute(select(models.Tournament.id).where(models.Tournament.id == tourney.id).with_for_update())
+    counts = {}
+    for level, group, n in (await db.execute(select(R.category, R.group_id, func.count()).where(R.tournament_id == tourney.id).group_by(R.category, R.group_id))).all():
+        counts.setdefault(level, {})[group] = n
+    users = dict((await db.execute(select(U.phone, U.id).where(U.phone.in_({r[2] for r in rows})))).all())
+    registered = set(await db.scalars(select(R.user_id).where(R.user_id.in_(list(users.values())), R.tournament_name == tourney.name, R.city == tourney.city)))
+
+    fresh, seen, skipped = [], set(), 0
+    for row in rows:
+        if row[2] in seen or users.get(row[2]) in registered: skipped += 1; continue
+        seen.add(row[2]); fresh.append(row)
+    new = [r for r in fresh if r[2] not in users]
+    team_ids = dict(zip((r[2] for r in new), await new_team_ids(db, [(r[1], r[2]) for r in new])))
+
+    # Groups are allocated in memory from the counts, the way get_next_group would one join at a time
+    accepted, created = [], []
+    for line, name, phone, level in fresh:
+        group = pick_group(counts.setdefault(level, {}), draw_size(tourney, level))
+        if group is None: fail(line, f"Category {level} is FULL"); continue
+        counts[level][group] = counts[level].get(group, 0) + 1
+        accepted.append((phone, level, group))
+        if phone in team_ids: created.append({"phone": phone, "name": name, "password": "password", "team_id": team_ids[phone], "wallet_balance": 0})
+    if created: users.update((await db.execute(insert(U).returning(U.phone, U.id), created)).all())
+    if accepted:
+        reg_ids = (await db.scalars(insert(R).returning(R.id), [
+            {"user_id": users[phone], "tournament_id": tourney.id, "tournament_name": tourney.name, "city": tourney.city, "category": level, "group_id": group} for phone, level, group in accepted
+        ])).all()
+        await db.run_sync(standings.ensure_rows, reg_ids)
+    return {"imported": len(accepted), "users_created": len(created), "already_registered": skipped}
+
+@app.post("/admin/import-registrations", response_model=ImportResult)
+async def admin_import_registrations(request: Request, tournament: str, city: str = "MUMBAI", db: AsyncSession = Depends(get_db)):
+    # Body: text/csv with a name,phone,level header, one player per line
+    tourney = await catalog.find(db, tournament, city)
+    if not tourney: raise HTTPException(status_code=404, detail="Tournament not found")
+    await db.commit()   # ends the lookup's read transaction so each chunk can begin with the write lock
+
+    lines = body_lines(request)
+    try: header = [c.strip().lower() for c in next(csv.reader([await anext(lines)]))]
+    except (StopAsyncIteration, StopIteration): raise HTTPException(status_code=400, detail="Empty CSV")
+    except UnicodeDecodeError: raise HTTPException(status_code=400, detail="CSV must be UTF-8")
+    if not set(IMPORT_COLUMNS) <= set(header): raise HTTPException(status_code=400, detail=f"CSV needs {', '.join(IMPORT_COLUMNS)} columns")
+    columns = [header.index(c) for c in IMPORT_COLUMNS]
+
+    result = {"status": "ok", "rows": 0, "imported": 0, "users_created": 0, "already_registered": 0, "error_count": 0, "errors": []}
+    def fail(line, error):
+        result["error_count"] += 1
+        if len(result["errors"]) < MAX_IMPORT_ERRORS: result["errors"].append({"line": line, "error": error})
+    async def flush(chunk):
+        await begin_write(db)
+        for k, v in (await import_chunk(db, tourney, chunk, fail)).items(): result[k] += v
+        await db.commit()
+
+    chunk, line_no = [], 1
+    try:
+        async for line in lines:
+            line_no += 1
+            if not line.strip(): continue
+            result["rows"] += 1
+            fields = next(csv.reader([line]), [])
+            name, phone, level = (fields[i].strip() if i < len(fields) else "" for i in columns)
+            if not (name and phone and level): fail(line_no, "name, phone and level are required"); continue
+            if tourney.categories and level not in tourney.categories: fail(line_no, f"Unknown level {level}"); continue
+            chunk.append((line_no, name, phone, level))
+            if len(chunk) >= IMPORT_CHUNK: await flush(chunk); chunk = []
+        if chunk: await flush(chunk)
+    except UnicodeDecodeError:
+        fail(line_no, "Not UTF-8; import stopped here"); result["status"] = "partial"
+    finally:
+        if result["imported"]: await response_cache.invalidate(event_tag(tourney.name, tourney.city))
+    return result
+
+# --- EXPORTS ---
+# Streamed from a server-side cursor (yield_per) one batch of EXPORT_BATCH rows at a time, so memory
+# stays flat however many rows an export has. The generator opens its own session because the body
+# is produced after the endpoint has returned.
+EXPORT_BATCH = 1000
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+def export_query(kind: str, tournament: str = None, city: str = None):
+    R, U, M, S = models.Registration, models.User, models.Match, models.PlayerStanding
+    if kind == "players":
+        stmt = select(*[getattr(U, f) for f in PLAYER_FIELDS]).order_by(U.id)
+        return stmt.where(registered_in(tournament, city)) if tournament else stmt
+    if kind == "registrations":
+        stmt, name, where_city = select(R.id, R.tournament_id, R.tournament_name, R.city, R.category, R.group_id, R.user_id, U.name, U.phone, U.team_id).outerjoin(U, U.id == R.user_id).order_by(R.id), R.tournament_name, R.city
+    elif kind == "fixtures":
+        stmt, name, where_city = select(*[getattr(M, f) for f in MATCH_FIELDS]).order_by(M.id), M.category, M.city
+    elif kind == "standings":
+        stmt = select(S.tournament_name, S.city, S.category, S.group_id, S.team_id, S.name, *[getattr(S, f) for f in standings.STAT_FIELDS])
+        stmt, name, where_city = stmt.order_by(S.tournament_name, S.city, S.category, *standings.RANK_ORDER), S.tournament_name, S.city
+    else:
+        raise HTTPException(status_code=404, detail=f"Unknown export {kind}; use players, registrations, fixtures or standings")
+    if tournament: stmt = stmt.where(name == tournament)
+    if city: stmt = stmt.where(where_city == city)
+    return stmt
+
+async def stream_rows(stmt, fmt: str):
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH))
+        keys = list(result.keys())
+        if fmt == "csv":
+            buf = io.StringIO()
+            out = csv.writer(buf)
+            out.writerow(keys)
+            async for batch in result.partitions():
+                out.writerows(batch)
+                yield buf.getvalue()
+                buf.seek(0); buf.truncate()
+            if buf.tell(): yield buf.getvalue()   # header only: no rows matched
+        else:
+            async for batch in result.partitions():
+                yield b"".join(orjson.dumps(dict(zip(keys, r))) + b"\n" for r in batch)
+
+@app.get("/admin/export/{kind}", response_class=StreamingResponse)
+async def admin_export(kind: str, format: str = "csv", tournament: str = None, city: str = None):
+    if format not in EXPORT_FORMATS: raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+    await require_schema()
+    stmt = export_query(kind, tournament, city)
+    return StreamingResponse(stream_rows(stmt, format), media_type=EXPORT_FORMATS[format], headers={"Content-Disposition": f'attachment; filename="{kind}.{format}"'})
+
+@app.get("/standings", response_model=list[StandingRow])
+async def get_standings(request: Request, tournament: str, city: str = "MUMBAI", level: str = None, db: AsyncSession = Depends(get_db)):
+    return await response_cache.serve(request, [event_tag(tournament, city)], lambda: build_standings(db, tournament, city, level))
+
+async def build_standings(db: AsyncSession, tournament: str, city: str, level: str):
+    # Served from the materialized table (see standings.py)
+    stmt = select(models.PlayerStanding).where(
+        models.PlayerStanding.tournament_name == tournament,
+        models.PlayerStanding.city == city
     )
     
     if level and level not in ["undefined", "null", "None", ""]:
-        query = query.filter(models.Registration.category == level)
-    
-    results = query.all()
-    matches = db.query(models.Match).filter(
-        models.Match.category == tournament,
-        models.Match.city == city,
-        models.Match.status == "Official"
-    ).all()
+        stmt = stmt.where(models.PlayerStanding.category == level)
     
-    standings = []
-    for reg, user in results:
-        points, played, won = 0, 0, 0
-        for m in matches:
-            if m.t1 == user.name or m.t2 == user.name:
-                played += 1
-                winner = calculate_winner(m.score, m.t1, m.t2)
-                if winner == user.name: 
-                    points += 3
-                    won += 1
-        standings.append({
-            "name": user.name, 
-            "team_id": user.team_id, 
-            "group": reg.group_id or "A", 
-            "points": points, 
-            "gamesWon": won, 
-            "played": played
-        })
-    standings.sort(key=lambda x: x['points'], reverse=True)
-    return standings
+    rows = (await db.scalars(stmt.order_by(*standings.RANK_ORDER))).all()
+    return [standing_row(r) for r in rows], {}
+
+def standing_row(r: models.PlayerStanding):
+    return {
+        "name": r.name, 
+        "team_id": r.team_id, 
+        "group": r.group_id or "A", 
+        "points": r.points, 
+        "gamesWon": r.won, 
+        "played": r.played,
+        "setsWon": r.sets_for,
+        "setsLost": r.sets_against,
+        "gamesFor": r.games_for,
+        "gamesAgainst": r.games_against
+    }
+
+@app.post("/admin/rebuild-standings", response_model=RebuildResult)
+async def rebuild_standings(db: AsyncSession = Depends(get_db)):
+    rows = await db.run_sync(standings.rebuild)
+    await response_cache.invalidate_all()
+    return {"status": "rebuilt", "rows": rows}
 
-@app.get("/tournaments")
-def get_tournaments(db: Session = Depends(get_db)): return db.query(models.Tournament).all()
+@app.get("/admin/check-standings", response_model=CheckResult)
+async def check_standings(db: AsyncSession = Depends(get_db)):
+    problems = await db.run_sync(standings.check)
+    return {"consistent": not problems, "problems": problems}
 
-@app.post("/admin/create-tournament")
-def create_tournament(data: TournamentCreate, db: Session = Depends(get_db)):
-    fees = [safe_int(c.get('fee')) for c in data.settings]
-    total_prizes = [safe_int(c.get('p1'))+safe_int(c.get('p2'))+safe_int(c.get('p3')) for c in data.settings]
+@app.get("/admin/db-config", response_model=DbConfig)
+async def db_config():
+    pragmas = effective_pragmas()
+    return {"profile": DB_PROFILE, "pragmas": pragmas, "mismatches": {k: {"wanted": w, "effective": g} for k, (w, g) in pragma_mismatches(pragmas).items()}}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/admin/cache-stats", response_model=dict)
+async def cache_stats(): return {**response_cache.stats(), "catalog": catalog.stats()}
+
+@app.get("/tournaments", response_model=list[TournamentOut])
+async def get_tournaments(request: Request, db: AsyncSession = Depends(get_db)):
+    async def build(): return [TournamentOut.model_validate(t) for t in (await catalog.get(db)).entries], {}
+    return await response_cache.serve(request, ["tournaments"], build)
+
+@app.post("/admin/create-tournament", response_model=Message)
+async def create_tournament(data: TournamentCreate, db: AsyncSession = Depends(get_db)):
+    await begin_write(db)
+    cats = category_rows(None, data.settings)
+    fee, prize = fee_and_prize(cats)
     
     new_t = models.Tournament(
         name=data.name, 
         type=data.type, 
         status=data.status, 
         settings=json.dumps(data.settings), 
-        fee=str(min(fees)) if fees else "0", 
-        prize=str(max(total_prizes)) if total_prizes else "0", 
+        fee=fee, 
+        prize=prize, 
         draw_size=data.draw_size,
         city=data.city,
         sport=data.sport,
         venue=data.venue,
         schedule=json.dumps(data.schedule)
     )
-    db.add(new_t); db.commit(); return {"message": "Created"}
+    db.add(new_t); await db.flush()
+    if cats: await db.execute(insert(models.TournamentCategory), [{**c, "tournament_id": new_t.id} for c in cats])
+    await db.commit()
+    catalog.invalidate()
+    await response_cache.invalidate("tournaments")
+    return {"message": "Created"}
 
-@app.post("/admin/edit-tournament")
-def admin_edit_tournament(data: TournamentUpdate, db: Session = Depends(get_db)):
-    t = db.query(models.Tournament).filter(models.Tournament.id == data.id).first()
+@app.post("/admin/edit-tournament", response_model=Message)
+async def admin_edit_tournament(data: TournamentUpdate, db: AsyncSession = Depends(get_db)):
+    await begin_write(db)
+    t = await db.get(models.Tournament, data.id)
     if t:
+        old_tag = event_tag(t.name, t.city)
         t.name = data.name; t.status = data.status; t.settings = json.dumps(data.settings); t.draw_size = data.draw_size
         t.city = data.city; t.sport = data.sport; t.venue = data.venue; t.schedule = json.dumps(data.schedule)
-        fees = [safe_int(c.get('fee')) for c in data.settings]
-        t.fee = str(min(fees)) if fees else "0"
-        db.commit()
+        cats = category_rows(t.id, data.settings)
+        t.fee, t.prize = fee_and_prize(cats)
+        await db.execute(delete(models.TournamentCategory).where(models.TournamentCategory.tournament_id == t.id))
+        if cats: await db.execute(insert(models.TournamentCategory), cats)
+        await db.commit()
+        catalog.invalidate()
+        await response_cache.invalidate("tournaments", old_tag, event_tag(t.name, t.city))
     return {"message": "Updated"}
 
-@app.post("/admin/delete-tournament")
-def delete_tournament(data: TournamentDelete, db: Session = Depends(get_db)):
-    t = db.query(models.Tournament).filter(models.Tournament.id == data.id).first()
+@app.post("/admin/delete-tournament", response_model=Message)
+async def delete_tournament(data: TournamentDelete, db: AsyncSession = Depends(get_db)):
+    await begin_write(db)
+    t = await db.get(models.Tournament, data.id)
     if t:
-        db.query(models.Match).filter(models.Match.category == t.name, models.Match.city == t.city).delete()
-        db.query(models.Registration).filter(models.Registration.tournament_name == t.name, models.Registration.city == t.city).delete()
-        db.delete(t); db.commit()
+        await db.execute(delete(models.Match).where(models.Match.category == t.name, models.Match.city == t.city))
+        await db.run_sync(standings.delete_event, t.name, t.city)
+        await db.execute(delete(models.Registration).where(models.Registration.tournament_name == t.name, models.Registration.city == t.city))
+        await db.execute(delete(models.TournamentCategory).where(models.TournamentCategory.tournament_id == t.id))
+        await db.delete(t); await db.commit()
+        catalog.invalidate()
+        await response_cache.invalidate("tournaments", "matches", event_tag(t.name, t.city))
     return {"message": "Deleted"}
 
-@app.get("/scores")
-def get_scores(db: Session = Depends(get_db)): return db.query(models.Match).all()
+@app.post("/admin/archive-tournament", response_model=ArchiveResult)
+async def admin_archive_tournament(data: TournamentArchive):
+    await require_schema()
+    # Chunked copy then delete on a worker thread, so the event loop keeps serving (see archive.py)
+    try: moved = await run_in_threadpool(archive.archive_tournament, data.id)
+    except archive.ArchiveError as e: raise HTTPException(status_code=400, detail=str(e))
+    catalog.invalidate()
+    await response_cache.invalidate_all()
+    return moved
 
-@app.post("/admin/create-match")
-def admin_create_match(m: MatchCreate, db: Session = Depends(get_db)):
+# --- ARCHIVE (read-only) ---
+async def get_archive_db():
+    await archive.ensure_schema()
+    async with archive.AsyncArchiveSession() as db:
+        yield db
+
+@app.get("/archive/tournaments", response_model=list[ArchivedTournament])
+async def archived_tournaments(request: Request, db: AsyncSession = Depends(get_archive_db)):
+    T = archive.TABLES["tournaments"]
+    # `id` is the archive tournament id the endpoints below take; runs still in progress are not listed
+    async def build(): return [ArchivedTournament.model_validate(r) for r in (await db.execute(select(T).where(T.c.archived_at.is_not(None)).order_by(T.c.id))).all()], {}
+    return await response_cache.serve(request, ["archive"], build)
+
+@app.get("/archive/tournaments/{tournament_id}/standings", response_model=list[StandingRow])
+async def archived_standings(request: Request, tournament_id: int, level: str = None, db: AsyncSession = Depends(get_archive_db)):
+    S = archive.TABLES["player_standings"]
+    async def build():
+        stmt = select(S).where(S.c.tournament_id == tournament_id)
+        if level: stmt = stmt.where(S.c.category == level)
+        return [standing_row(r) for r in (await db.execute(stmt.order_by(*standings.rank_order(S.c)))).all()], {}
+    return await response_cache.serve(request, ["archive"], build)
+
+@app.get("/archive/tournaments/{tournament_id}/matches", response_model=list[MatchRow], response_model_exclude_unset=True)
+async def archived_matches(request: Request, tournament_id: int, fields: str = None, cursor: int = None, limit: int = 500, db: AsyncSession = Depends(get_archive_db)):
+    M = archive.TABLES["matches"]
+    stmt = select(*select_fields(M.c, fields, MATCH_FIELDS)).where(M.c.tournament_id == tournament_id)
+    return await response_cache.serve(request, ["archive"], lambda: keyset_page(db, stmt, M.c.id, cursor, limit))
+
+@app.get("/scores", response_model=list[MatchRow], response_model_exclude_unset=True)
+async def get_scores(request: Request, tournament: str = None, city: str = None, status: str = None, date_from: str = None, date_to: str = None, fields: str = None, cursor: int = None, limit: int = 500, db: AsyncSession = Depends(get_db)):
+    stmt = select(*select_fields(models.Match, fields, MATCH_FIELDS))
+    if tournament: stmt = stmt.where(models.Match.category == tournament)
+    if city: stmt = stmt.where(models.Match.city == city)
+    if status: stmt = stmt.where(models.Match.status == status)
+    # Dates are stored as YYYY-MM-DD strings, so range filters compare lexically
+    if date_from: stmt = stmt.where(models.Match.date >= date_from)
+    if date_to: stmt = stmt.where(models.Match.date <= date_to)
+    tags = [event_tag(tournament, city)] if tournament and city else ["matches"]
+    return await response_cache.serve(request, tags, lambda: keyset_page(db, stmt, models.Match.id, cursor, limit))
+
+@app.post("/admin/create-match", response_model=Message)
+async def admin_create_match(m: MatchCreate, db: AsyncSession = Depends(get_db)):
+    await begin_write(db)
+    tourney = await db.scalar(select(models.Tournament).where(models.Tournament.name == m.category, models.Tournament.city == m.city))
+    t1_user_id, t2_user_id = await participant_ids(db, tourney.id if tourney else None, (m.t1, m.t2), (m.t1_team_id, m.t2_team_id))
+    level = await db.scalar(select(models.Registration.category).where(
+        models.Registration.tournament_id == tourney.id, models.Registration.user_id == t1_user_id
+    ).limit(1)) if tourney and t1_user_id else None
     db.add(models.Match(
+        tournament_id=tourney.id if tourney else None,
         category=m.category, 
         city=m.city,
+        level=level,
         group_id=m.group_id, 
         t1=m.t1, 
         t2=m.t2, 
+        t1_user_id=t1_user_id,
+        t2_user_id=t2_user_id,
         date=m.date or "2025-01-20", 
         time=m.time or "10:00", 
         status="Scheduled"
     ))
-    db.commit(); return {"message": "Created"}
+    await db.commit()
+    await response_cache.invalidate("matches", event_tag(m.category, m.city))
+    return {"message": "Created"}
+
+@app.post("/admin/generate-fixtures", response_model=FixtureResult)
+async def admin_generate_fixtures(data: FixtureGenerate, db: AsyncSession = Depends(get_db)):
+    await begin_write(db)
+    tourney = await db.scalar(select(models.Tournament).where(models.Tournament.name == data.category, models.Tournament.city == data.city))
+    if not tourney: raise HTTPException(status_code=404, detail="Tournament not found")
+
+    groups, user_ids = {}, {}
+    for group_id, name, user_id in (await db.execute(select(models.Registration.group_id, models.User.name, models.User.id).join(models.User, models.Registration.user_id == models.User.id).where(
+        models.Registration.tournament_id == tourney.id,
+        models.Registration.category == data.level
+    ).order_by(models.Registration.id))).all():
+        groups.setdefault(group_id or "A", []).append(name)
+        user_ids[name] = None if name in user_ids else user_id   # shared names stay unresolved
+    if not groups: raise HTTPException(status_code=400, detail=f"No players registered in {data.level}")
+
+    # Fixtures of this level that already exist are skipped, so re-running after late joins only adds the new pairings
+    def key(stage, group_id, slot, t1, t2): return stage, group_id, slot, frozenset((t1, t2))
+    existing = {key(*r) for r in (await db.execute(select(models.Match.stage, models.Match.group_id, models.Match.slot, models.Match.t1, models.Match.t2).where(
+        models.Match.tournament_id == tourney.id, models.Match.level == data.level
+    ))).all()}
+    schedule = [row for row in json.loads(tourney.schedule or "[]") if row.get("label") or row.get("value")]
+    planned = fixtures.build(groups, schedule, data.knockout)
+    rows = [r for r in planned if key(r["stage"], r["group_id"], r.get("slot"), r["t1"], r["t2"]) not in existing]
+    if rows:
+        await db.execute(insert(models.Match), [
+            {**r, "tournament_id": tourney.id, "category": tourney.name, "city": tourney.city, "level": data.level, "status": "Scheduled",
+             "t1_user_id": user_ids.get(r["t1"]), "t2_user_id": user_ids.get(r["t2"])} for r in rows
+        ])
+    await db.commit()
+    await response_cache.invalidate("matches", event_tag(tourney.name, tourney.city))
+    return {"message": "Created", "groups": len(groups), "created": len(rows), "skipped": len(planned) - len(rows)}
+
+# --- SCHEDULING ---
+def match_players(m):
+    # Scheduling identity of each side: the user id when resolved, else the name; placeholders never clash
+    return tuple(uid if uid is not None else name for uid, name in ((m.t1_user_id, m.t1), (m.t2_user_id, m.t2)) if uid is not None or name not in (None, "", fixtures.TBD, fixtures.BYE))
+
+async def tournament_bookings(db: AsyncSession, tournament_id: int, replan: bool = False):
+    """(pending, booked) for the scheduler: unplayed matches without a court, and matches that hold a time."""
+    M = models.Match
+    pending, booked = [], []
+    for m in (await db.execute(select(M.id, M.t1, M.t2, M.t1_user_id, M.t2_user_id, M.stage, M.status, M.date, M.time, M.court).where(M.tournament_id == tournament_id))).all():
+        start = scheduler.minutes(m.date, m.time) if m.court is not None else None
+        if m.status == "Scheduled" and (start is None or replan): pending.append(scheduler.Pending(m.id, match_players(m), m.stage))
+        elif start is not None: booked.append(scheduler.Booking(m.id, match_players(m), start, m.court, m.stage))
+    return pending, booked
 
-@app.post("/admin/edit-match-full")
-def admin_edit_match_full(data: MatchFullUpdate, db: Session = Depends(get_db)):
-    m = db.query(models.Match).filter(models.Match.id == data.id).first()
-    if m: m.t1 = data.t1; m.t2 = data.t2; m.date = data.date; m.time = data.time; m.score = data.score; m.status = "Official" if data.score else m.status; db.commit()
+@app.post("/admin/schedule-matches", response_model=ScheduleResult)
+async def admin_schedule_matches(data: ScheduleGenerate, db: AsyncSession = Depends(get_db)):
+    # dry_run returns the same plan without writing anything
+    if not data.dry_run: await begin_write(db)
+    tourney = await catalog.find(db, data.category, data.city)
+    if not tourney: raise HTTPException(status_code=404, detail="Tournament not found")
+    pending, booked = await tournament_bookings(db, tourney.id, data.replan)
+    # Schedule rows from the dashboard are display text ("Week 1", "Mon, Wed, Fri"), so explicit windows take precedence
+    rows = [{"label": w.date, "value": w.hours} for w in data.windows] or tourney.schedule
+    try: placed, unplaced = scheduler.plan(pending, booked, rows, data.courts, data.match_minutes, data.rest_minutes, data.step_minutes)
+    except scheduler.ScheduleError as e:
+        hint = "" if data.windows else "; or pass windows, e.g. [{\"date\": \"2025-05-03\", \"hours\": \"09:00-13:00\"}]"
+        raise HTTPException(status_code=400, detail=f"{e}{hint}")
+    assignments = []
+    for b in placed:
+        day, hhmm = scheduler.clock(b.start)
+        assignments.append({"match_id": b.id, "date": day, "time": hhmm, "court": b.court})
+    if not data.dry_run and assignments:
+        await db.execute(update(models.Match), [{"id": a["match_id"], "date": a["date"], "time": a["time"], "court": a["court"]} for a in assignments])
+        await db.commit()
+        topic = event_tag(tourney.name, tourney.city)
+        await response_cache.invalidate("matches", topic)
+        broker.publish(topic, "resync", {})
+    return {"status": "preview" if data.dry_run else "scheduled", "scheduled": len(placed), "unplaced": unplaced, **scheduler.summary(placed, data.match_minutes), "assignments": assignments}
+
+@app.post("/admin/update-schedule", response_model=Msg)
+async def admin_update_schedule(data: MatchScheduleUpdate, db: AsyncSession = Depends(get_db)):
+    start = scheduler.minutes(data.date, data.time)
+    if start is None: raise HTTPException(status_code=400, detail="Date must be YYYY-MM-DD and time HH:MM")
+    await begin_write(db)
+    m = await db.get(models.Match, data.match_id)
+    if not m: raise HTTPException(status_code=404, detail="Match not found")
+    _, booked = await tournament_bookings(db, m.tournament_id)
+    # Moving a match keeps its court unless a new one is given. A match without a court counts as unplaced,
+    # so the next scheduler run would move it again: one has to be given here
+    court = data.court if data.court is not None else m.court
+    if court is None: raise HTTPException(status_code=400, detail="Match has no court yet; give a court so the scheduler keeps it at this time")
+    clash = scheduler.conflicts(match_players(m), start, data.match_minutes, data.rest_minutes, booked, exclude=m.id)
+    if court is not None:
+        clash += [b.id for b in booked if b.id != m.id and b.court == court and b.start < start + data.match_minutes and start < b.start + data.match_minutes]
+    if clash: raise HTTPException(status_code=409, detail=f"Conflicts with matches {sorted(set(clash))}")
+    m.date, m.time = scheduler.clock(start)
+    m.court = court
+    await db.commit()
+    await match_changed(db, m, "rescheduled")
+    return {"msg": "ok"}
+
+# --- LIVE UPDATES ---
+@app.get("/events", response_class=StreamingResponse)
+async def live_events(tournament: str, city: str = "MUMBAI"):
+    # Server-sent events: "match" frames carry the changed match plus its group's standings
+    return StreamingResponse(broker.stream(event_tag(tournament, city)), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/admin/stream-stats", response_model=dict)
+async def stream_stats(): return broker.stats()
+
+def score_columns(score: str, required: bool = True):
+    """Validates a score before any write; returns the structured Match columns for it."""
+    if required and not (score or "").strip(): raise HTTPException(status_code=400, detail="Invalid score: Score is empty")
+    try: return scoring.columns(score)
+    except scoring.ScoreError as e: raise HTTPException(status_code=400, detail=f"Invalid score: {e}")
+
+async def match_changed(db: AsyncSession, m: models.Match, op: str):
+    """Call after commit: drops cached reads for the event and pushes the delta to live subscribers."""
+    topic = event_tag(m.category, m.city)
+    await response_cache.invalidate("matches", topic)
+    if not broker.has_subscribers(topic): return
+    # Generated fixtures carry their level; for other matches it is the level the players are registered in
+    S = models.PlayerStanding
+    event = (S.tournament_name == m.category, S.city == m.city)
+    levels = [m.level] if m.level else select(S.category).where(*event, or_(S.user_id.in_([i for i in (m.t1_user_id, m.t2_user_id) if i]), S.name.in_([m.t1, m.t2])))
+    rows = (await db.scalars(select(S).where(*event, S.group_id == m.group_id, S.category.in_(levels)).order_by(*standings.RANK_ORDER))).all()
+    broker.publish(topic, "match", {
+        "op": op,
+        "match": {"id": m.id, "level": m.level, "group_id": m.group_id, "slot": m.slot, "t1": m.t1, "t2": m.t2, "score": m.score, "status": m.status, "date": m.date, "time": m.time, "court": m.court, "stage": m.stage, "submitted_by_team": m.submitted_by_team, "t1_user_id": m.t1_user_id, "t2_user_id": m.t2_user_id, **{c: getattr(m, c) for c in scoring.SCORE_COLUMNS}},
+        "standings": [standing_row(r) for r in rows]
+    })
+
+@app.post("/admin/edit-match-full", response_model=Msg)
+async def admin_edit_match_full(data: MatchFullUpdate, db: AsyncSession = Depends(get_db)):
+    cols = score_columns(data.score, required=False)
+    await begin_write(db)
+    m = await db.get(models.Match, data.id)
+    if m:
+        t1_user_id, t2_user_id = await participant_ids(db, m.tournament_id, (data.t1, data.t2), (data.t1_team_id, data.t2_team_id))
+        await db.run_sync(standings.update_match, m, t1=data.t1, t2=data.t2, t1_user_id=t1_user_id, t2_user_id=t2_user_id, date=data.date, time=data.time, score=data.score, status="Official" if data.score else m.status, **cols)
+        await db.commit()
+        await match_changed(db, m, "updated")
     return {"msg": "ok"}
 
-@app.post("/admin/delete-match")
-def admin_delete_match(data: MatchDelete, db: Session = Depends(get_db)):
-    db.query(models.Match).filter(models.Match.id == data.id).delete(); db.commit(); return {"msg": "deleted"}
+@app.post("/admin/update-score", response_model=ScoreCorrection)
+async def admin_update_score(data: AdminScoreUpdate, db: AsyncSession = Depends(get_db)):
+    # Admin correction: the corrected score is final, whatever the verification state was
+    cols = score_columns(data.score)
+    await begin_write(db)
+    m = await db.get(models.Match, data.match_id)
+    if not m: raise HTTPException(status_code=404, detail="Match not found")
+    await db.run_sync(standings.update_match, m, score=data.score, status="Official", **cols)
+    await db.commit()
+    await match_changed(db, m, "corrected")
+    return {"msg": "ok", "winner": m.winner, "sets": [m.t1_sets, m.t2_sets], "games": [m.t1_games, m.t2_games]}
 
-@app.post("/submit-score")
-def submit_score(data: ScoreSubmit, db: Session = Depends(get_db)):
-    m = db.query(models.Match).filter(models.Match.id == data.match_id).first()
-    if m: m.score = data.score; m.submitted_by_team = data.submitted_by_team; m.status = "Pending Verification"; db.commit()
+@app.post("/admin/delete-match", response_model=Msg)
+async def admin_delete_match(data: MatchDelete, db: AsyncSession = Depends(get_db)):
+    await begin_write(db)
+    m = await db.get(models.Match, data.id)
+    if m:
+        await db.run_sync(standings.apply_match, m, -1); await db.delete(m); await db.commit()
+        await match_changed(db, m, "deleted")
+    return {"msg": "deleted"}
+
+@app.post("/submit-score", response_model=Msg)
+async def submit_score(data: ScoreSubmit, db: AsyncSession = Depends(get_db)):
+    cols = score_columns(data.score)
+    await begin_write(db)
+    m = await db.get(models.Match, data.match_id)
+    if m:
+        await db.run_sync(standings.update_match, m, score=data.score, submitted_by_team=data.submitted_by_team, status="Pending Verification", **cols)
+        await db.commit()
+        await match_changed(db, m, "submitted")
     return {"msg": "ok"}
 
-@app.post("/verify-score")
-def verify_score(data: ScoreVerify, db: Session = Depends(get_db)):
-    m = db.query(models.Match).filter(models.Match.id == data.match_id).first()
-    if m: m.status = "Official" if data.action == "APPROVE" else "Disputed"; db.commit()
+@app.post("/verify-score", response_model=Msg)
+async def verify_score(data: ScoreVerify, db: AsyncSession = Depends(get_db)):
+    await begin_write(db)
+    m = await db.get(models.Match, data.match_id)
+    if m:
+        await db.run_sync(standings.update_match, m, status="Official" if data.action == "APPROVE" else "Disputed")
+        await db.commit()
+        await match_changed(db, m, "verified")
     return {"msg": "ok"}
 
-@app.get("/generate-test-season")
-def generate_test_season(db: Session = Depends(get_db)):
-    return {"full_schedule": {"schedule": [{"id": m.id, "category": m.category, "city": m.city, "group": m.group_id, "t1": m.t1, "t2": m.t2, "time": m.time, "date": m.date, "stage": m.stage, "status": m.status} for m in db.query(models.Match).all()]}}
+@app.get("/generate-test-season", response_model=SeasonSchedule)
+async def generate_test_season(request: Request, db: AsyncSession = Depends(get_db)):
+    async def build():
+        return {"full_schedule": {"schedule": [{"id": m.id, "category": m.category, "city": m.city, "level": m.level, "group": m.group_id, "slot": m.slot, "t1": m.t1, "t2": m.t2, "time": m.time, "date": m.date, "court": m.court, "stage": m.stage, "status": m.status} for m in (await db.scalars(select(models.Match))).all()]}}, {}
+    return await response_cache.serve(request, ["matches"], build)
 
 def calculate_winner(score_str, t1, t2):
     if not score_str: return None
-    try:
-        t1_sets, t2_sets = 0, 0
-        for s in score_str.split(','):
-            p = s.strip().split('-')
-            if len(p) == 2:
-                if int(p[0]) > int(p[1]): t1_sets += 1
-                elif int(p[1]) > int(p[0]): t2_sets += 1
-        if t1_sets > t2_sets: return t1
-        elif t2_sets > t1_sets: return t2
-        else: return None
-    except: return None
\ No newline at end of file
+    try: return t1 if scoring.parse(score_str).winner == 1 else t2
+    except scoring.ScoreError: return None
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""Per-request instrumentation and the Prometheus /metrics payload.
+
+`MetricsMiddleware` times every HTTP request by route template and reads
+the SQL statement count and DB time accumulated for that request by the
+engine events below; the totals also go out in a Server-Timing header.
+Statements slower than CLUB28_SLOW_QUERY_MS are logged. BEGIN, COMMIT and
+ROLLBACK are kept out of that log: their time is mostly spent waiting on the
+SQLite write lock, so it goes to its own lock-wait histogram instead.
+
+Sending `X-Profile: 1` with an `X-Admin-Token` equal to CLUB28_ADMIN_TOKEN
+replaces the response with a cProfile summary of the request. Profiling is
+off when no token is configured. The profiler sees the whole thread, so
+requests running concurrently on the same worker show up in the output too.
+"""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from sqlalchemy import event
+
+logger = logging.getLogger("uvicorn.error")
+
+SLOW_QUERY_MS = float(os.getenv("CLUB28_SLOW_QUERY_MS", "200"))
+ADMIN_TOKEN = os.getenv("CLUB28_ADMIN_TOKEN")
+PROFILE_LINES = 40
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Statement count and DB seconds for the request being served, or None outside a request
+_current = ContextVar("club28_request_db", default=None)
+
+# --- PROMETHEUS PRIMITIVES ---
+class Histogram:
+    def __init__(self, name, help_text, buckets, labels):
+        self.name, self.help, self.buckets, self.labels = name, help_text, buckets, labels
+        self.series = {}   # label values -> [bucket counts..., sum, count]
+
+    def observe(self, label_values, value):
+        s = self.series.get(label_values)
+        if s is None: s = self.series[label_values] = [0] * (len(self.buckets) + 2)
+        i = bisect_left(self.buckets, value)
+        if i < len(self.buckets): s[i] += 1
+        s[-2] += value; s[-1] += 1
+
+    def render(self):
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for values, s in sorted(self.series.items()):
+            lbl = ",".join(f'{k}="{v}"' for k, v in zip(self.labels, values))
+            running = 0
+            for bound, n in zip(self.buckets, s):
+                running += n
+                out.append(f'{self.name}_bucket{{{lbl},le="{bound}"}} {running}')
+            out.append(f'{self.name}_bucket{{{lbl},le="+Inf"}} {s[-1]}')
+            out.append(f"{self.name}_sum{{{lbl}}} {s[-2]:.6f}")
+            out.append(f"{self.name}_count{{{lbl}}} {s[-1]}")
+        return out
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name, self.help, self.value = name, help_text, 0
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter", f"{self.name} {self.value}"]
+
+REQUEST_SECONDS = Histogram("club28_http_request_duration_seconds", "Request latency by route template", SECONDS_BUCKETS, ("method", "route", "status"))
+REQUEST_STATEMENTS = Histogram("club28_db_statements_per_request", "SQL statements executed per request", COUNT_BUCKETS, ("method", "route"))
+REQUEST_DB_SECONDS = Histogram("club28_db_seconds_per_request", "Time spent in SQL per request", SECONDS_BUCKETS, ("method", "route"))
+STATEMENTS = Counter("club28_db_statements_total", "SQL statements executed, in and out of requests")
+SLOW_QUERIES = Counter("club28_db_slow_queries_total", "SQL statements slower than CLUB28_SLOW_QUERY_MS")
+LOCK_WAIT_SECONDS = Histogram("club28_db_lock_wait_seconds", "Time spent in transaction control (BEGIN/COMMIT/ROLLBACK), mostly waiting on the write lock", SECONDS_BUCKETS, ("statement",))
+TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK")
+
+def render():
+    lines = []
+    for metric in (REQUEST_SECONDS, REQUEST_STATEMENTS, REQUEST_DB_SECONDS, STATEMENTS, SLOW_QUERIES, LOCK_WAIT_SECONDS): lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+# --- SQL EVENTS ---
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("club28_query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["club28_query_start"].pop()
+    STATEMENTS.value += 1
+    stats = _current.get()
+    if stats is not None:
+        stats[0] += 1; stats[1] += elapsed
+    words = statement.split(None, 1)
+    if words and words[0].upper() in TRANSACTION_CONTROL:
+        LOCK_WAIT_SECONDS.observe((words[0].upper(),), elapsed)
+        return
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        SLOW_QUERIES.value += 1
+        logger.warning("Slow query (%.0f ms): %s", elapsed * 1000, " ".join(statement.split())[:500])
+
+def instrument(*engines):
+    for e in engines:
+        event.listen(e, "before_cursor_execute", _before_cursor_execute)
+        event.listen(e, "after_cursor_execute", _after_cursor_execute)
+
+# --- MIDDLEWARE ---
+def _route_of(scope):
+    # The router leaves the matched route in the scope; unmatched paths share one label
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http": return await self.app(scope, receive, send)
+        headers = dict(scope["headers"])
+        if ADMIN_TOKEN and headers.get(b"x-profile") == b"1" and headers.get(b"x-admin-token", b"").decode() == ADMIN_TOKEN:
+            return await self._profiled(scope, receive, send)
+
+        stats = [0, 0.0]
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_timed(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = f"db;dur={stats[1] * 1000:.1f};desc=\"{stats[0]} queries\", app;dur={(time.perf_counter() - start) * 1000:.1f}"
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", timing.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            _current.reset(token)
+            route = _route_of(scope)
+            REQUEST_SECONDS.observe((scope["method"], route, str(status)), time.perf_counter() - start)
+            REQUEST_STATEMENTS.observe((scope["method"], route), stats[0])
+            REQUEST_DB_SECONDS.observe((scope["method"], route), stats[1])
+
+    async def _profiled(self, scope, receive, send):
+        status, stats = 500, [0, 0.0]
+        async def swallow(message):
+            nonlocal status
+            if message["type"] == "http.response.start": status = message["status"]
+        token = _current.set(stats)
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, swallow)
+        finally:
+            profiler.disable()
+            _current.reset(token)
+        out = io.StringIO()
+        out.write(f"{scope['method']} {scope['path']} -> {status} in {(time.perf_counter() - start) * 1000:.1f} ms, {stats[0]} SQL statements, {stats[1] * 1000:.1f} ms in SQL\n\n")
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_LINES)
+        body = out.getvalue().encode()
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain; charset=utf-8"), (b"x-profiled-status", str(status).encode())]})
+        await send({"type": "http.response.body", "body": body})
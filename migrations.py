@@ -0,0 +1,232 @@
+"""Versioned schema migrations.
+
+`create_all` only creates missing tables, so columns, indexes and data
+backfills for databases that already exist are numbered steps in
+MIGRATIONS. `upgrade` applies the pending ones in order, each in its own
+transaction together with its schema_version row, and is run as a separate
+step before the server starts:
+
+    python migrations.py upgrade   # apply pending steps
+    python migrations.py status    # exits 1 when steps are pending
+    python migrations.py plans     # hot-query plan check
+
+Shipped steps are never edited; a schema change adds a step at the end.
+Every step is idempotent, so a database from before schema_version existed
+is brought up to date by running all of them once.
+"""
+import sys
+import json
+import logging
+from datetime import datetime, timezone
+from sqlalchemy import MetaData, Table, Column, Integer, String, inspect, select, insert, update, func, text, bindparam
+from sqlalchemy.orm import Session
+from database import Base
+import models
+import scoring
+import fixtures
+import catalog
+import standings
+
+logger = logging.getLogger("uvicorn.error")
+
+schema_version = Table(
+    "schema_version", MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String),
+    Column("applied_at", String),
+)
+
+# (table, column, DDL type) added after the table first shipped
+ADDED_COLUMNS = [
+    ("registrations", "tournament_id", "INTEGER REFERENCES tournaments (id)"),
+    ("matches", "tournament_id", "INTEGER REFERENCES tournaments (id)"),
+] + [("matches", column, "INTEGER") for column in scoring.SCORE_COLUMNS] + [
+    ("matches", "t1_user_id", "INTEGER REFERENCES users (id)"),
+    ("matches", "t2_user_id", "INTEGER REFERENCES users (id)"),
+    ("matches", "court", "INTEGER"),
+]
+# The tournaments "NEW COLUMNS"; databases created before them never got them from create_all
+TOURNAMENT_COLUMNS = [
+    ("tournaments", "venue", "VARCHAR DEFAULT ''"),
+    ("tournaments", "schedule", "VARCHAR DEFAULT '[]'"),
+]
+MATCH_LEVEL_COLUMNS = [
+    ("matches", "level", "VARCHAR"),
+    ("matches", "slot", "VARCHAR"),
+]
+
+def _add_columns(conn, columns):
+    insp = inspect(conn)
+    for table, column, ddl in columns:
+        if column not in {c["name"] for c in insp.get_columns(table)}:
+            conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+def _backfill_tournament_ids(conn):
+    # Registrations and matches historically pointed at their tournament by name + city
+    conn.execute(text("""
+        UPDATE registrations SET tournament_id = (
+            SELECT MIN(t.id) FROM tournaments t WHERE t.name = registrations.tournament_name AND t.city = registrations.city
+        ) WHERE tournament_id IS NULL
+    """))
+    conn.execute(text("""
+        UPDATE matches SET tournament_id = (
+            SELECT MIN(t.id) FROM tournaments t WHERE t.name = matches.category AND t.city = matches.city
+        ) WHERE tournament_id IS NULL
+    """))
+
+def _backfill_participants(conn):
+    # A name maps to a user only when exactly one player of that name is registered in the match's event
+    for side in ("t1", "t2"):
+        conn.execute(text(f"""
+            UPDATE matches SET {side}_user_id = (
+                SELECT MIN(u.id) FROM registrations r JOIN users u ON u.id = r.user_id
+                WHERE r.tournament_name = matches.category AND r.city = matches.city AND u.name = matches.{side}
+                HAVING COUNT(DISTINCT u.id) = 1
+            ) WHERE {side}_user_id IS NULL AND {side} IS NOT NULL AND {side} != 'TBD'
+        """))
+
+def _backfill_scores(conn):
+    # Scores predating the structured columns are parsed once; ones that fail validation stay NULL
+    M = models.Match
+    rows = conn.execute(select(M.id, M.score).where(M.score.isnot(None), M.score != "", M.winner.is_(None))).all()
+    params, invalid = [], 0
+    for match_id, score in rows:
+        try: params.append({"match_id": match_id, **{"v_" + c: v for c, v in scoring.columns(score).items()}})
+        except scoring.ScoreError: invalid += 1
+    if params:
+        conn.execute(update(M).where(M.id == bindparam("match_id")).values({c: bindparam("v_" + c) for c in scoring.SCORE_COLUMNS}), params)
+    if invalid: logger.warning("%d stored scores could not be parsed and were left unstructured", invalid)
+
+def _seed_opening_balances(conn):
+    # Balances from before the ledger existed become one opening entry, so reconciliation starts at zero drift
+    conn.execute(text("""
+        INSERT INTO wallet_transactions (user_id, amount, kind, reference, created_at)
+        SELECT u.id, u.wallet_balance, 'opening', 'ledger migration', CURRENT_TIMESTAMP FROM users u
+        WHERE COALESCE(u.wallet_balance, 0) != 0
+          AND NOT EXISTS (SELECT 1 FROM wallet_transactions w WHERE w.user_id = u.id)
+    """))
+
+def _backfill_categories(conn):
+    # Category fees and prizes used to live only in the tournaments.settings JSON
+    T, C = models.Tournament, models.TournamentCategory
+    rows, invalid = [], 0
+    for tid, settings in conn.execute(select(T.id, T.settings).where(~select(C.id).where(C.tournament_id == T.id).exists())).all():
+        try: rows += catalog.category_rows(tid, json.loads(settings or "[]"))
+        except (ValueError, TypeError, AttributeError): invalid += 1
+    if rows: conn.execute(insert(C), rows)
+    if invalid: logger.warning("%d tournaments have unreadable settings and got no categories", invalid)
+
+def _backfill_levels(conn):
+    # Bracket labels used to be stored as the group of knockout placeholders
+    conn.execute(text(f"""
+        UPDATE matches SET slot = group_id, group_id = NULL
+        WHERE slot IS NULL AND stage != 'Group' AND t1 = '{fixtures.TBD}' AND t2 = '{fixtures.TBD}'
+    """))
+    # Group fixtures take the level their first resolved player is registered in; placeholders stay NULL
+    conn.execute(text("""
+        UPDATE matches SET level = (
+            SELECT MIN(r.category) FROM registrations r
+            WHERE r.tournament_id = matches.tournament_id AND r.user_id = COALESCE(matches.t1_user_id, matches.t2_user_id)
+        ) WHERE level IS NULL AND COALESCE(t1_user_id, t2_user_id) IS NOT NULL
+    """))
+
+def backfill(conn):
+    """Derived columns and tables filled from the data that predates them. Also used by bench.seed,
+    which inserts rows around the API."""
+    _backfill_tournament_ids(conn)
+    _backfill_scores(conn)
+    _backfill_participants(conn)
+    _seed_opening_balances(conn)
+    _backfill_categories(conn)
+
+def _match_levels(conn):
+    _add_columns(conn, MATCH_LEVEL_COLUMNS)
+    _backfill_levels(conn)
+
+def _materialize_standings(conn):
+    with Session(bind=conn) as db: standings.bootstrap(db)
+
+def _create_indexes(conn):
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes: index.create(conn, checkfirst=True)
+
+# --- VERSIONS ---
+MIGRATIONS = [
+    (1, "create tables", Base.metadata.create_all),
+    (2, "tournament ids, structured scores, participants and courts columns", lambda conn: _add_columns(conn, ADDED_COLUMNS)),
+    (3, "backfill ids, scores, participants, opening balances and categories", backfill),
+    (4, "materialize standings", _materialize_standings),
+    (5, "indexes", _create_indexes),
+    (6, "tournament venue and schedule columns", lambda conn: _add_columns(conn, TOURNAMENT_COLUMNS)),
+    (7, "match level and knockout slot columns", _match_levels),
+]
+HEAD = MIGRATIONS[-1][0]
+
+def current_version(conn):
+    if not inspect(conn).has_table("schema_version"): return 0
+    return conn.scalar(select(func.max(schema_version.c.version))) or 0
+
+def version(engine):
+    with engine.connect() as conn: return current_version(conn)
+
+def upgrade(engine):
+    """Applies the pending steps in order; returns the [(version, name)] applied."""
+    if version(engine) >= HEAD: return []
+    applied = []
+    for number, name, step in MIGRATIONS:
+        # One transaction per step, holding the write lock, so two processes starting together apply it once
+        with engine.connect().execution_options(write_lock=True) as conn, conn.begin():
+            schema_version.create(conn, checkfirst=True)
+            if current_version(conn) >= number: continue
+            step(conn)
+            conn.execute(insert(schema_version).values(version=number, name=name, applied_at=datetime.now(timezone.utc).isoformat(timespec="seconds")))
+        logger.info("Applied migration %d: %s", number, name)
+        applied.append((number, name))
+    return applied
+
+# --- QUERY PLAN CHECK ---
+def hot_queries():
+    """The statement shapes behind the busiest endpoints, with representative parameters."""
+    R, M, S, T, U = models.Registration, models.Match, models.PlayerStanding, models.Tournament, models.User
+    return {
+        "get_next_group": select(R.group_id, func.count()).where(R.tournament_id == 1, R.category == "ADVANCE").group_by(R.group_id),
+        "join_duplicate_check": select(R).where(R.user_id == 1, R.tournament_name == "Padel league"),
+        "user_registrations": select(R).where(R.user_id == 1),
+        "tournament_players": select(R, U).join(U, R.user_id == U.id).where(R.tournament_name == "Padel league", R.city == "MUMBAI"),
+        "standings": select(S).where(S.tournament_name == "Padel league", S.city == "MUMBAI", S.category == "ADVANCE").order_by(S.points.desc()),
+        "standings_entrants": select(R, U).join(U, R.user_id == U.id).where(R.tournament_name == "Padel league", R.city == "MUMBAI", U.name.in_(["A", "B"])),
+        "event_matches": select(M).where(M.category == "Padel league", M.city == "MUMBAI", M.status == "Official"),
+        "tournament_matches": select(M).where(M.tournament_id == 1),
+        "player_matches": select(M).where((M.t1_user_id == 1) | (M.t2_user_id == 1)).order_by(M.date),
+        "tournament_lookup": select(T).where(T.name == "Padel league", T.city == "MUMBAI"),
+        "login": select(U).where(U.team_id == "SA25"),
+    }
+
+def full_scans(engine):
+    """Returns {query_name: [plan lines]} for every hot query that scans a table instead of searching an index."""
+    failures = {}
+    with engine.connect() as conn:
+        for name, stmt in hot_queries().items():
+            sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql).all()
+            scans = [r[-1] for r in rows if r[-1].startswith("SCAN")]
+            if scans: failures[name] = scans
+    return failures
+
+if __name__ == "__main__":
+    # Usage: python migrations.py [upgrade|status|plans]
+    from database import engine
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    if cmd == "status":
+        at = version(engine)
+        for number, name, _ in MIGRATIONS:
+            if number > at: print(f"pending {number}: {name}")
+        print(f"Schema at version {at} of {HEAD}")
+        sys.exit(1 if at < HEAD else 0)
+    for number, name in upgrade(engine): print(f"Applied {number}: {name}")
+    if cmd == "plans":
+        failures = full_scans(engine)
+        for name, scans in failures.items(): print(f"{name}: {'; '.join(scans)}")
+        print("OK" if not failures else f"{len(failures)} hot queries fall back to a table scan")
+        sys.exit(1 if failures else 0)
+    print(f"Schema up to date (version {HEAD})")
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -16,6 +17,7 @@ class Registration(Base):
     __tablename__ = "registrations"
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
+    tournament_id = Column(Integer, ForeignKey("tournaments.id"))
     tournament_name = Column(String)
     city = Column(String)
     sport = Column(String)
@@ -23,6 +25,12 @@ class Registration(Base):
     group_id = Column(String)
     user = relationship("User", back_populates="registrations")
 
+    __table_args__ = (
+        Index('ix_registrations_tournament_category_group', 'tournament_id', 'category', 'group_id'),
+        Index('ix_registrations_event', 'tournament_name', 'city', 'category', 'group_id'),
+        Index('ix_registrations_user_tournament', 'user_id', 'tournament_name'),
+    )
+
 class Tournament(Base):
     __tablename__ = "tournaments"
     id = Column(Integer, primary_key=True, index=True)
@@ -46,17 +54,96 @@ class Tournament(Base):
         UniqueConstraint('name', 'city', 'sport', name='_name_city_sport_uc'),
     )
 
+class TournamentCategory(Base):
+    # One row per level of a tournament, normalized from Tournament.settings (see catalog.py)
+    __tablename__ = "tournament_categories"
+    id = Column(Integer, primary_key=True, index=True)
+    tournament_id = Column(Integer, ForeignKey("tournaments.id"), nullable=False)
+    position = Column(Integer, default=0)   # order in the admin's settings list
+    name = Column(String, nullable=False)
+    fee = Column(Integer, default=0)
+    p1 = Column(Integer, default=0)         # prize tiers: winner, runner-up, third
+    p2 = Column(Integer, default=0)
+    p3 = Column(Integer, default=0)
+    draw_size = Column(Integer)             # NULL: the tournament's draw_size applies
+
+    __table_args__ = (
+        UniqueConstraint('tournament_id', 'name', name='_tournament_category_uc'),
+    )
+
 class Match(Base):
     __tablename__ = "matches"
     id = Column(Integer, primary_key=True, index=True)
+    tournament_id = Column(Integer, ForeignKey("tournaments.id"))
     category = Column(String) 
     city = Column(String)
     group_id = Column(String)      
     t1 = Column(String)            
     t2 = Column(String)            
+    # Participants by id; t1/t2 keep the display names. NULL for TBD slots and names that could not be matched
+    t1_user_id = Column(Integer, ForeignKey("users.id"))
+    t2_user_id = Column(Integer, ForeignKey("users.id"))
     score = Column(String, default=None)
     status = Column(String, default="Scheduled")
     date = Column(String)
     time = Column(String)
     stage = Column(String, default="Group")
-    submitted_by_team = Column(String, default=None)
\ No newline at end of file
+    # Level the fixture was generated for, and the bracket position of a knockout fixture ("A1 v B2", "W Semi Final 1")
+    level = Column(String, default=None)
+    slot = Column(String, default=None)
+    court = Column(Integer, default=None)    # 1-based; set by scheduler.py or /admin/update-schedule
+    submitted_by_team = Column(String, default=None)
+
+    # Parsed from `score` on write (see scoring.py); winner is the winning side, 1 or 2
+    winner = Column(Integer, default=None)
+    t1_sets = Column(Integer, default=None)
+    t2_sets = Column(Integer, default=None)
+    t1_games = Column(Integer, default=None)
+    t2_games = Column(Integer, default=None)
+    tiebreaks = Column(Integer, default=None)
+
+    __table_args__ = (
+        Index('ix_matches_event_status', 'category', 'city', 'status'),
+        Index('ix_matches_tournament_status', 'tournament_id', 'status'),
+        Index('ix_matches_t1_user', 't1_user_id', 'date'),
+        Index('ix_matches_t2_user', 't2_user_id', 'date'),
+    )
+
+class PlayerStanding(Base):
+    # Materialized per-registration stats, maintained by standings.py
+    __tablename__ = "player_standings"
+    id = Column(Integer, primary_key=True, index=True)
+    registration_id = Column(Integer, ForeignKey("registrations.id"), unique=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    tournament_name = Column(String)
+    city = Column(String)
+    category = Column(String)
+    team_id = Column(String)
+    name = Column(String)
+    group_id = Column(String)
+    points = Column(Integer, default=0)
+    played = Column(Integer, default=0)
+    won = Column(Integer, default=0)
+    sets_for = Column(Integer, default=0)
+    sets_against = Column(Integer, default=0)
+    games_for = Column(Integer, default=0)
+    games_against = Column(Integer, default=0)
+
+    __table_args__ = (
+        UniqueConstraint('tournament_name', 'city', 'category', 'team_id', name='_standing_event_team_uc'),
+        Index('ix_standings_event_points', 'tournament_name', 'city', 'category', 'points'),
+    )
+
+class WalletTransaction(Base):
+    # Append-only ledger; users.wallet_balance must always equal the sum of a user's amounts (see wallet.py)
+    __tablename__ = "wallet_transactions"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    amount = Column(Integer, nullable=False)   # credits positive, debits negative
+    kind = Column(String, nullable=False)      # opening, topup, adjustment, fee
+    reference = Column(String)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index('ix_wallet_transactions_user', 'user_id', 'id'),
+    )
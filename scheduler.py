@@ -0,0 +1,166 @@
+"""Court and time-slot assignment for a tournament's matches.
+
+Pure functions, like fixtures.py: the endpoint in main.py reads the matches,
+calls `plan()` and writes the assignments back in one transaction.
+
+Play happens inside day windows given as schedule rows: label is the date
+(YYYY-MM-DD) and value the hours ("18:00-22:00"). The endpoint passes the
+windows it is given, or the tournament's own schedule rows when those are
+written that way (the dashboard's are usually free text). Every
+court and every player has an `Intervals` index of the times it is busy,
+seeded with matches that already have a court. Matches are placed by list
+scheduling: walk the candidate start times in order and, at each one, give
+the free courts to the waiting matches whose players carry the most
+unplaced matches, provided each player is also clear of their other
+matches by `rest` minutes. Knockout stages only start once every earlier
+stage has finished. Greedy placement is not guaranteed optimal, but putting
+the busiest players first keeps the longest chains moving, which is what
+bounds the event's total duration.
+"""
+import re
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import date
+
+WINDOW_RE = re.compile(r"\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*")
+TIME_RE = re.compile(r"\s*(\d{1,2}):(\d{2})")
+DAY = 24 * 60
+MATCH_MINUTES = 90
+REST_MINUTES = 30
+
+Window = namedtuple("Window", "start end")            # absolute minutes
+Pending = namedtuple("Pending", "id players stage")   # players: user ids or names, placeholders left out
+Booking = namedtuple("Booking", "id players start court stage")
+
+class ScheduleError(ValueError):
+    pass
+
+# --- TIME ---
+def minutes(day: str, hhmm: str):
+    """Absolute minutes for a YYYY-MM-DD date and an HH:MM time, or None when either does not parse."""
+    try: d = date.fromisoformat((day or "").strip())
+    except ValueError: return None
+    m = TIME_RE.match(hhmm or "")
+    if not m or int(m[1]) > 23 or int(m[2]) > 59: return None
+    return d.toordinal() * DAY + int(m[1]) * 60 + int(m[2])
+
+def clock(at: int):
+    """(date, time) strings for absolute minutes."""
+    return date.fromordinal(at // DAY).isoformat(), f"{at % DAY // 60:02d}:{at % 60:02d}"
+
+def windows(schedule):
+    """Day windows from Tournament.schedule rows; raises ScheduleError naming any row that is not a date + hours."""
+    out, bad = [], []
+    for row in schedule:
+        label, value = (row.get("label") or "").strip(), (row.get("value") or "").strip()
+        if not label and not value: continue
+        m = WINDOW_RE.fullmatch(value)
+        start = minutes(label, value)
+        end = minutes(label, f"{m[3]}:{m[4]}") if m else None
+        if start is None or end is None or end <= start: bad.append(f"{label or '?'} {value or '?'}"); continue
+        out.append(Window(start, end))
+    if bad: raise ScheduleError(f"Schedule rows need a YYYY-MM-DD label and HH:MM-HH:MM hours: {', '.join(bad)}")
+    if not out: raise ScheduleError("Tournament has no schedule rows to place matches in")
+    return sorted(out)
+
+def stage_rank(stage: str):
+    """Group play first, then knockout rounds from the widest to the final."""
+    if not stage or stage == "Group": return 0
+    teams = {"Final": 2, "Semi Final": 4, "Quarter Final": 8}.get(stage)
+    if teams is None:
+        try: teams = int(stage.rsplit(" ", 1)[-1])
+        except ValueError: teams = 2
+    return 1_000_000 - teams
+
+# --- INTERVAL INDEX ---
+class Intervals:
+    """Half-open [start, end) intervals kept sorted and merged, with O(log n) overlap checks."""
+    def __init__(self):
+        self.starts, self.ends = [], []
+
+    def free(self, start, end):
+        i = bisect_right(self.starts, start)
+        if i and self.ends[i - 1] > start: return False
+        return i == len(self.starts) or self.starts[i] >= end
+
+    def add(self, start, end):
+        # Overlapping or touching intervals are merged, so free() only ever has to look at two neighbours
+        i = bisect_right(self.starts, start)
+        if i and self.ends[i - 1] >= start: i -= 1; start = self.starts[i]
+        j = i
+        while j < len(self.starts) and self.starts[j] <= end:
+            end = max(end, self.ends[j]); j += 1
+        self.starts[i:j] = [start]; self.ends[i:j] = [end]
+
+# --- PLANNER ---
+def plan(pending, booked, schedule, courts: int, duration: int, rest: int = 0, step: int = None):
+    """Assigns a start and a court to every pending match that fits.
+
+    `booked` are matches that already hold a court and stay where they are.
+    Returns (placed, unplaced): placed is a list of Booking, unplaced the ids
+    that did not fit in the schedule's windows.
+    """
+    if courts < 1: raise ScheduleError("At least one court is needed")
+    if duration < 1: raise ScheduleError("Match length must be positive")
+    step = step or duration
+    wins = windows(schedule)
+    court_busy = [Intervals() for _ in range(courts)]
+    player_busy = {}
+    stage_end = {}   # rank -> latest finish, for knockout ordering
+    for b in booked:
+        if 1 <= b.court <= courts: court_busy[b.court - 1].add(b.start, b.start + duration)
+        for p in b.players: player_busy.setdefault(p, Intervals()).add(b.start, b.start + duration)
+        rank = stage_rank(b.stage)
+        stage_end[rank] = max(stage_end.get(rank, 0), b.start + duration)
+
+    starts = sorted({t for w in wins for t in range(w.start, w.end - duration + 1, step)})
+    load = {}
+    for m in pending:
+        for p in m.players: load[p] = load.get(p, 0) + 1
+
+    placed, unplaced = [], []
+    by_rank = {}
+    for m in pending: by_rank.setdefault(stage_rank(m.stage), []).append(m)
+    floor = 0
+    for rank in sorted(by_rank):
+        if unplaced:   # a later stage cannot start before every earlier match has a slot
+            unplaced += [m.id for m in by_rank[rank]]; continue
+        floor = max([floor] + [end for r, end in stage_end.items() if r < rank])
+        waiting = by_rank[rank]
+        resort = True
+        for t in starts[bisect_right(starts, floor - 1):]:
+            if not waiting: break
+            free = [c for c, busy in enumerate(court_busy) if busy.free(t, t + duration)]
+            if not free: continue
+            if resort:
+                waiting.sort(key=lambda m: (-max((load[p] for p in m.players), default=0), m.id))
+                resort = False
+            keep = []
+            for i, m in enumerate(waiting):
+                if not free:
+                    keep += waiting[i:]; break
+                if all(p not in player_busy or player_busy[p].free(t - rest, t + duration + rest) for p in m.players):
+                    c = free.pop(0)
+                    court_busy[c].add(t, t + duration)
+                    for p in m.players:
+                        player_busy.setdefault(p, Intervals()).add(t, t + duration)
+                        load[p] -= 1
+                    placed.append(Booking(m.id, m.players, t, c + 1, m.stage))
+                    stage_end[rank] = max(stage_end.get(rank, 0), t + duration)
+                    resort = True
+                else:
+                    keep.append(m)
+            waiting = keep
+        unplaced += [m.id for m in waiting]
+    return placed, sorted(unplaced)
+
+def conflicts(players, start, duration, rest, booked, exclude=None):
+    """Ids of booked matches sharing a player with a match at `start` (rest gap included)."""
+    players = set(players)
+    return [b.id for b in booked if b.id != exclude and players & set(b.players)
+            and b.start < start + duration + rest and start < b.start + duration + rest]
+
+def summary(placed, duration):
+    if not placed: return {"first_start": None, "last_end": None, "days": 0}
+    first, last = min(b.start for b in placed), max(b.start for b in placed) + duration
+    return {"first_start": " ".join(clock(first)), "last_end": " ".join(clock(last)), "days": len({b.start // DAY for b in placed})}
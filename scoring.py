@@ -0,0 +1,53 @@
+"""Score parsing and validation.
+
+Scores are entered as comma-separated sets, e.g. "6-4, 3-6, 7-6(5)", where
+the bracketed number is the losing side's tiebreak points. They are parsed
+once when written and stored on the match as integer columns, so standings
+never re-read the text.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+SET_RE = re.compile(r"(\d{1,2})\s*-\s*(\d{1,2})(?:\s*\((\d{1,2})\))?")
+_SET = r"\d{1,2}\s*-\s*\d{1,2}(?:\s*\(\d{1,2}\))?"
+SCORE_RE = re.compile(rf"\s*{_SET}(?:\s*,\s*{_SET}){{0,4}}\s*")
+MAX_SETS = 5
+
+Score = namedtuple("Score", "sets winner t1_sets t2_sets t1_games t2_games tiebreaks")
+SCORE_COLUMNS = ("winner", "t1_sets", "t2_sets", "t1_games", "t2_games", "tiebreaks")
+
+class ScoreError(ValueError):
+    pass
+
+@lru_cache(maxsize=4096)
+def parse(score_str: str) -> Score:
+    """Parses and validates a score string; raises ScoreError with a message fit for the client."""
+    # One precompiled match validates the shape; the slow path below only runs to explain a rejection
+    if not score_str or not SCORE_RE.fullmatch(score_str): _reject_shape(score_str)
+    sets, t1_sets, t2_sets, t1_games, t2_games, tiebreaks = [], 0, 0, 0, 0, 0
+    for a, b, tb in SET_RE.findall(score_str):
+        a, b = int(a), int(b)
+        if a == b: raise ScoreError(f"Set '{a}-{b}' has no winner")
+        if (a == 7 and b == 6) or (a == 6 and b == 7): tiebreaks += 1
+        elif tb: raise ScoreError(f"Set '{a}-{b}({tb})': tiebreak points only follow a 7-6 set")
+        sets.append((a, b, int(tb) if tb else None))
+        t1_games += a; t2_games += b
+        if a > b: t1_sets += 1
+        else: t2_sets += 1
+    if t1_sets == t2_sets: raise ScoreError("Sets are level; the score has no winner")
+    return Score(tuple(sets), 1 if t1_sets > t2_sets else 2, t1_sets, t2_sets, t1_games, t2_games, tiebreaks)
+
+def _reject_shape(score_str):
+    parts = [p.strip() for p in (score_str or "").split(",") if p.strip()]
+    if not parts: raise ScoreError("Score is empty")
+    if len(parts) > MAX_SETS: raise ScoreError(f"At most {MAX_SETS} sets")
+    for part in parts:
+        if not SET_RE.fullmatch(part): raise ScoreError(f"Set '{part}' is not in the form 6-4 or 7-6(5)")
+    raise ScoreError("Sets must be separated by commas")
+
+def columns(score_str):
+    """Match column values for a score; all None when the score is cleared."""
+    if not score_str: return {c: None for c in SCORE_COLUMNS}
+    s = parse(score_str)
+    return {c: getattr(s, c) for c in SCORE_COLUMNS}
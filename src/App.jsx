@@ -31,7 +31,7 @@ const CompactScheduleList = ({ matches, myTeamID, onAction }) => {
                                 <div key={idx} className="flex p-3 hover:bg-blue-50 transition-colors">
                                     <div className="w-14 pr-2 border-r border-gray-100 flex flex-col justify-center"><span className="text-xs font-black text-gray-900">{time.replace(":00 ", "")}</span><span className="text-[8px] font-bold text-gray-400 uppercase">{time.slice(-2)}</span></div>
                                     <div className="flex-1 grid grid-cols-1 gap-2 pl-3">{timeMatches.map((m, mIdx) => (
-                                            <div key={mIdx} className="flex items-center justify-between"><div className="text-xs w-full">{m.t1 === "TBD" ? (<div className="flex items-center gap-2"><span className="bg-gray-100 text-gray-500 text-[9px] font-bold px-2 py-0.5 rounded uppercase">{m.stage}</span><span className="text-[9px] text-gray-400 italic">{m.group}</span></div>) : (<div className="flex items-center gap-1"><span className={m.t1 === myTeamID ? "font-black text-blue-600" : "font-bold text-gray-700"}>{m.t1}</span><span className="text-[9px] text-gray-300 px-1">vs</span><span className={m.t2 === myTeamID ? "font-black text-blue-600" : "font-bold text-gray-700"}>{m.t2}</span></div>)}</div>{onAction && m.t1 !== "TBD" && onAction(m)}</div>))}</div></div>))}</div></div>);})
+                                            <div key={mIdx} className="flex items-center justify-between"><div className="text-xs w-full">{m.t1 === "TBD" ? (<div className="flex items-center gap-2"><span className="bg-gray-100 text-gray-500 text-[9px] font-bold px-2 py-0.5 rounded uppercase">{m.stage}</span><span className="text-[9px] text-gray-400 italic">{m.slot || m.group}</span></div>) : (<div className="flex items-center gap-1"><span className={m.t1 === myTeamID ? "font-black text-blue-600" : "font-bold text-gray-700"}>{m.t1}</span><span className="text-[9px] text-gray-300 px-1">vs</span><span className={m.t2 === myTeamID ? "font-black text-blue-600" : "font-bold text-gray-700"}>{m.t2}</span></div>)}</div>{onAction && m.t1 !== "TBD" && onAction(m)}</div>))}</div></div>))}</div></div>);})
             }</div>
     );
 };
@@ -59,7 +59,7 @@ const TournamentRegistration = ({ onRegister }) => {
     // NEW STATES
     const [schedule, setSchedule] = useState([]);
     
-    useEffect(() => { const loadData = async () => { const tRes = await fetch('https://club28-backend-98cy.onrender.com/tournaments'); const tData = await tRes.json(); const found = tData.find(t => t.id.toString() === id); setTournament(found); if (found) { const cats = JSON.parse(found.settings || "[]"); setCategories(cats); if (cats.length > 0) setSelectedCat(cats[0]); try { setSchedule(JSON.parse(found.schedule || "[]")); } catch {} } }; loadData(); }, [id]);
+    useEffect(() => { const loadData = async () => { const tRes = await fetch('https://club28-backend-98cy.onrender.com/tournaments'); const tData = await tRes.json(); const found = tData.find(t => t.id.toString() === id); setTournament(found); if (found) { const cats = found.settings || []; setCategories(cats); if (cats.length > 0) setSelectedCat(cats[0]); setSchedule(found.schedule || []); } }; loadData(); }, [id]);
     
     const handlePayment = async () => {
         setLoading(true); 
@@ -226,20 +226,21 @@ const CompetePage = () => {
 const OngoingEvents = ({ category, city, level, myTeamID }) => {
     const [activeTab, setActiveTab] = useState("SCHEDULE"); const [activeGroup, setActiveGroup] = useState('A'); const [schedule, setSchedule] = useState([]); const [standings, setStandings] = useState([]); const [scores, setScores] = useState({}); const [selectedMatch, setSelectedMatch] = useState(null); const [scoreInput, setScoreInput] = useState("");
     
+    const byStart = (a, b) => new Date(a.date + ' ' + a.time) - new Date(b.date + ' ' + b.time);
     const fetchData = async () => { 
         try { 
             const safeLevel = level || "";
             const encodedLevel = encodeURIComponent(safeLevel);
             const [schRes, scoreRes, rankRes] = await Promise.all([ 
                 fetch('https://club28-backend-98cy.onrender.com/generate-test-season'), 
-                fetch('https://club28-backend-98cy.onrender.com/scores'), 
+                fetch(`https://club28-backend-98cy.onrender.com/scores?tournament=${encodeURIComponent(category)}&city=${encodeURIComponent(city)}&fields=score,status,submitted_by_team&limit=1000`), 
                 fetch(`https://club28-backend-98cy.onrender.com/standings?tournament=${category}&city=${city}&level=${encodedLevel}`) 
             ]); 
             const schData = await schRes.json(); 
             const scoreData = await scoreRes.json(); 
             const rankData = await rankRes.json(); 
             const allMatches = schData.full_schedule?.schedule || []; 
-            const myMatches = allMatches.filter(m => m.category === category && m.city === city).sort((a, b) => new Date(a.date + ' ' + a.time) - new Date(b.date + ' ' + b.time)); 
+            const myMatches = allMatches.filter(m => m.category === category && m.city === city).sort(byStart); 
             
             setSchedule(myMatches); 
             setStandings(rankData); 
@@ -249,16 +250,35 @@ const OngoingEvents = ({ category, city, level, myTeamID }) => {
         } catch(err) { console.log(err); } 
     };
     
-    useEffect(() => { fetchData(); const interval = setInterval(fetchData, 10000); return () => clearInterval(interval); }, [category, city, level]);
+    // A match frame carries the changed match and its group's standings, applied in place without a request
+    const applyMatchFrame = (e) => {
+        const { op, match, standings: rows } = JSON.parse(e.data);
+        if (op === "deleted") {
+            setSchedule(prev => prev.filter(m => m.id !== match.id));
+            setScores(prev => { const next = { ...prev }; delete next[match.id]; return next; });
+        } else {
+            setSchedule(prev => [...prev.filter(m => m.id !== match.id), { ...prev.find(m => m.id === match.id), ...match, category, city, group: match.group_id }].sort(byStart));
+            setScores(prev => ({ ...prev, [match.id]: { id: match.id, score: match.score, status: match.status, submitted_by_team: match.submitted_by_team } }));
+        }
+        // Rows are for the match's level; only players already on this leaderboard are updated
+        if (!match.level || match.level === level) { const fresh = new Map(rows.map(r => [r.team_id, r])); setStandings(prev => prev.map(r => fresh.get(r.team_id) || r)); }
+    };
+
+    // Full refetch only on resync (the server dropped frames for us, or replanned the schedule) and after a reconnect,
+    // spread over a few seconds so every open leaderboard does not hit the API in the same instant
+    useEffect(() => { fetchData(); let timer; const resync = () => { clearTimeout(timer); timer = setTimeout(fetchData, Math.random() * 5000); }; const events = new EventSource(`https://club28-backend-98cy.onrender.com/events?tournament=${encodeURIComponent(category)}&city=${encodeURIComponent(city)}`); events.addEventListener('match', applyMatchFrame); events.addEventListener('resync', resync); events.onerror = () => { events.onopen = resync; }; return () => { events.close(); clearTimeout(timer); }; }, [category, city, level]);
     
     const handleScoreSubmit = async () => { if(!selectedMatch) return; await fetch('https://club28-backend-98cy.onrender.com/submit-score', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ match_id: selectedMatch.id, category: category, t1_name: selectedMatch.t1, t2_name: selectedMatch.t2, score: scoreInput, submitted_by_team: myTeamID }) }); alert("Score sent!"); setSelectedMatch(null); setScoreInput(""); fetchData(); };
     const handleVerify = async (matchId, action) => { await fetch('https://club28-backend-98cy.onrender.com/verify-score', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ match_id: matchId, action: action }) }); alert(action); fetchData(); };
-    const filteredStandings = standings.filter(t => t.group === activeGroup).sort((a, b) => b.points - a.points);
+    // Tabs come from the groups in the standings, which follow the draw size (A-D is only the default 16-player draw)
+    const groups = [...new Set(standings.map(t => t.group))].sort((a, b) => a.length - b.length || a.localeCompare(b));
+    const shownGroup = groups.includes(activeGroup) ? activeGroup : (groups[0] || activeGroup);
+    const filteredStandings = standings.filter(t => t.group === shownGroup).sort((a, b) => b.points - a.points);
     const getRankIcon = (index) => { if (index < 2) return <div className="bg-green-100 text-green-600 w-5 h-5 rounded-full flex items-center justify-center text-[10px] font-bold">Q</div>; return <span className="font-bold text-gray-400 text-xs w-5 text-center">{index + 1}</span>; };
     const renderMatchAction = (match) => { const scoreEntry = scores[match.id]; if (!scoreEntry) return <button onClick={() => setSelectedMatch(match)} className="bg-blue-50 text-blue-600 text-[8px] font-bold px-2 py-1 rounded border border-blue-100">+ Score</button>; if (scoreEntry.status === "Official") return <span className="text-green-600 text-[9px] font-black">{scoreEntry.score}</span>; if (scoreEntry.status === "Disputed") return <span className="text-red-500 text-[9px] font-black">⚠</span>; const iSubmittedIt = scoreEntry.submitted_by_team === myTeamID; if (iSubmittedIt) return <span className="text-gray-300 text-[8px] font-bold">Wait...</span>; return <div className="flex gap-1"><button onClick={() => handleVerify(match.id, "DENY")} className="text-red-500 text-[8px] font-bold border border-red-100 px-1 rounded">X</button><button onClick={() => handleVerify(match.id, "APPROVE")} className="text-green-600 text-[8px] font-bold border border-green-100 px-1 rounded">✓</button></div>; };
     
     return (
-        <div className="mt-8 mb-24 px-6"><div className="flex items-center gap-2 mb-4"><Activity className="text-green-500 animate-pulse" size={20}/><h2 className="text-lg font-black italic uppercase">Ongoing Event ({city})</h2></div><div className="bg-white rounded-3xl shadow-xl border border-gray-100 overflow-hidden"><div className="bg-blue-600 p-4 flex justify-between items-center text-white"><div><p className="text-[10px] font-bold opacity-80 uppercase">Tournament</p><h3 className="font-black text-lg italic">{category} <span className="text-sm font-black text-yellow-300 ml-1">({level ? level.toUpperCase() : "..."})</span></h3></div><div className="text-right"><p className="text-[10px] font-bold opacity-80 uppercase">My Rank</p><p className="font-black text-2xl">#{standings.findIndex(t => t.name === myTeamID) + 1 || "-"}</p></div></div><div className="flex border-b border-gray-100 divide-x divide-gray-100"><div className="flex-1 p-3 text-center"><p className="text-[9px] text-gray-400 font-bold uppercase">Played</p><p className="font-black text-lg">{standings.find(t => t.team_id === myTeamID)?.played || 0}</p></div><div className="flex-1 p-3 text-center"><p className="text-[9px] text-gray-400 font-bold uppercase">Won</p><p className="font-black text-lg text-green-600">{standings.find(t => t.team_id === myTeamID)?.gamesWon || 0}</p></div><div className="flex-1 p-3 text-center"><p className="text-[9px] text-gray-400 font-bold uppercase">Points</p><p className="font-black text-lg text-blue-600">{standings.find(t => t.team_id === myTeamID)?.points || 0}</p></div></div><div className="flex border-b border-gray-100"><button onClick={() => setActiveTab("SCHEDULE")} className={`flex-1 py-3 text-[10px] font-black uppercase tracking-widest ${activeTab === "SCHEDULE" ? "bg-gray-50 text-blue-600" : "text-gray-400"}`}>Schedule</button><button onClick={() => setActiveTab("STANDINGS")} className={`flex-1 py-3 text-[10px] font-black uppercase tracking-widest ${activeTab === "STANDINGS" ? "bg-gray-50 text-blue-600" : "text-gray-400"}`}>Leaderboard</button></div><div className="max-h-96 overflow-y-auto">{activeTab === "SCHEDULE" ? ( <CompactScheduleList matches={schedule} myTeamID={myTeamID} onAction={renderMatchAction} /> ) : (<div className="pb-4"><div className="flex justify-center p-3 bg-gray-50 border-b border-gray-100"><div className="flex bg-white rounded-lg p-1 shadow-sm border border-gray-200">{['A', 'B', 'C', 'D'].map((group) => (<button key={group} onClick={() => setActiveGroup(group)} className={`px-3 py-1 rounded-md text-[10px] font-bold transition-all ${activeGroup === group ? 'bg-blue-600 text-white shadow' : 'text-gray-400 hover:text-gray-600'}`}>Group {group}</button>))}</div></div><div className="grid grid-cols-12 gap-2 px-4 py-2 bg-gray-50 text-[9px] font-bold text-gray-400 uppercase"><div className="col-span-2 text-center">Rank</div><div className="col-span-6">Team</div><div className="col-span-2 text-center">Games</div><div className="col-span-2 text-center">Pts</div></div><div className="divide-y divide-gray-50">{filteredStandings.length > 0 ? (filteredStandings.map((t, i) => (<div key={i} className={`grid grid-cols-12 gap-2 px-4 py-3 items-center ${i < 2 ? "bg-green-50 border-l-4 border-green-500" : (t.team_id === myTeamID ? "bg-blue-50" : "hover:bg-gray-50")}`}><div className="col-span-2 flex justify-center">{getRankIcon(i)}</div><div className="col-span-6 font-bold text-gray-700 text-xs truncate">{t.name}</div><div className="col-span-2 text-center text-gray-500 font-bold text-xs">{t.gamesWon}</div><div className="col-span-2 text-center font-black text-blue-600 text-xs">{t.points}</div></div>))) : (<div className="p-6 text-center text-gray-400 text-xs">No teams in Group {activeGroup}</div>)}</div></div>)}</div></div> {selectedMatch && (<div className="fixed inset-0 bg-black/60 z-50 flex items-center justify-center p-6 backdrop-blur-sm"><div className="bg-white p-6 rounded-3xl w-full max-w-sm shadow-2xl"><h3 className="text-xl font-black italic uppercase mb-1 text-center">Match Result</h3><p className="text-xs text-gray-500 font-bold mb-6 text-center">{selectedMatch.t1} vs {selectedMatch.t2}</p><input type="text" placeholder="e.g. 6-4, 6-2" className="w-full bg-gray-100 p-4 rounded-xl font-bold text-lg mb-4 text-center outline-none" value={scoreInput} onChange={(e) => setScoreInput(e.target.value)}/><div className="flex gap-3"><button onClick={() => setSelectedMatch(null)} className="flex-1 bg-gray-200 text-gray-600 py-3 rounded-xl font-bold text-xs uppercase">Cancel</button><button onClick={handleScoreSubmit} className="flex-1 bg-blue-600 text-white py-3 rounded-xl font-bold text-xs uppercase shadow-lg">Submit</button></div></div></div>)}</div>
+        <div className="mt-8 mb-24 px-6"><div className="flex items-center gap-2 mb-4"><Activity className="text-green-500 animate-pulse" size={20}/><h2 className="text-lg font-black italic uppercase">Ongoing Event ({city})</h2></div><div className="bg-white rounded-3xl shadow-xl border border-gray-100 overflow-hidden"><div className="bg-blue-600 p-4 flex justify-between items-center text-white"><div><p className="text-[10px] font-bold opacity-80 uppercase">Tournament</p><h3 className="font-black text-lg italic">{category} <span className="text-sm font-black text-yellow-300 ml-1">({level ? level.toUpperCase() : "..."})</span></h3></div><div className="text-right"><p className="text-[10px] font-bold opacity-80 uppercase">My Rank</p><p className="font-black text-2xl">#{standings.findIndex(t => t.name === myTeamID) + 1 || "-"}</p></div></div><div className="flex border-b border-gray-100 divide-x divide-gray-100"><div className="flex-1 p-3 text-center"><p className="text-[9px] text-gray-400 font-bold uppercase">Played</p><p className="font-black text-lg">{standings.find(t => t.team_id === myTeamID)?.played || 0}</p></div><div className="flex-1 p-3 text-center"><p className="text-[9px] text-gray-400 font-bold uppercase">Won</p><p className="font-black text-lg text-green-600">{standings.find(t => t.team_id === myTeamID)?.gamesWon || 0}</p></div><div className="flex-1 p-3 text-center"><p className="text-[9px] text-gray-400 font-bold uppercase">Points</p><p className="font-black text-lg text-blue-600">{standings.find(t => t.team_id === myTeamID)?.points || 0}</p></div></div><div className="flex border-b border-gray-100"><button onClick={() => setActiveTab("SCHEDULE")} className={`flex-1 py-3 text-[10px] font-black uppercase tracking-widest ${activeTab === "SCHEDULE" ? "bg-gray-50 text-blue-600" : "text-gray-400"}`}>Schedule</button><button onClick={() => setActiveTab("STANDINGS")} className={`flex-1 py-3 text-[10px] font-black uppercase tracking-widest ${activeTab === "STANDINGS" ? "bg-gray-50 text-blue-600" : "text-gray-400"}`}>Leaderboard</button></div><div className="max-h-96 overflow-y-auto">{activeTab === "SCHEDULE" ? ( <CompactScheduleList matches={schedule} myTeamID={myTeamID} onAction={renderMatchAction} /> ) : (<div className="pb-4"><div className="flex justify-center p-3 bg-gray-50 border-b border-gray-100"><div className="flex bg-white rounded-lg p-1 shadow-sm border border-gray-200">{groups.map((group) => (<button key={group} onClick={() => setActiveGroup(group)} className={`px-3 py-1 rounded-md text-[10px] font-bold transition-all ${shownGroup === group ? 'bg-blue-600 text-white shadow' : 'text-gray-400 hover:text-gray-600'}`}>Group {group}</button>))}</div></div><div className="grid grid-cols-12 gap-2 px-4 py-2 bg-gray-50 text-[9px] font-bold text-gray-400 uppercase"><div className="col-span-2 text-center">Rank</div><div className="col-span-6">Team</div><div className="col-span-2 text-center">Games</div><div className="col-span-2 text-center">Pts</div></div><div className="divide-y divide-gray-50">{filteredStandings.length > 0 ? (filteredStandings.map((t, i) => (<div key={i} className={`grid grid-cols-12 gap-2 px-4 py-3 items-center ${i < 2 ? "bg-green-50 border-l-4 border-green-500" : (t.team_id === myTeamID ? "bg-blue-50" : "hover:bg-gray-50")}`}><div className="col-span-2 flex justify-center">{getRankIcon(i)}</div><div className="col-span-6 font-bold text-gray-700 text-xs truncate">{t.name}</div><div className="col-span-2 text-center text-gray-500 font-bold text-xs">{t.gamesWon}</div><div className="col-span-2 text-center font-black text-blue-600 text-xs">{t.points}</div></div>))) : (<div className="p-6 text-center text-gray-400 text-xs">No teams in Group {shownGroup}</div>)}</div></div>)}</div></div> {selectedMatch && (<div className="fixed inset-0 bg-black/60 z-50 flex items-center justify-center p-6 backdrop-blur-sm"><div className="bg-white p-6 rounded-3xl w-full max-w-sm shadow-2xl"><h3 className="text-xl font-black italic uppercase mb-1 text-center">Match Result</h3><p className="text-xs text-gray-500 font-bold mb-6 text-center">{selectedMatch.t1} vs {selectedMatch.t2}</p><input type="text" placeholder="e.g. 6-4, 6-2" className="w-full bg-gray-100 p-4 rounded-xl font-bold text-lg mb-4 text-center outline-none" value={scoreInput} onChange={(e) => setScoreInput(e.target.value)}/><div className="flex gap-3"><button onClick={() => setSelectedMatch(null)} className="flex-1 bg-gray-200 text-gray-600 py-3 rounded-xl font-bold text-xs uppercase">Cancel</button><button onClick={handleScoreSubmit} className="flex-1 bg-blue-600 text-white py-3 rounded-xl font-bold text-xs uppercase shadow-lg">Submit</button></div></div></div>)}</div>
     );
 };
 
@@ -45,17 +45,28 @@ const Dashboard = () => {
   const handleLogin = () => { if (password === "admin123") { setIsAuthenticated(true); fetchTournaments(); } else { alert("Wrong Password"); } };
   
   const fetchTournaments = async () => { try { const res = await fetch(`${API_URL}/tournaments`); setTournaments(await res.json()); } catch (e) {} };
+
+  // List endpoints are paged: follow X-Next-Cursor until the last page so nothing past the first 1000 rows is dropped
+  const fetchAllPages = async (path) => {
+      const rows = [];
+      let cursor = null;
+      do {
+          const res = await fetch(`${API_URL}${path}${path.includes("?") ? "&" : "?"}limit=1000${cursor ? `&cursor=${cursor}` : ""}`);
+          if (!res.ok) throw new Error(`${path}: ${res.status}`);
+          rows.push(...(await res.json()));
+          cursor = res.headers.get("X-Next-Cursor");
+      } while (cursor);
+      return rows;
+  };
   
   const fetchMatches = async () => { 
       try { 
-          const res = await fetch(`${API_URL}/scores`); 
-          const data = await res.json(); 
-          const filtered = selectedTournament ? data.filter(m => m.category === selectedTournament.name && m.city === selectedTournament.city) : data; 
-          setMatches(filtered.sort((a,b) => a.id - b.id)); 
+          const query = selectedTournament ? `?tournament=${encodeURIComponent(selectedTournament.name)}&city=${encodeURIComponent(selectedTournament.city)}` : "";
+          setMatches(await fetchAllPages(`/scores${query}`)); 
       } catch(e) {} 
   };
   
-  const fetchPlayers = async () => { try { const res = await fetch(`${API_URL}/admin/players`); setPlayers(await res.json()); } catch(e){} };
+  const fetchPlayers = async () => { try { setPlayers(await fetchAllPages("/admin/players")); } catch(e){} };
   
   const fetchTournamentPlayers = async () => { 
       if(!selectedTournament) return; 
@@ -80,7 +91,7 @@ const Dashboard = () => {
   useEffect(() => {
       if (selectedTournament && !activeLevelTab) {
           try {
-              const cats = JSON.parse(selectedTournament.settings || "[]");
+              const cats = selectedTournament.settings || [];
               if (cats.length > 0) setActiveLevelTab(cats[0].name);
           } catch(e) {}
       }
@@ -115,8 +126,8 @@ const Dashboard = () => {
       setEventStatus(t.status); 
       setDrawSize(t.draw_size || 16); 
       setEventVenue(t.venue || ""); 
-      try { setEventSchedule(JSON.parse(t.schedule || "[]")); } catch { setEventSchedule([{ label: "", value: "" }]); }
-      try { setCategories(JSON.parse(t.settings || "[]")); } catch { setCategories([{ name: "Default", fee: t.fee, p1: 0, p2: 0, p3: 0 }]); } 
+      setEventSchedule(t.schedule?.length ? t.schedule : [{ label: "", value: "" }]);
+      setCategories(t.settings?.length ? t.settings : [{ name: "Default", fee: t.fee, p1: 0, p2: 0, p3: 0 }]); 
       setIsModalOpen(true); 
   };
   
@@ -306,7 +317,7 @@ const Dashboard = () => {
                 <div className="flex gap-2 mb-6 border-b border-gray-200">
                     {(() => {
                         try {
-                            const cats = JSON.parse(selectedTournament.settings || "[]");
+                            const cats = selectedTournament.settings || [];
                             return cats.map((cat, idx) => (
                                 <button key={idx} onClick={() => setActiveLevelTab(cat.name)} className={`px-6 py-2 font-bold text-sm rounded-t-lg transition-all ${activeLevelTab === cat.name ? 'bg-blue-600 text-white' : 'bg-gray-100 text-gray-500 hover:bg-gray-200'}`}>
                                     {cat.name.toUpperCase()}
@@ -0,0 +1,154 @@
+"""Materialized standings.
+
+One `PlayerStanding` row per registration, kept in step with official match
+results so `/standings` is a single indexed read instead of re-parsing every
+score on every request.
+"""
+import sys
+from sqlalchemy import select, insert, func, literal
+from sqlalchemy.orm import Session
+import models
+
+WIN_POINTS = 3
+STAT_FIELDS = ("points", "played", "won", "sets_for", "sets_against", "games_for", "games_against")
+
+# Ranking within an event: points, then set difference, then game difference
+def rank_order(s):
+    """ORDER BY for standings rows of `s`: the PlayerStanding model, or a table with the same columns."""
+    return (s.points.desc(), (s.sets_for - s.sets_against).desc(), (s.games_for - s.games_against).desc(), s.id)
+
+RANK_ORDER = rank_order(models.PlayerStanding)
+
+# --- MATCH DELTAS ---
+def match_deltas(m):
+    """Stat increments for each side of an official match: {side (1 or 2): {field: delta}}."""
+    # Reads the integer columns written by scoring.columns(); unparsed legacy scores count as played only
+    t1_sets, t2_sets, t1_games, t2_games = m.t1_sets or 0, m.t2_sets or 0, m.t1_games or 0, m.t2_games or 0
+    sides = {}
+    for side, sf, sa, gf, ga in ((1, t1_sets, t2_sets, t1_games, t2_games), (2, t2_sets, t1_sets, t2_games, t1_games)):
+        won = 1 if m.winner == side else 0
+        sides[side] = {"points": WIN_POINTS * won, "played": 1, "won": won, "sets_for": sf, "sets_against": sa, "games_for": gf, "games_against": ga}
+    return sides
+
+# --- ROW MAINTENANCE ---
+def ensure_row(db: Session, reg: models.Registration, user: models.User):
+    row = db.query(models.PlayerStanding).filter(models.PlayerStanding.registration_id == reg.id).first()
+    if not row:
+        row = models.PlayerStanding(
+            registration_id=reg.id, user_id=user.id, tournament_name=reg.tournament_name, city=reg.city,
+            category=reg.category, team_id=user.team_id, name=user.name, group_id=reg.group_id or "A",
+            **{f: 0 for f in STAT_FIELDS}
+        )
+        db.add(row); db.flush()
+    return row
+
+def ensure_rows(db: Session, registration_ids):
+    """Bulk ensure_row: one INSERT ... SELECT of zeroed rows for registrations that have none."""
+    R, U, S = models.Registration, models.User, models.PlayerStanding
+    fresh = select(R.id, R.user_id, R.tournament_name, R.city, R.category, U.team_id, U.name, func.coalesce(R.group_id, "A"), *[literal(0) for _ in STAT_FIELDS]).join(
+        U, U.id == R.user_id).where(R.id.in_(registration_ids), ~select(S.id).where(S.registration_id == R.id).exists())
+    db.execute(insert(S).from_select(["registration_id", "user_id", "tournament_name", "city", "category", "team_id", "name", "group_id", *STAT_FIELDS], fresh))
+
+def _plays(m: models.Match, side: int, user: models.User):
+    # Sides carry a user id when one could be resolved; older or unresolved sides fall back to the display name
+    user_id, name = (m.t1_user_id, m.t1) if side == 1 else (m.t2_user_id, m.t2)
+    return user.id == user_id if user_id is not None else user.name == name
+
+def _entrants(db: Session, m: models.Match):
+    """(registration, user, side) for both players of a match within its event."""
+    ids = [i for i in (m.t1_user_id, m.t2_user_id) if i is not None]
+    names = [n for i, n in ((m.t1_user_id, m.t1), (m.t2_user_id, m.t2)) if i is None]
+    q = db.query(models.Registration, models.User).join(models.User, models.Registration.user_id == models.User.id).filter(
+        models.Registration.tournament_name == m.category,
+        models.Registration.city == m.city,
+        models.User.id.in_(ids) | models.User.name.in_(names)
+    )
+    return [(reg, user, side) for reg, user in q.all() for side in (1, 2) if _plays(m, side, user)]
+
+def apply_match(db: Session, m: models.Match, sign: int = 1):
+    """Adds (sign=1) or removes (sign=-1) an official match's contribution to the materialized rows."""
+    if m.status != "Official": return
+    deltas = match_deltas(m)
+    for reg, user, side in _entrants(db, m):
+        row = ensure_row(db, reg, user)
+        for f, v in deltas[side].items():
+            setattr(row, f, getattr(row, f) + sign * v)
+
+def update_match(db: Session, m: models.Match, **changes):
+    """Applies attribute changes to a match, moving its old official result out of the standings and the new one in."""
+    apply_match(db, m, -1)
+    for field, value in changes.items(): setattr(m, field, value)
+    apply_match(db, m, 1)
+
+def delete_event(db: Session, tournament_name: str, city: str):
+    db.query(models.PlayerStanding).filter(
+        models.PlayerStanding.tournament_name == tournament_name,
+        models.PlayerStanding.city == city
+    ).delete(synchronize_session=False)
+
+# --- FULL RECOMPUTE ---
+def compute(db: Session):
+    """Recomputes every registration's stats from `matches`: {registration_id: {field: value}}."""
+    results = db.query(models.Registration, models.User).join(models.User, models.Registration.user_id == models.User.id).all()
+    by_user, by_name = {}, {}
+    stats = {}
+    for reg, user in results:
+        by_user.setdefault((reg.tournament_name, reg.city, user.id), []).append(reg.id)
+        by_name.setdefault((reg.tournament_name, reg.city, user.name), []).append(reg.id)
+        stats[reg.id] = {f: 0 for f in STAT_FIELDS}
+    # Only the columns the deltas read: this also runs as migration step 4, before later steps add match columns
+    M = models.Match
+    for m in db.query(M.category, M.city, M.t1, M.t2, M.t1_user_id, M.t2_user_id, M.winner, M.t1_sets, M.t2_sets, M.t1_games, M.t2_games).filter(M.status == "Official").all():
+        for side, delta in match_deltas(m).items():
+            user_id, name = (m.t1_user_id, m.t1) if side == 1 else (m.t2_user_id, m.t2)
+            regs = by_user.get((m.category, m.city, user_id), []) if user_id is not None else by_name.get((m.category, m.city, name), [])
+            for reg_id in regs:
+                for f, v in delta.items(): stats[reg_id][f] += v
+    return stats
+
+def rebuild(db: Session):
+    db.query(models.PlayerStanding).delete(synchronize_session=False)
+    stats = compute(db)
+    results = db.query(models.Registration, models.User).join(models.User, models.Registration.user_id == models.User.id).all()
+    db.add_all([
+        models.PlayerStanding(
+            registration_id=reg.id, user_id=user.id, tournament_name=reg.tournament_name, city=reg.city,
+            category=reg.category, team_id=user.team_id, name=user.name, group_id=reg.group_id or "A",
+            **stats[reg.id]
+        ) for reg, user in results
+    ])
+    db.commit()
+    return len(results)
+
+def check(db: Session):
+    """Compares materialized rows against a full recompute; returns a list of mismatch descriptions."""
+    expected = compute(db)
+    problems = []
+    rows = {r.registration_id: r for r in db.query(models.PlayerStanding).all()}
+    for reg_id, stats in expected.items():
+        row = rows.pop(reg_id, None)
+        if not row:
+            problems.append({"registration_id": reg_id, "issue": "missing"}); continue
+        diff = {f: {"stored": getattr(row, f), "expected": v} for f, v in stats.items() if getattr(row, f) != v}
+        if diff: problems.append({"registration_id": reg_id, "team_id": row.team_id, "issue": "mismatch", "fields": diff})
+    for reg_id, row in rows.items():
+        problems.append({"registration_id": reg_id, "team_id": row.team_id, "issue": "orphaned"})
+    return problems
+
+def bootstrap(db: Session):
+    """Fills the table once on databases that predate it."""
+    if db.query(models.PlayerStanding.id).first() is None and db.query(models.Registration.id).first() is not None:
+        rebuild(db)
+
+if __name__ == "__main__":
+    # Usage: python standings.py [rebuild|check]
+    from database import SessionLocal
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "check"
+    with SessionLocal() as db:
+        if cmd == "rebuild":
+            print(f"Rebuilt standings for {rebuild(db)} registrations")
+        else:
+            problems = check(db)
+            for p in problems: print(p)
+            print("OK" if not problems else f"{len(problems)} inconsistent rows")
+            sys.exit(1 if problems else 0)
@@ -0,0 +1,78 @@
+"""Wallet ledger.
+
+Every balance change is one `WalletTransaction` row written in the same
+transaction as a single UPDATE of `users.wallet_balance`, so the balance is
+never read, changed in Python and written back. Debits are conditional on
+the balance covering them; the database decides, not the handler.
+"""
+import sys
+from collections import defaultdict
+from sqlalchemy import select, update, insert, func, bindparam
+from sqlalchemy.orm import Session
+import models
+
+IN_CHUNK = 500   # team ids per IN (...) lookup in bulk credits
+
+class UnknownTeams(LookupError):
+    def __init__(self, team_ids):
+        super().__init__(", ".join(team_ids))
+        self.team_ids = team_ids
+
+# --- SINGLE ENTRIES ---
+def credit(db: Session, user_id: int, amount: int, kind: str = "topup", reference: str = None):
+    """Adds amount to the balance and records it; returns the new balance."""
+    balance = db.execute(
+        update(models.User).where(models.User.id == user_id).values(wallet_balance=models.User.wallet_balance + amount).returning(models.User.wallet_balance)
+    ).scalar_one()
+    db.add(models.WalletTransaction(user_id=user_id, amount=amount, kind=kind, reference=reference))
+    return balance
+
+def debit(db: Session, user_id: int, amount: int, kind: str = "fee", reference: str = None):
+    """Takes amount only if the balance covers it; returns the new balance, or None when it does not."""
+    balance = db.execute(
+        update(models.User).where(models.User.id == user_id, models.User.wallet_balance >= amount)
+        .values(wallet_balance=models.User.wallet_balance - amount).returning(models.User.wallet_balance)
+    ).scalar_one_or_none()
+    if balance is None: return None
+    db.add(models.WalletTransaction(user_id=user_id, amount=-amount, kind=kind, reference=reference))
+    return balance
+
+# --- BULK ---
+def bulk_credit(db: Session, credits, kind: str = "topup", reference: str = None):
+    """Applies [(team_id, amount), ...] as one statement per table; raises UnknownTeams before writing anything."""
+    totals = defaultdict(int)
+    for team_id, amount in credits: totals[team_id.strip().upper()] += amount
+    ids = {}
+    team_ids = list(totals)
+    for i in range(0, len(team_ids), IN_CHUNK):
+        ids.update(db.execute(select(models.User.team_id, models.User.id).where(models.User.team_id.in_(team_ids[i:i + IN_CHUNK]))).all())
+    unknown = [t for t in team_ids if t not in ids]
+    if unknown: raise UnknownTeams(unknown)
+
+    rows = [{"uid": ids[t], "amt": amt} for t, amt in totals.items()]
+    db.execute(
+        update(models.User.__table__).where(models.User.id == bindparam("uid")).values(wallet_balance=models.User.wallet_balance + bindparam("amt")),
+        rows
+    )
+    db.execute(insert(models.WalletTransaction), [{"user_id": r["uid"], "amount": r["amt"], "kind": kind, "reference": reference} for r in rows])
+    return {"users": len(rows), "total": sum(totals.values())}
+
+# --- RECONCILIATION ---
+def reconcile(db: Session):
+    """Compares every balance with its ledger sum; returns a list of mismatch descriptions."""
+    ledger = select(models.WalletTransaction.user_id, func.sum(models.WalletTransaction.amount).label("total")).group_by(models.WalletTransaction.user_id).subquery()
+    rows = db.execute(
+        select(models.User.id, models.User.team_id, models.User.wallet_balance, func.coalesce(ledger.c.total, 0))
+        .outerjoin(ledger, ledger.c.user_id == models.User.id)
+        .where(func.coalesce(models.User.wallet_balance, 0) != func.coalesce(ledger.c.total, 0))
+    ).all()
+    return [{"user_id": uid, "team_id": team_id, "balance": balance, "ledger": total} for uid, team_id, balance, total in rows]
+
+if __name__ == "__main__":
+    # Usage: python wallet.py [reconcile]
+    from database import SessionLocal
+    with SessionLocal() as db:
+        problems = reconcile(db)
+        for p in problems: print(p)
+        print("OK" if not problems else f"{len(problems)} balances disagree with the ledger")
+        sys.exit(1 if problems else 0)